@@ -7,9 +7,21 @@ Comprehensive analysis with job profile matching and detailed recommendations
 import re
 import os
 import argparse
+import codecs
+import glob
+import hashlib
+import json
+import mmap
 import sys
+import threading
+import time
+import copy
 from collections import defaultdict, Counter
-import pdfplumber
+
+from instrumentation import (
+    Instrumentation, JsonLinesSink, ListSink, MemorySink, PrometheusFileSink, format_breakdown,
+    get_instrumentation, set_instrumentation, timed_stage
+)
 
 # Job Profile Definitions with Required Keywords
 JOB_PROFILES = {
@@ -157,128 +169,996 @@ SECTION_BENCHMARKS = {
     }
 }
 
+# Characters that may not touch either end of a keyword hit ('r' must not match inside "react")
+KEYWORD_BOUNDARY = r'[a-z0-9]'
+# Plural and suffixed forms still count ("APIs", "RESTful", "Dockerized") for keywords
+# ending in three letters or digits, so short ones like 'r' and 'go' stay whole words
+KEYWORD_SUFFIX = r'(?:(?<=[a-z0-9]{3})(?:s|es|ful|ing|ed|er|ers|ized|ization))?'
+
+def _trie_pattern(node):
+    """Render a character trie as a regex so each offset walks one branch, not every keyword"""
+    branches = [re.escape(char) + _trie_pattern(child)
+                for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        body = '(?:' + body + ')?'
+    return body
+
+def build_keyword_index(job_profiles, tech_categories):
+    """Compile every profile and category keyword into a single-pass matcher"""
+    memberships = defaultdict(lambda: {'categories': [], 'profiles': []})
+    for category, keywords in tech_categories.items():
+        for keyword in keywords:
+            memberships[keyword.lower()]['categories'].append(category)
+    for profile_id, profile in job_profiles.items():
+        for kind in ('required_keywords', 'preferred_keywords', 'action_verbs'):
+            for keyword in profile[kind]:
+                memberships[keyword.lower()]['profiles'].append((profile_id, kind))
+    memberships = dict(memberships)
+
+    # The trie is greedy, so 'github actions' wins over 'github' at the same offset;
+    # the zero-width lookahead lets a hit start inside an earlier, longer hit
+    keywords = sorted(memberships, key=lambda kw: (-len(kw), kw))
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+    pattern = re.compile(
+        rf'(?<!{KEYWORD_BOUNDARY})(?=({_trie_pattern(trie)}){KEYWORD_SUFFIX}(?!{KEYWORD_BOUNDARY}))'
+    )
+
+    # Shorter keywords that are whole-word prefixes of a longer one are shadowed by it
+    prefixes = {}
+    for keyword in keywords:
+        shadowed = [other for other in keywords
+                    if len(other) < len(keyword) and keyword.startswith(other)
+                    and not re.match(KEYWORD_BOUNDARY, keyword[len(other)])]
+        if shadowed:
+            prefixes[keyword] = shadowed
+
+    return {
+        'pattern': pattern,
+        'prefixes': prefixes,
+        'memberships': memberships
+    }
+
+def match_keywords(text_lower, index=None):
+    """Scan lowercased text once and return (offset, keyword, memberships) for every hit"""
+    index = index or builtin_profiles()['keyword_index']
+    memberships = index['memberships']
+    prefixes = index['prefixes']
+    hits = []
+
+    for match in index['pattern'].finditer(text_lower):
+        offset = match.start()
+        keyword = match.group(1)
+        hits.append((offset, keyword, memberships[keyword]))
+        for shadowed in prefixes.get(keyword, ()):
+            hits.append((offset, shadowed, memberships[shadowed]))
+
+    return hits
+
+def validate_profile_set(job_profiles, tech_categories, section_benchmarks):
+    """Raise ValueError describing the first malformed profile, category or benchmark"""
+    def keyword_list(value, where):
+        if (not isinstance(value, list) or not value or
+                not all(isinstance(keyword, str) and keyword.strip() for keyword in value)):
+            raise ValueError(f"{where} must be a non-empty list of keyword strings")
+
+    for profile_id, profile in job_profiles.items():
+        if not isinstance(profile, dict):
+            raise ValueError(f"Job profile '{profile_id}' must be a mapping")
+        if not isinstance(profile.get('title'), str) or not profile['title'].strip():
+            raise ValueError(f"Job profile '{profile_id}' needs a title")
+        for kind in ('required_keywords', 'preferred_keywords', 'action_verbs'):
+            keyword_list(profile.get(kind), f"Job profile '{profile_id}' {kind}")
+    for category, keywords in tech_categories.items():
+        keyword_list(keywords, f"Tech category '{category}'")
+    for section_name, benchmark in section_benchmarks.items():
+        if not isinstance(benchmark, dict):
+            raise ValueError(f"Benchmark '{section_name}' must be a mapping")
+        for key, value in benchmark.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+                raise ValueError(f"Benchmark '{section_name}.{key}' must be a positive number")
+        if 'min_words' in benchmark and 'ideal_words' not in benchmark:
+            raise ValueError(f"Benchmark '{section_name}' sets min_words without ideal_words")
+
+def profile_fingerprint(job_profiles, tech_categories, section_benchmarks):
+    """Stable hash of a profile set, so results computed under other profiles can be told apart"""
+    data = json.dumps([job_profiles, tech_categories, section_benchmarks], sort_keys=True)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:16]
+
+def normalize_profile_keywords(job_profiles, tech_categories):
+    """Copies with every keyword lowercased, as the keyword index and the scorers compare them"""
+    job_profiles = {
+        profile_id: {**profile, **{kind: [keyword.lower() for keyword in profile[kind]]
+                                   for kind in ('required_keywords', 'preferred_keywords', 'action_verbs')}}
+        for profile_id, profile in job_profiles.items()
+    }
+    tech_categories = {category: [keyword.lower() for keyword in keywords]
+                       for category, keywords in tech_categories.items()}
+    return job_profiles, tech_categories
+
+def compile_profile_set(job_profiles, tech_categories, section_benchmarks, source='built-in'):
+    """Validate profiles, categories and benchmarks and precompile their keyword index
+
+    Keywords are lowercased, so a profile file may write "Kafka" or "kafka".
+    """
+    validate_profile_set(job_profiles, tech_categories, section_benchmarks)
+    job_profiles, tech_categories = normalize_profile_keywords(job_profiles, tech_categories)
+    return {
+        'source': source,
+        'fingerprint': profile_fingerprint(job_profiles, tech_categories, section_benchmarks),
+        'job_profiles': job_profiles,
+        'tech_categories': tech_categories,
+        'section_benchmarks': section_benchmarks,
+        'keyword_index': build_keyword_index(job_profiles, tech_categories)
+    }
+
+_BUILTIN_PROFILES = None
+
+def builtin_profiles():
+    """The built-in profile set, compiled on first use rather than at import"""
+    global _BUILTIN_PROFILES
+    if _BUILTIN_PROFILES is None:
+        _BUILTIN_PROFILES = {
+            'source': 'built-in',
+            'fingerprint': profile_fingerprint(JOB_PROFILES, TECH_CATEGORIES, SECTION_BENCHMARKS),
+            'job_profiles': JOB_PROFILES,
+            'tech_categories': TECH_CATEGORIES,
+            'section_benchmarks': SECTION_BENCHMARKS,
+            'keyword_index': build_keyword_index(JOB_PROFILES, TECH_CATEGORIES)
+        }
+    return _BUILTIN_PROFILES
+
+PROFILE_FILE_EXTENSIONS = ('.json', '.yaml', '.yml')
+
+def load_profile_file(path):
+    """Read one JSON or YAML profile file into a dict"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.lower().endswith('.json'):
+            data = json.load(f)
+        else:
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError(f"PyYAML is required to load {path}")
+            data = yaml.safe_load(f) or {}
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: top level must be a mapping")
+    unknown = set(data) - {'job_profiles', 'tech_categories', 'section_benchmarks'}
+    if unknown:
+        raise ValueError(f"{path}: unknown keys {', '.join(sorted(unknown))}")
+    return data
+
+class ProfileRegistry:
+    """Job profiles, tech categories and benchmarks loaded from files, swapped in atomically
+
+    Files may define any of 'job_profiles', 'tech_categories' and 'section_benchmarks'.
+    Later files override earlier ones by id. Readers use `current`, a compiled
+    snapshot that is replaced wholesale on reload and never mutated, so it needs no lock.
+    """
+
+    def __init__(self, paths, include_builtin=True, check_interval=2.0):
+        self.paths = list(paths)
+        self.include_builtin = include_builtin
+        self.check_interval = check_interval
+        self.reloads = 0
+        self.last_error = None
+        self._reload_lock = threading.Lock()
+        self._last_check = time.monotonic()
+        self._signature = self._file_signature()
+        self.current = self._compile()
+
+    def _profile_files(self):
+        files = []
+        for path in self.paths:
+            if os.path.isdir(path):
+                files.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                             if name.lower().endswith(PROFILE_FILE_EXTENSIONS))
+            else:
+                files.append(path)
+        return files
+
+    def _file_signature(self):
+        signature = []
+        for path in self._profile_files():
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((path, None, None))
+        return tuple(signature)
+
+    def _compile(self):
+        if self.include_builtin:
+            job_profiles = copy.deepcopy(JOB_PROFILES)
+            tech_categories = copy.deepcopy(TECH_CATEGORIES)
+        else:
+            job_profiles, tech_categories = {}, {}
+        # Benchmarks always start from the built-ins; files override individual thresholds
+        section_benchmarks = copy.deepcopy(SECTION_BENCHMARKS)
+
+        files = self._profile_files()
+        for path in files:
+            data = load_profile_file(path)
+            job_profiles.update(data.get('job_profiles') or {})
+            tech_categories.update(data.get('tech_categories') or {})
+            for section_name, benchmark in (data.get('section_benchmarks') or {}).items():
+                if not isinstance(benchmark, dict):
+                    raise ValueError(f"{path}: benchmark '{section_name}' must be a mapping")
+                section_benchmarks.setdefault(section_name, {}).update(benchmark)
+
+        if not job_profiles:
+            raise ValueError("No job profiles defined")
+        return compile_profile_set(job_profiles, tech_categories, section_benchmarks,
+                                   source=', '.join(files) or 'built-in')
+
+    def reload(self):
+        """Recompile from disk; on a bad file keep serving the previous snapshot"""
+        with self._reload_lock:
+            signature = self._file_signature()
+            try:
+                compiled = self._compile()
+            except (OSError, ValueError) as e:
+                self.last_error = str(e)
+                return False
+            self.current = compiled
+            self._signature = signature
+            self.last_error = None
+            self.reloads += 1
+            return True
+
+    def refresh(self):
+        """Reload if any profile file changed, checking at most once per check_interval"""
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return False
+        self._last_check = now
+        if self._file_signature() == self._signature:
+            return False
+        return self.reload()
+
+    def watch(self):
+        """Poll for changes on a daemon thread so long-running workers pick them up"""
+        def poll():
+            while True:
+                time.sleep(self.check_interval)
+                self.refresh()
+        watcher = threading.Thread(target=poll, name='profile-registry-watch', daemon=True)
+        watcher.start()
+        return watcher
+
+# Text cleaning in two precompiled passes. Every spacing fix inserts one space between two
+# adjacent non-space characters, so inserted spaces never create or break another fix or a
+# whitespace run; that lets the fixes run in any order, each over the original text.
+# Lookaheads go first where the right-hand character is the rarer one, so most offsets fail fast.
+CLEAN_SPACE_BEFORE_PUNCTUATION = re.compile(r'\s+(?=[.,:;!?])')
+CLEAN_SPACING = re.compile(
+    r'\s{2,}'                            # Multiple spaces
+    r'|(?=[A-Z])(?<=[a-z])'              # CamelCase
+    r'|(?=[\d(+\-])(?<=[a-zA-Z])'        # Letter-number, before parentheses/operators
+    r'|(?<=[\d.,:;!?)+\-])(?=[A-Za-z])'   # Number-letter, punctuation, after parentheses/operators
+)
+
 def clean_and_fix_text(text):
-    """Advanced text cleaning and spacing fixes"""
+    """Advanced text cleaning and spacing fixes (idempotent)"""
     if not text:
         return ""
     
     # Fix common PDF extraction issues
-    text = re.sub(r'([a-z])([A-Z])', r'\1 \2', text)  # CamelCase
-    text = re.sub(r'([a-zA-Z])(\d)', r'\1 \2', text)  # Letter-number
-    text = re.sub(r'(\d)([a-zA-Z])', r'\1 \2', text)  # Number-letter
-    text = re.sub(r'([.,:;!?])([A-Za-z])', r'\1 \2', text)  # Punctuation
-    text = re.sub(r'([a-zA-Z])\(', r'\1 (', text)  # Before parentheses
-    text = re.sub(r'\)([a-zA-Z])', r') \1', text)  # After parentheses
-    text = re.sub(r'([a-zA-Z])([+\-])', r'\1 \2', text)  # Before operators
-    text = re.sub(r'([+\-])([a-zA-Z])', r'\1 \2', text)  # After operators
-    text = re.sub(r'\s{2,}', ' ', text)  # Multiple spaces
-    text = re.sub(r'\s+([.,:;!?])', r'\1', text)  # Space before punctuation
+    text = CLEAN_SPACE_BEFORE_PUNCTUATION.sub('', text)
+    text = CLEAN_SPACING.sub(' ', text)
     
     return text.strip()
 
-def extract_resume_text(file_path):
-    """Extract and clean text from PDF or TXT files"""
-    if file_path.lower().endswith('.pdf'):
-        try:
-            with pdfplumber.open(file_path) as pdf:
-                text = "\n".join([page.extract_text() or '' for page in pdf.pages])
-            return clean_and_fix_text(text)
-        except Exception as e:
-            print(f"Error reading PDF: {e}")
+# Bump when extraction or cleaning output changes so cached text is invalidated
+EXTRACTOR_VERSION = 2
+CLEANER_VERSION = 1
+# Bump when scoring output changes so stored analyses are recomputed
+ANALYSIS_VERSION = 3
+
+class ExtractionCache:
+    """Content-addressed SQLite cache of extracted resume text with LRU eviction"""
+
+    def __init__(self, path, max_bytes=512 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        import sqlite3
+        # Batch workers share one cache file, so wait on locks rather than failing
+        self._conn = sqlite3.connect(path, timeout=60)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS extracted_text ('
+            'key TEXT PRIMARY KEY, text TEXT NOT NULL, '
+            'size INTEGER NOT NULL, last_used REAL NOT NULL)'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS extracted_text_last_used ON extracted_text (last_used)'
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def key_for(file_path, max_pages=None, max_bytes=None, extractor='layout'):
+        """Hash of the file bytes plus the extractor and cleaner versions and extraction settings"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        key = f"{digest.hexdigest()}:{EXTRACTOR_VERSION}:{CLEANER_VERSION}"
+        if max_pages is not None or max_bytes is not None:
+            key = f"{key}:{max_pages}:{max_bytes}"
+        if extractor != 'layout':
+            key = f"{key}:{extractor}"
+        return key
+
+    def get(self, key):
+        row = self._conn.execute(
+            'SELECT text FROM extracted_text WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
             return None
-    elif file_path.lower().endswith('.txt'):
+        self.hits += 1
+        with self._conn:
+            self._conn.execute(
+                'UPDATE extracted_text SET last_used = ? WHERE key = ?', (time.time(), key)
+            )
+        return row[0]
+
+    def put(self, key, text):
+        size = len(text.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO extracted_text (key, text, size, last_used) VALUES (?, ?, ?, ?)',
+                (key, text, size, time.time())
+            )
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM extracted_text').fetchone()[0]
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return
+        stale = []
+        for key, size in self._conn.execute('SELECT key, size FROM extracted_text ORDER BY last_used'):
+            stale.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany('DELETE FROM extracted_text WHERE key = ?', stale)
+        self.evictions += len(stale)
+
+    def stats(self):
+        entries, total = self._conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM extracted_text'
+        ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'bytes': total,
+            'max_bytes': self.max_bytes
+        }
+
+    def close(self):
+        self._conn.close()
+
+def _clean_page(raw):
+    """clean_and_fix_text timed as the 'clean' stage"""
+    with timed_stage('clean') as stage:
+        stage.add(chars=len(raw))
+        return clean_and_fix_text(raw)
+
+def _read_cleaned(read, max_bytes=None):
+    """Cleaned text from read(size), which returns '' at the end, until it passes max_bytes
+
+    Cleaning collapses whitespace, so the budget is checked on the cleaned text and reading
+    goes on until it is passed or the input ends. Cleaning a prefix of the input gives a
+    prefix of the cleaned whole, so clipping the result to max_bytes gives the same text as
+    cleaning everything first.
+    """
+    if max_bytes is None:
+        return _clean_page(read(-1))
+    raw = read(max_bytes + 1)
+    text = _clean_page(raw)
+    while len(text.encode('utf-8')) <= max_bytes:
+        more = read(max(len(raw), 1))
+        if not more:
+            break
+        raw += more
+        text = _clean_page(raw)
+    return text
+
+# PDFs with at least this many pages are split across page workers when page_workers > 1
+PARALLEL_PAGE_THRESHOLD = 20
+
+class LayoutPdfExtractor:
+    """pdfplumber's character-level layout engine: slow, but copes with columns and odd fonts"""
+
+    name = 'layout'
+
+    def page_count(self, file_path):
+        # Imported on first PDF: pdfplumber and pdfminer are most of the module's import time
+        import pdfplumber
+        with pdfplumber.open(file_path) as pdf:
+            return len(pdf.pages)
+
+    def iter_pages(self, file_path, start=0, stop=None):
+        """Raw text of pages start..stop-1, one string per page"""
+        import pdfplumber
+        with pdfplumber.open(file_path) as pdf:
+            for page in pdf.pages[start:stop]:
+                page_text = page.extract_text() or ''
+                # Drop the page's parsed layout before moving on so memory stays flat
+                page.flush_cache()
+                yield page_text
+
+class TextLayerPdfExtractor:
+    """The PDF's own text layer read through pypdfium2, with no layout analysis
+
+    Tens of times faster than the layout engine and keeps the spaces the exporter wrote,
+    which is all a single-column resume needs. pypdfium2 ships with pdfplumber 0.10+.
+    """
+
+    name = 'text'
+
+    def _document(self, file_path):
+        try:
+            import pypdfium2
+        except ImportError:
+            raise ValueError("The text layer extractor needs pypdfium2 (pip install pypdfium2)")
+        return pypdfium2.PdfDocument(file_path)
+
+    def page_count(self, file_path):
+        document = self._document(file_path)
+        try:
+            return len(document)
+        finally:
+            document.close()
+
+    def iter_pages(self, file_path, start=0, stop=None):
+        document = self._document(file_path)
+        try:
+            for page_number in range(start, len(document) if stop is None else min(stop, len(document))):
+                page = document[page_number]
+                text_page = page.get_textpage()
+                page_text = text_page.get_text_bounded()
+                text_page.close()
+                page.close()
+                yield page_text.replace('\r\n', '\n').replace('\r', '\n')
+        finally:
+            document.close()
+
+# Extractors by name; register another object with page_count() and iter_pages() to add one
+PDF_EXTRACTORS = {
+    'layout': LayoutPdfExtractor(),
+    'text': TextLayerPdfExtractor()
+}
+# 'auto' tries the text layer and falls back to the layout engine when it looks broken
+DEFAULT_PDF_EXTRACTOR = 'auto'
+
+# A readable text layer has roughly one space per five or six letters and little glued-together text
+MIN_SPACE_RATIO = 0.08
+MAX_MERGED_WORD_RATIO = 0.03
+MAX_LONG_WORD_RATIO = 0.02
+MERGED_WORD_PATTERN = re.compile(r'[a-z]{2,}[A-Z][a-z]{2,}')
+# 'auto' judges the text layer on this many leading pages, then streams the rest
+TEXT_LAYER_SAMPLE_PAGES = 3
+
+def text_layer_problem(text):
+    """Why a text layer is not good enough to skip layout analysis, or None if it is"""
+    words = text.split()
+    if len(words) < 20:
+        return 'empty'
+    non_space = sum(len(word) for word in words)
+    if (len(words) - 1) / non_space < MIN_SPACE_RATIO:
+        return 'few_spaces'
+    if sum(1 for word in words if len(word) > 25) / len(words) > MAX_LONG_WORD_RATIO:
+        return 'long_words'
+    if sum(1 for word in words if MERGED_WORD_PATTERN.search(word)) / len(words) > MAX_MERGED_WORD_RATIO:
+        return 'merged_words'
+    return None
+
+def _extract_page_range(file_path, start, stop, extractor='layout'):
+    """Worker entry point: cleaned text of pages start..stop-1, from its own copy of the PDF"""
+    return [_clean_page(page_text) for page_text in PDF_EXTRACTORS[extractor].iter_pages(file_path, start, stop)]
+
+# One page-extraction pool per process, keyed by its worker count
+_PAGE_POOLS = {}
+
+def _page_pool(workers):
+    if workers not in _PAGE_POOLS:
+        import multiprocessing.util
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=workers)
+        # A batch worker exits without running atexit hooks but joins its children first,
+        # so the pool is shut down by a multiprocessing finalizer, ahead of the finalizers
+        # that close its queues (exitpriority 10), or the worker hangs
+        multiprocessing.util.Finalize(pool, pool.shutdown, exitpriority=100)
+        _PAGE_POOLS[workers] = pool
+    return _PAGE_POOLS[workers]
+
+def _iter_parallel_pages(file_path, page_count, workers, extractor='layout'):
+    """Cleaned page texts in page order, one contiguous page range per worker"""
+    span = -(-page_count // workers)
+    pool = _page_pool(workers)
+    futures = [pool.submit(_extract_page_range, file_path, start, min(start + span, page_count), extractor)
+               for start in range(0, page_count, span)]
+    try:
+        for future in futures:
+            yield from future.result()
+    finally:
+        # A spent byte budget stops reading early; ranges not started yet are dropped
+        for future in futures:
+            future.cancel()
+
+def _iter_pdf_pages(file_path, page_count, stats, page_workers, page_threshold, extractor):
+    """Cleaned PDF page texts in order, recording the extractor used (and why) in stats"""
+    if extractor == 'auto':
+        raw_pages = None
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return clean_and_fix_text(f.read())
+            raw_pages = iter(PDF_EXTRACTORS['text'].iter_pages(file_path, 0, page_count))
+            sample = [page_text for _, page_text in zip(range(TEXT_LAYER_SAMPLE_PAGES), raw_pages)]
+            problem = text_layer_problem('\n'.join(sample))
         except Exception as e:
-            print(f"Error reading TXT: {e}")
-            return None
+            # pypdfium2 missing or unable to read the file: the layout engine may still manage
+            problem = f"unreadable: {e}"
+        if problem is None:
+            stats['extractor'] = 'text'
+            for page_text in sample:
+                yield _clean_page(page_text)
+            next_page = len(sample)
+            try:
+                for page_text in raw_pages:
+                    next_page += 1
+                    yield _clean_page(page_text)
+                return
+            except Exception as e:
+                # A later page the text layer cannot read: finish with the layout engine
+                stats['fallback'] = f"unreadable: {e}"
+            finally:
+                if hasattr(raw_pages, 'close'):
+                    raw_pages.close()
+            for page_text in PDF_EXTRACTORS['layout'].iter_pages(file_path, next_page, page_count):
+                yield _clean_page(page_text)
+            return
+        if hasattr(raw_pages, 'close'):
+            raw_pages.close()
+        stats['fallback'] = problem
+        extractor = 'layout'
+    stats['extractor'] = extractor
+    if page_workers and page_workers > 1 and page_count >= page_threshold:
+        yield from _iter_parallel_pages(file_path, page_count, page_workers, extractor)
     else:
-        print("Unsupported file format. Please use PDF or TXT files.")
-        return None
+        for page_text in PDF_EXTRACTORS[extractor].iter_pages(file_path, 0, page_count):
+            yield _clean_page(page_text)
 
-def parse_resume_sections(text):
-    """Advanced section parsing with better detection"""
-    sections = {}
-    
-    section_patterns = {
-        'contact': r'(contact|personal|info)',
-        'summary': r'(summary|profile|objective|about)',
-        'education': r'(education|academic|degree|university|college|school)',
-        'experience': r'(experience|employment|work|career|internship|intern)',
-        'projects': r'(projects?|portfolio|work)',
-        'skills': r'(skills?|technical|competencies|technologies|tools)',
-        'achievements': r'(achievements?|awards?|accomplishments?|certifications?|honors?)',
-        'languages': r'(languages?|linguistic)',
-        'interests': r'(interests?|hobbies|activities)'
-    }
+def iter_resume_pages(file_path, max_pages=None, max_bytes=None, stats=None, page_workers=None,
+                      page_threshold=PARALLEL_PAGE_THRESHOLD, extractor=DEFAULT_PDF_EXTRACTOR):
+    """Yield cleaned text one page at a time, stopping once a page or byte budget is spent
+
+    PDFs are read with the named PDF_EXTRACTORS entry, or with 'auto' the text layer unless
+    text_layer_problem rejects its first TEXT_LAYER_SAMPLE_PAGES pages; stats records
+    'extractor' and any 'fallback' reason.
+    With page_workers > 1, a PDF of at least page_threshold pages is extracted in page
+    ranges across that many processes; the pages come back in order with the same text.
+    """
+    if stats is None:
+        stats = {}
+    stats.update({'pages_read': 0, 'bytes_read': 0, 'truncated': False})
     
-    lines = text.split('\n')
-    current_section = 'header'
-    current_content = []
+    def within_budget(page_text):
+        """Clip page_text to the remaining byte budget"""
+        if max_bytes is None:
+            return page_text
+        remaining = max_bytes - stats['bytes_read']
+        encoded = page_text.encode('utf-8')
+        if len(encoded) > remaining:
+            stats['truncated'] = True
+            return encoded[:max(remaining, 0)].decode('utf-8', errors='ignore')
+        return page_text
     
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Check if this line is a section header
-        is_section_header = False
-        line_words = line.lower().split()
-        
-        for section_name, pattern in section_patterns.items():
-            if (re.search(pattern, line.lower()) and 
-                len(line_words) <= 4 and 
-                not any(char.isdigit() for char in line)):
-                
-                if current_content:
-                    sections[current_section] = current_content
-                current_section = section_name
-                current_content = []
-                is_section_header = True
-                break
+    if file_path.lower().endswith('.pdf'):
+        if extractor != 'auto' and extractor not in PDF_EXTRACTORS:
+            raise ValueError(f"Unknown PDF extractor '{extractor}' (choose from auto, {', '.join(PDF_EXTRACTORS)})")
+        try:
+            page_count = PDF_EXTRACTORS['text' if extractor == 'auto' else extractor].page_count(file_path)
+        except Exception:
+            if extractor != 'auto':
+                raise
+            page_count = PDF_EXTRACTORS['layout'].page_count(file_path)
+        if max_pages is not None and page_count > max_pages:
+            page_count = max_pages
+            page_limited = True
+        else:
+            page_limited = False
+        page_texts = _iter_pdf_pages(file_path, page_count, stats, page_workers, page_threshold, extractor)
+        for page_text in page_texts:
+            page_text = within_budget(page_text)
+            stats['pages_read'] += 1
+            stats['bytes_read'] += len(page_text.encode('utf-8'))
+            yield page_text
+            if stats['truncated']:
+                page_texts.close()
+                return
+        if page_limited:
+            stats['truncated'] = True
+    elif file_path.lower().endswith('.txt'):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            page_text = within_budget(_read_cleaned(f.read, max_bytes))
+        stats['pages_read'] = 1
+        stats['bytes_read'] = len(page_text.encode('utf-8'))
+        yield page_text
+    else:
+        raise ValueError("Unsupported file format. Please use PDF or TXT files.")
+
+def extract_resume_text(file_path, cache=None, max_pages=None, max_bytes=None, page_workers=None,
+                        page_threshold=PARALLEL_PAGE_THRESHOLD, extractor=DEFAULT_PDF_EXTRACTOR, stats=None):
+    """Extract and clean text from PDF or TXT files
+
+    Pass a stats dict to learn which PDF extractor produced the text and why a fallback happened.
+    """
+    with timed_stage('extract', file=file_path) as stage:
+        if stats is None:
+            stats = {}
+        if file_path.lower().endswith('.pdf'):
+            try:
+                if cache is not None:
+                    key = cache.key_for(file_path, max_pages, max_bytes, extractor)
+                    cached = cache.get(key)
+                    if cached is not None:
+                        stage.add(cache_hits=1, bytes=len(cached.encode('utf-8')))
+                        return cached
+                    stage.add(cache_misses=1)
+                text = "\n".join(iter_resume_pages(file_path, max_pages, max_bytes, stats, page_workers,
+                                                    page_threshold, extractor))
+                stage.add(pages=stats['pages_read'], bytes=stats['bytes_read'],
+                          **{f"{stats['extractor']}_extractions": 1}, fallbacks=int('fallback' in stats))
+                if cache is not None and text:
+                    cache.put(key, text)
+                return text
+            except Exception as e:
+                stage.add(errors=1)
+                print(f"Error reading PDF: {e}")
+                return None
+        elif file_path.lower().endswith('.txt'):
+            try:
+                text = "\n".join(iter_resume_pages(file_path, max_pages, max_bytes, stats))
+                stage.add(pages=stats['pages_read'], bytes=stats['bytes_read'])
+                return text
+            except Exception as e:
+                stage.add(errors=1)
+                print(f"Error reading TXT: {e}")
+                return None
+        else:
+            print("Unsupported file format. Please use PDF or TXT files.")
+            return None
+
+# Non-whitespace byte, searched for directly in the mapped file
+NON_BLANK_BYTES = re.compile(rb'\S')
+
+def iter_text_records(file_path, delimiter):
+    """Yield (record_number, start, end) byte spans of the delimiter-separated records in a TXT file
+
+    The file is memory-mapped and only searched, never decoded or copied, so scanning an
+    export of any size takes constant memory. Blank records are skipped.
+    """
+    separator = delimiter.encode('utf-8')
+    if not separator:
+        raise ValueError("Record delimiter must not be empty")
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            record_number = 0
+            start = 0
+            while start <= len(mapped):
+                end = mapped.find(separator, start)
+                if end == -1:
+                    end = len(mapped)
+                if NON_BLANK_BYTES.search(mapped, start, end):
+                    record_number += 1
+                    yield record_number, start, end
+                start = end + len(separator)
+
+def read_text_record(file_path, start, end, max_bytes=None):
+    """Cleaned text of one record of a delimited TXT export, reading only its own bytes
+
+    Decoded as strict UTF-8 like a whole TXT resume; max_bytes budgets the cleaned text.
+    """
+    with timed_stage('extract', file=file_path) as stage:
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        remaining = end - start
         
-        if not is_section_header:
-            current_content.append(line)
-    
-    # Add the last section
-    if current_content:
-        sections[current_section] = current_content
-    
+        def read(size):
+            nonlocal remaining
+            text = ''
+            # A chunk may end inside a character; read on until something decodes
+            while not text and remaining:
+                data = f.read(remaining if size < 0 else min(size, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                text = decoder.decode(data, final=not remaining)
+            return text
+        
+        with open(file_path, 'rb') as f:
+            f.seek(start)
+            text = _read_cleaned(read, max_bytes)
+        if max_bytes is not None:
+            text = text.encode('utf-8')[:max_bytes].decode('utf-8', errors='ignore')
+        stage.add(pages=1, bytes=len(text.encode('utf-8')))
+        return text
+
+# Section header keywords in priority order: a line naming two sections belongs to the first.
+# 'work' is experience only; it used to be listed under projects too.
+SECTION_PATTERNS = {
+    'contact': r'(contact|personal|info)',
+    'summary': r'(summary|profile|objective|about)',
+    'education': r'(education|academic|degree|university|college|school)',
+    'experience': r'(experience|employment|work|career|internship|intern)',
+    'projects': r'(projects?|portfolio)',
+    'skills': r'(skills?|technical|competencies|technologies|tools)',
+    'achievements': r'(achievements?|awards?|accomplishments?|certifications?|honors?)',
+    'languages': r'(languages?|linguistic)',
+    'interests': r'(interests?|hobbies|activities)'
+}
+
+def build_section_classifier(section_patterns):
+    """Compile header rules into one regex whose matching named group is the section
+
+    A header is at most four words with no digits. Each section's lookahead is tried
+    in order from the start of the line, so the first matching section wins.
+    """
+    alternatives = '|'.join(f"(?=.*?(?P<{section_name}>{pattern}))"
+                            for section_name, pattern in section_patterns.items())
+    return re.compile(rf'(?=\S+(?:\s+\S+){{0,3}}$)(?!.*\d)(?:{alternatives})',
+                      re.IGNORECASE | re.DOTALL)
+
+_SECTION_CLASSIFIER = None
+
+def section_classifier():
+    """build_section_classifier(SECTION_PATTERNS), compiled on first use"""
+    global _SECTION_CLASSIFIER
+    if _SECTION_CLASSIFIER is None:
+        _SECTION_CLASSIFIER = build_section_classifier(SECTION_PATTERNS)
+    return _SECTION_CLASSIFIER
+
+def __getattr__(name):
+    """The compiled module constants, built when first read instead of at import"""
+    if name == 'BUILTIN_PROFILES':
+        return builtin_profiles()
+    if name == 'KEYWORD_INDEX':
+        return builtin_profiles()['keyword_index']
+    if name == 'SECTION_CLASSIFIER':
+        return section_classifier()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# A non-blank line without its surrounding whitespace
+LINE_PATTERN = re.compile(r'\S(?:[^\n]*\S)?')
+
+def classify_section_header(line):
+    """Section name if this stripped line is a section header, else None"""
+    match = (_SECTION_CLASSIFIER or section_classifier()).match(line)
+    return match.lastgroup if match else None
+
+def segment_resume(text, classify=classify_section_header):
+    """Split text into sections in one pass, as spans into text rather than copied lines
+
+    Returns a list of (section, header_span, line_spans) in document order. Spans are
+    (line_number, start, end) with text[start:end] the stripped line; the leading
+    'header' section has no header_span.
+    """
+    segments = []
+    section_name, header_span, line_spans = 'header', None, []
+    line_number, counted_to = 0, 0
+    for match in LINE_PATTERN.finditer(text):
+        start, end = match.span()
+        line_number += text.count('\n', counted_to, start)
+        counted_to = start
+        header = classify(match.group())
+        if header is None:
+            line_spans.append((line_number, start, end))
+            continue
+        segments.append((section_name, header_span, line_spans))
+        section_name, header_span, line_spans = header, (line_number, start, end), []
+    segments.append((section_name, header_span, line_spans))
+    return segments
+
+def sections_from_segments(text, segments):
+    """parse_resume_sections' {section: [lines]} view of segment_resume output"""
+    sections = {}
+    for section_name, _, line_spans in segments:
+        # Empty sections are dropped and a repeated section keeps its last occurrence
+        if line_spans:
+            sections[section_name] = [text[start:end] for _, start, end in line_spans]
     return sections
 
+class SectionParser:
+    """Incremental parse_resume_sections: feed text as it arrives, get sections as they close"""
+
+    section_patterns = SECTION_PATTERNS
+
+    def __init__(self):
+        self.current_section = 'header'
+        self.current_content = []
+        self._pending = ''
+
+    def classify_header(self, line):
+        """Section name if this stripped line is a section header, else None"""
+        return classify_section_header(line)
+
+    def _add_line(self, line, completed):
+        line = line.strip()
+        if not line:
+            return
+        section_name = self.classify_header(line)
+        if section_name is None:
+            self.current_content.append(line)
+            return
+        if self.current_content:
+            completed.append((self.current_section, self.current_content))
+        self.current_section = section_name
+        self.current_content = []
+
+    def feed(self, text):
+        """Consume text and return the (section, lines) pairs closed by it"""
+        completed = []
+        lines = (self._pending + text).split('\n')
+        # The last piece may be the start of a line that continues in the next chunk
+        self._pending = lines.pop()
+        for line in lines:
+            self._add_line(line, completed)
+        return completed
+
+    def finish(self):
+        """Flush the trailing line and the last open section"""
+        completed = []
+        self._add_line(self._pending, completed)
+        self._pending = ''
+        if self.current_content:
+            completed.append((self.current_section, self.current_content))
+            self.current_content = []
+        return completed
+
+def parse_resume_sections(text):
+    """Advanced section parsing with better detection"""
+    return sections_from_segments(text, segment_resume(text))
+
+def stream_resume_sections(file_path, max_pages=None, max_bytes=None, stats=None):
+    """Yield (section, lines) as soon as each section closes while pages are still being read"""
+    parser = SectionParser()
+    for page_number, page_text in enumerate(iter_resume_pages(file_path, max_pages, max_bytes, stats)):
+        yield from parser.feed(page_text if page_number == 0 else '\n' + page_text)
+    yield from parser.finish()
+
+# Numbers/metrics and bullet markers counted by the scorers
+METRIC_PATTERN = re.compile(r'\d+[%x+]?|\d+\.\d+[%]?')
+BULLET_PATTERN = re.compile(r'[•\-\*]')
+
+def scan_text(text, keyword_index):
+    """Words, keyword hits, metrics and bullet offsets of a piece of resume text"""
+    with timed_stage('keywords') as stage:
+        keyword_hits = match_keywords(text.lower(), keyword_index)
+        stage.add(keyword_hits=len(keyword_hits))
+    return {
+        'words': text.split(),
+        'keyword_hits': keyword_hits,
+        'numbers_metrics': METRIC_PATTERN.findall(text),
+        'bullet_positions': [m.start() for m in BULLET_PATTERN.finditer(text)]
+    }
+
+class ResumeAnalysis:
+    """Resume text lowercased, tokenized and scanned once, shared by every scorer"""
+
+    def __init__(self, text, sections=None, profiles=None, scan=None):
+        self.text = text
+        self.profiles = profiles or builtin_profiles()
+        self.text_lower = text.lower()
+        if scan is None:
+            scan = scan_text(text, self.profiles['keyword_index'])
+        self.words = scan['words']
+        self.keyword_hits = scan['keyword_hits']
+        self.keywords = {keyword for _, keyword, _ in self.keyword_hits}
+        self.numbers_metrics = scan['numbers_metrics']
+        self.bullet_positions = scan['bullet_positions']
+        self._sections = sections
+        self._segments = None
+        self._token_offsets = None
+        self._section_views = {}
+        self._section_details = {}
+
+    @classmethod
+    def of(cls, text, profiles=None):
+        """Reuse an existing analysis or build one from raw text"""
+        return text if isinstance(text, cls) else cls(text, profiles=profiles)
+
+    @property
+    def segments(self):
+        """segment_resume spans over this text, parsed once"""
+        if self._segments is None:
+            with timed_stage('sections') as stage:
+                self._segments = segment_resume(self.text)
+                stage.add(sections=len(self._segments))
+        return self._segments
+
+    @property
+    def sections(self):
+        if self._sections is None:
+            self._sections = sections_from_segments(self.text, self.segments)
+        return self._sections
+
+    @property
+    def token_offsets(self):
+        """(start, end) offsets of every whitespace-delimited token"""
+        if self._token_offsets is None:
+            self._token_offsets = [m.span() for m in re.finditer(r'\S+', self.text)]
+        return self._token_offsets
+
+    def section(self, section_name):
+        """Analysis view over one section's joined lines"""
+        if section_name not in self._section_views:
+            content = self.sections.get(section_name, [])
+            self._section_views[section_name] = ResumeAnalysis(' '.join(content), sections={},
+                                                               profiles=self.profiles)
+        return self._section_views[section_name]
+
+    def section_details(self, section_name):
+        """Memoized analyze_section_details for one section"""
+        if section_name not in self._section_details:
+            self._section_details[section_name] = analyze_section_details(
+                section_name, self.sections.get(section_name, []), self.section(section_name))
+        return self._section_details[section_name]
+
 def analyze_technical_keywords(text):
     """Analyze technical keywords by category"""
-    text_lower = text.lower()
-    found_keywords = {}
+    doc = ResumeAnalysis.of(text)
+    present = doc.keywords
+    tech_keywords = {}
     
-    for category, keywords in TECH_CATEGORIES.items():
-        found = [kw for kw in keywords if kw.lower() in text_lower]
+    for category, keywords in doc.profiles['tech_categories'].items():
+        found = [kw for kw in keywords if kw.lower() in present]
         if found:
-            found_keywords[category] = found
+            tech_keywords[category] = found
     
-    return found_keywords
+    return tech_keywords
 
 def calculate_job_profile_match(text, sections):
     """Calculate match percentage for each job profile"""
-    text_lower = text.lower()
+    doc = ResumeAnalysis.of(text)
+    present = doc.keywords
     matches = {}
     
-    for profile_id, profile in JOB_PROFILES.items():
-        required_found = sum(1 for kw in profile['required_keywords'] if kw in text_lower)
-        preferred_found = sum(1 for kw in profile['preferred_keywords'] if kw in text_lower)
-        action_verbs_found = sum(1 for verb in profile['action_verbs'] if verb in text_lower)
+    for profile_id, profile in doc.profiles['job_profiles'].items():
+        required_found = sum(1 for kw in profile['required_keywords'] if kw in present)
+        preferred_found = sum(1 for kw in profile['preferred_keywords'] if kw in present)
+        action_verbs_found = sum(1 for verb in profile['action_verbs'] if verb in present)
         
-        # Calculate match percentage
-        required_score = (required_found / len(profile['required_keywords'])) * 60
-        preferred_score = (preferred_found / len(profile['preferred_keywords'])) * 25
-        action_verb_score = (action_verbs_found / len(profile['action_verbs'])) * 15
+        # Calculate match percentage; an empty list (a job description naming no
+        # preferred skills) contributes nothing instead of dividing by zero
+        required_score = (required_found / len(profile['required_keywords'])) * 60 if profile['required_keywords'] else 0
+        preferred_score = (preferred_found / len(profile['preferred_keywords'])) * 25 if profile['preferred_keywords'] else 0
+        action_verb_score = (action_verbs_found / len(profile['action_verbs'])) * 15 if profile['action_verbs'] else 0
         
         total_score = required_score + preferred_score + action_verb_score
         
         # Find missing keywords
-        missing_required = [kw for kw in profile['required_keywords'] if kw not in text_lower]
-        missing_preferred = [kw for kw in profile['preferred_keywords'] if kw not in text_lower]
+        missing_required = [kw for kw in profile['required_keywords'] if kw not in present]
+        missing_preferred = [kw for kw in profile['preferred_keywords'] if kw not in present]
         
         matches[profile_id] = {
             'title': profile['title'],
@@ -294,7 +1174,7 @@ def calculate_job_profile_match(text, sections):
     
     return matches
 
-def analyze_section_details(section_name, content):
+def analyze_section_details(section_name, content, doc=None):
     """Enhanced detailed analysis of each section with industry benchmarks"""
     analysis = {
         'word_count': 0,
@@ -315,30 +1195,36 @@ def analyze_section_details(section_name, content):
         analysis['improvement_priority'] = 'CRITICAL'
         return analysis
     
-    full_text = ' '.join(content)
-    words = full_text.split()
-    analysis['word_count'] = len(words)
+    if doc is None:
+        doc = ResumeAnalysis(' '.join(content), sections={})
+    full_text = doc.text
+    analysis['word_count'] = len(doc.words)
     analysis['sentence_count'] = len([s for s in full_text.split('.') if s.strip()])
     
+    present = doc.keywords
+    job_profiles = doc.profiles['job_profiles']
+    tech_categories = doc.profiles['tech_categories']
+    section_benchmarks = doc.profiles['section_benchmarks']
+    
     # Find action verbs
-    for verb_list in JOB_PROFILES.values():
+    for verb_list in job_profiles.values():
         for verb in verb_list['action_verbs']:
-            if verb.lower() in full_text.lower():
+            if verb.lower() in present:
                 analysis['action_verbs'].append(verb)
     analysis['action_verbs'] = list(set(analysis['action_verbs']))
     
     # Find technical terms
-    for category, keywords in TECH_CATEGORIES.items():
+    for category, keywords in tech_categories.items():
         for keyword in keywords:
-            if keyword.lower() in full_text.lower():
+            if keyword.lower() in present:
                 analysis['technical_terms'].append(keyword)
     
     # Find numbers and metrics
-    analysis['numbers_metrics'] = re.findall(r'\d+[%x+]?|\d+\.\d+[%]?', full_text)
+    analysis['numbers_metrics'] = list(doc.numbers_metrics)
     
     # Section-specific detailed analysis
     if section_name == 'experience':
-        benchmark = SECTION_BENCHMARKS['experience']
+        benchmark = section_benchmarks['experience']
         
         # Word count analysis
         if analysis['word_count'] < benchmark['min_words']:
@@ -378,7 +1264,7 @@ def analyze_section_details(section_name, content):
         ])
     
     elif section_name == 'skills':
-        benchmark = SECTION_BENCHMARKS['skills']
+        benchmark = section_benchmarks['skills']
         
         if len(analysis['technical_terms']) < benchmark['min_tech_terms']:
             analysis['issues'].append(f"⚠️ MODERATE: Limited technical skills ({len(analysis['technical_terms'])}) - Industry minimum: {benchmark['min_tech_terms']}")
@@ -402,7 +1288,7 @@ def analyze_section_details(section_name, content):
         ])
     
     elif section_name == 'projects':
-        benchmark = SECTION_BENCHMARKS['projects']
+        benchmark = section_benchmarks['projects']
         
         if analysis['word_count'] < benchmark['min_words']:
             analysis['issues'].append(f"⚠️ MODERATE: Projects need more detailed descriptions ({analysis['word_count']} words)")
@@ -429,7 +1315,7 @@ def analyze_section_details(section_name, content):
         ])
     
     elif section_name == 'achievements':
-        benchmark = SECTION_BENCHMARKS['achievements']
+        benchmark = section_benchmarks['achievements']
         
         if len(analysis['numbers_metrics']) < benchmark['min_metrics']:
             analysis['issues'].append(f"⚠️ MODERATE: Need more quantified achievements ({len(analysis['numbers_metrics'])}) - Target: {benchmark['min_metrics']}+")
@@ -445,7 +1331,7 @@ def analyze_section_details(section_name, content):
     
     elif section_name == 'education':
         # Enhanced GPA/CGPA detection and recommendation logic
-        text_lower = full_text.lower()
+        text_lower = doc.text_lower
         
         # Check for existing GPA/CGPA mentions
         has_gpa = any(term in text_lower for term in ['gpa', 'cgpa', 'grade point', 'cumulative'])
@@ -506,8 +1392,8 @@ def analyze_section_details(section_name, content):
     
     # Calculate benchmark score
     score_factors = []
-    if section_name in SECTION_BENCHMARKS:
-        benchmark = SECTION_BENCHMARKS[section_name]
+    if section_name in section_benchmarks:
+        benchmark = section_benchmarks[section_name]
         if 'min_words' in benchmark:
             score_factors.append(min(analysis['word_count'] / benchmark['ideal_words'], 1.0) * 30)
         if 'min_tech_terms' in benchmark:
@@ -521,8 +1407,22 @@ def analyze_section_details(section_name, content):
     
     return analysis
 
-def calculate_comprehensive_ats_score(text, sections, job_matches):
+# ATS score components: points per hit up to a maximum (25/20/20/15/10/10 by default);
+# completeness scores each required section plus a contact bonus, and job relevance is
+# the best job match percentage divided down
+ATS_WEIGHTS = {
+    'technical_keywords': {'per_hit': 1.5, 'max': 25},
+    'action_verbs': {'per_hit': 2, 'max': 20},
+    'quantification': {'per_hit': 2, 'max': 20},
+    'formatting': {'per_hit': 1, 'max': 15},
+    'completeness': {'per_section': 3, 'contact': 1},
+    'job_relevance': {'divisor': 10, 'max': 10}
+}
+ATS_REQUIRED_SECTIONS = ['education', 'experience', 'skills']
+
+def calculate_comprehensive_ats_score(text, sections, job_matches, weights=None):
     """Enhanced ATS scoring with detailed breakdown"""
+    weights = weights or ATS_WEIGHTS
     scores = {
         'technical_keywords': 0,
         'action_verbs': 0,
@@ -532,308 +1432,447 @@ def calculate_comprehensive_ats_score(text, sections, job_matches):
         'job_relevance': 0
     }
     
-    text_lower = text.lower()
+    doc = ResumeAnalysis.of(text)
+    present = doc.keywords
     
     # Technical keywords (25 points)
-    all_tech_keywords = [kw for cat in TECH_CATEGORIES.values() for kw in cat]
-    matched_tech = [kw for kw in all_tech_keywords if kw in text_lower]
-    scores['technical_keywords'] = min(len(matched_tech) * 1.5, 25)
+    all_tech_keywords = [kw for cat in doc.profiles['tech_categories'].values() for kw in cat]
+    matched_tech = [kw for kw in all_tech_keywords if kw in present]
+    scores['technical_keywords'] = min(len(matched_tech) * weights['technical_keywords']['per_hit'],
+                                       weights['technical_keywords']['max'])
     
     # Action verbs (20 points)
     all_action_verbs = set()
-    for profile in JOB_PROFILES.values():
+    for profile in doc.profiles['job_profiles'].values():
         all_action_verbs.update(profile['action_verbs'])
     
-    action_verb_count = sum(1 for verb in all_action_verbs if verb in text_lower)
-    scores['action_verbs'] = min(action_verb_count * 2, 20)
+    action_verb_count = sum(1 for verb in all_action_verbs if verb in present)
+    scores['action_verbs'] = min(action_verb_count * weights['action_verbs']['per_hit'],
+                                 weights['action_verbs']['max'])
     
     # Quantification (20 points)
-    numbers_count = len(re.findall(r'\d+[%x+]?|\d+\.\d+[%]?', text))
-    scores['quantification'] = min(numbers_count * 2, 20)
+    numbers_count = len(doc.numbers_metrics)
+    scores['quantification'] = min(numbers_count * weights['quantification']['per_hit'],
+                                   weights['quantification']['max'])
     
     # Formatting (15 points)
-    bullet_count = len(re.findall(r'[•\-\*]', text))
-    scores['formatting'] = min(bullet_count * 1, 15)
+    bullet_count = len(doc.bullet_positions)
+    scores['formatting'] = min(bullet_count * weights['formatting']['per_hit'], weights['formatting']['max'])
     
     # Completeness (10 points)
-    required_sections = ['education', 'experience', 'skills']
-    present_sections = [s for s in required_sections if s in sections and sections[s]]
-    scores['completeness'] = len(present_sections) * 3 + (1 if 'contact' in sections else 0)
+    present_sections = [s for s in ATS_REQUIRED_SECTIONS if s in sections and sections[s]]
+    scores['completeness'] = (len(present_sections) * weights['completeness']['per_section'] +
+                              (weights['completeness']['contact'] if 'contact' in sections else 0))
     
     # Job relevance (10 points) - based on best job match
     best_match = max(job_matches.values(), key=lambda x: x['score'])
-    scores['job_relevance'] = min(best_match['score'] / 10, 10)
+    scores['job_relevance'] = min(best_match['score'] / weights['job_relevance']['divisor'],
+                                  weights['job_relevance']['max'])
     
     total_score = sum(scores.values())
     return total_score, scores
 
-def generate_comprehensive_report(resume_text, output_file):
-    """Generate the ultimate detailed resume analysis report"""
-    sections = parse_resume_sections(resume_text)
-    tech_keywords = analyze_technical_keywords(resume_text)
-    job_matches = calculate_job_profile_match(resume_text, sections)
-    ats_score, score_breakdown = calculate_comprehensive_ats_score(resume_text, sections, job_matches)
-    
-    # Get best job matches
-    sorted_matches = sorted(job_matches.items(), key=lambda x: x[1]['score'], reverse=True)
+def analyze_resume(resume_text, profiles=None):
+    """Run every scorer once and return the machine-readable analysis result"""
+    with timed_stage('score'):
+        doc = ResumeAnalysis.of(resume_text, profiles)
+        sections = doc.sections
+        tech_keywords = analyze_technical_keywords(doc)
+        job_matches = calculate_job_profile_match(doc, sections)
+        ats_score, score_breakdown = calculate_comprehensive_ats_score(doc, sections, job_matches)
+        
+        # Best job matches first
+        sorted_matches = sorted(job_matches.items(), key=lambda x: x[1]['score'], reverse=True)
+        best_match = sorted_matches[0]
+        
+        return {
+            'summary': {
+                'ats_score': ats_score,
+                'best_job_match': best_match[1]['title'],
+                'match_percentage': best_match[1]['score'],
+                'sections_analyzed': len(sections),
+                'tech_keywords_found': sum(len(keywords) for keywords in tech_keywords.values()),
+                'total_words': len(doc.words),
+                'improvement_potential': min(ats_score + 15, 95)
+            },
+            'best_job_profile': best_match[0],
+            'score_breakdown': score_breakdown,
+            'job_matches': dict(sorted_matches),
+            'tech_keywords': tech_keywords,
+            'keywords': sorted(doc.keywords),
+            'tech_keywords_missing': {
+                category: [kw for kw in doc.profiles['tech_categories'][category]
+                           if kw not in [k.lower() for k in keywords]]
+                for category, keywords in tech_keywords.items()
+            },
+            'sections': sections,
+            'section_analyses': {section_name: doc.section_details(section_name) for section_name in sections}
+        }
+
+def _content_digest(text):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+class IncrementalAnalyzer:
+    """analyze_resume for a resume edited in place, re-scoring only the sections that changed
+
+    Each non-blank line is scanned on its own and remembered by its text, and each
+    section's analyze_section_details result by a hash of its content. Keywords, metrics,
+    bullets and words never span a line break, so the merged line scans equal a full-text
+    scan and the global ATS score and job matches come out identical.
+    """
+
+    def __init__(self, profiles=None):
+        self.profiles = profiles or builtin_profiles()
+        self._scans = {}
+        self._headers = {}
+        self._details = {}
+        self._last = None
+        self.last_stats = {}
+
+    def analyze(self, resume_text):
+        """Same result as analyze_resume(resume_text) for this analyzer's profiles"""
+        text_digest = _content_digest(resume_text)
+        if self._last is not None and self._last[0] == text_digest:
+            self.last_stats = {'unchanged': True, 'lines_rescanned': 0, 'sections_rescored': 0}
+            return self._last[1]
+
+        headers = {}
+
+        def classify(line):
+            """classify_section_header, reusing the previous version's answer per line"""
+            if line in headers:
+                return headers[line]
+            header = self._headers[line] if line in self._headers else classify_section_header(line)
+            headers[line] = header
+            return header
+
+        with timed_stage('sections') as stage:
+            segments = segment_resume(resume_text, classify)
+            stage.add(sections=len(segments))
+        keyword_index = self.profiles['keyword_index']
+        scans = {}
+        merged = {'words': [], 'keyword_hits': [], 'numbers_metrics': [], 'bullet_positions': []}
+        rescanned = 0
+        for _, header_span, line_spans in segments:
+            for _, start, end in ([header_span] if header_span else []) + line_spans:
+                line = resume_text[start:end]
+                scan = scans.get(line) or self._scans.get(line)
+                if scan is None:
+                    scan = scan_text(line, keyword_index)
+                    rescanned += 1
+                scans[line] = scan
+                merged['words'].extend(scan['words'])
+                # Line-relative offsets become offsets into the whole text
+                if scan['keyword_hits']:
+                    merged['keyword_hits'].extend((offset + start, keyword, memberships)
+                                                  for offset, keyword, memberships in scan['keyword_hits'])
+                merged['numbers_metrics'].extend(scan['numbers_metrics'])
+                if scan['bullet_positions']:
+                    merged['bullet_positions'].extend(offset + start for offset in scan['bullet_positions'])
+
+        doc = ResumeAnalysis(resume_text, profiles=self.profiles, scan=merged)
+        doc._segments = segments
+        details = {}
+        rescored = 0
+        for section_name, content in doc.sections.items():
+            key = (section_name, _content_digest('\n'.join(content)))
+            if key in self._details:
+                doc._section_details[section_name] = self._details[key]
+            else:
+                rescored += 1
+            details[key] = doc.section_details(section_name)
+
+        result = analyze_resume(doc)
+        # Keep only what the latest version uses, so memory tracks one resume
+        self._scans, self._headers, self._details = scans, headers, details
+        self._last = (text_digest, result)
+        self.last_stats = {
+            'unchanged': False,
+            'lines': len(scans),
+            'lines_rescanned': rescanned,
+            'sections': len(details),
+            'sections_rescored': rescored
+        }
+        return result
+
+def write_text_report(result, f):
+    """Render an analyze_resume result as the detailed text report"""
+    summary = result['summary']
+    ats_score = summary['ats_score']
+    score_breakdown = result['score_breakdown']
+    sorted_matches = list(result['job_matches'].items())
     best_match = sorted_matches[0]
+    tech_keywords = result['tech_keywords']
+    sections = result['sections']
+    section_analyses = result['section_analyses']
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("🎯 ADVANCED RESUME INTELLIGENCE REPORT\n")
-        f.write("=" * 80 + "\n\n")
+    f.write("🎯 ADVANCED RESUME INTELLIGENCE REPORT\n")
+    f.write("=" * 80 + "\n\n")
+    
+    # Executive Summary
+    f.write("📊 EXECUTIVE SUMMARY\n")
+    f.write("-" * 40 + "\n")
+    f.write(f"Overall ATS Score: {ats_score:.1f}/100\n")
+    f.write(f"Best Job Match: {best_match[1]['title']} ({best_match[1]['score']:.1f}%)\n")
+    f.write(f"Technical Keywords Found: {sum(len(keywords) for keywords in tech_keywords.values())}\n")
+    f.write(f"Sections Analyzed: {len(sections)}\n")
+    f.write(f"Total Word Count: {summary['total_words']}\n\n")
+    
+    # Score Interpretation with detailed feedback
+    if ats_score >= 90:
+        f.write("🟢 OUTSTANDING - Your resume is exceptionally optimized and will pass most ATS systems\n")
+        f.write("   💡 Focus on minor refinements and targeting specific job requirements\n")
+    elif ats_score >= 80:
+        f.write("🟢 EXCELLENT - Resume is highly optimized and ATS-friendly\n")
+        f.write("   💡 Small improvements will make you a top candidate\n")
+    elif ats_score >= 70:
+        f.write("🟡 GOOD - Some improvements will significantly boost your success rate\n")
+        f.write("   💡 Focus on technical keywords and quantifiable achievements\n")
+    elif ats_score >= 55:
+        f.write("🟠 FAIR - Significant improvements needed for better results\n")
+        f.write("   💡 Major revision required in multiple areas\n")
+    else:
+        f.write("🔴 NEEDS MAJOR WORK - Comprehensive overhaul required for ATS compatibility\n")
+        f.write("   💡 Consider professional resume review or complete rewrite\n")
+    f.write("\n")
+    
+    # Detailed Score Breakdown with explanations
+    f.write("📈 DETAILED ATS SCORE BREAKDOWN\n")
+    f.write("-" * 50 + "\n")
+    for category, score in score_breakdown.items():
+        category_name = category.replace('_', ' ').title()
+        percentage = (score / (25 if 'keywords' in category else 20 if category in ['action_verbs', 'quantification'] else 15 if 'formatting' in category else 10)) * 100
         
-        # Executive Summary
-        f.write("📊 EXECUTIVE SUMMARY\n")
-        f.write("-" * 40 + "\n")
-        f.write(f"Overall ATS Score: {ats_score:.1f}/100\n")
-        f.write(f"Best Job Match: {best_match[1]['title']} ({best_match[1]['score']:.1f}%)\n")
-        f.write(f"Technical Keywords Found: {sum(len(keywords) for keywords in tech_keywords.values())}\n")
-        f.write(f"Sections Analyzed: {len(sections)}\n")
-        f.write(f"Total Word Count: {len(resume_text.split())}\n\n")
-        
-        # Score Interpretation with detailed feedback
-        if ats_score >= 90:
-            f.write("🟢 OUTSTANDING - Your resume is exceptionally optimized and will pass most ATS systems\n")
-            f.write("   💡 Focus on minor refinements and targeting specific job requirements\n")
-        elif ats_score >= 80:
-            f.write("🟢 EXCELLENT - Resume is highly optimized and ATS-friendly\n")
-            f.write("   💡 Small improvements will make you a top candidate\n")
-        elif ats_score >= 70:
-            f.write("🟡 GOOD - Some improvements will significantly boost your success rate\n")
-            f.write("   💡 Focus on technical keywords and quantifiable achievements\n")
-        elif ats_score >= 55:
-            f.write("🟠 FAIR - Significant improvements needed for better results\n")
-            f.write("   💡 Major revision required in multiple areas\n")
-        else:
-            f.write("🔴 NEEDS MAJOR WORK - Comprehensive overhaul required for ATS compatibility\n")
-            f.write("   💡 Consider professional resume review or complete rewrite\n")
-        f.write("\n")
+        f.write(f"  {category_name}: {score:.1f} points ({percentage:.0f}%)\n")
         
-        # Detailed Score Breakdown with explanations
-        f.write("📈 DETAILED ATS SCORE BREAKDOWN\n")
-        f.write("-" * 50 + "\n")
-        for category, score in score_breakdown.items():
-            category_name = category.replace('_', ' ').title()
-            percentage = (score / (25 if 'keywords' in category else 20 if category in ['action_verbs', 'quantification'] else 15 if 'formatting' in category else 10)) * 100
-            
-            f.write(f"  {category_name}: {score:.1f} points ({percentage:.0f}%)\n")
-            
-            # Add specific feedback for each category
-            if category == 'technical_keywords':
-                f.write("    💡 Boost by: Adding more relevant technical skills and tools\n")
-            elif category == 'action_verbs':
-                f.write("    💡 Boost by: Starting more bullets with strong action verbs\n")
-            elif category == 'quantification':
-                f.write("    💡 Boost by: Adding more numbers, percentages, and metrics\n")
-            elif category == 'formatting':
-                f.write("    💡 Boost by: Using consistent bullet points and clear structure\n")
-            elif category == 'completeness':
-                f.write("    💡 Boost by: Ensuring all key sections are present and detailed\n")
-            elif category == 'job_relevance':
-                f.write("    💡 Boost by: Better aligning content with target job requirements\n")
-        f.write("\n")
+        # Add specific feedback for each category
+        if category == 'technical_keywords':
+            f.write("    💡 Boost by: Adding more relevant technical skills and tools\n")
+        elif category == 'action_verbs':
+            f.write("    💡 Boost by: Starting more bullets with strong action verbs\n")
+        elif category == 'quantification':
+            f.write("    💡 Boost by: Adding more numbers, percentages, and metrics\n")
+        elif category == 'formatting':
+            f.write("    💡 Boost by: Using consistent bullet points and clear structure\n")
+        elif category == 'completeness':
+            f.write("    💡 Boost by: Ensuring all key sections are present and detailed\n")
+        elif category == 'job_relevance':
+            f.write("    💡 Boost by: Better aligning content with target job requirements\n")
+    f.write("\n")
+    
+    # Job Profile Analysis with detailed insights
+    f.write("💼 COMPREHENSIVE JOB PROFILE COMPATIBILITY\n")
+    f.write("-" * 60 + "\n")
+    for i, (profile_id, match) in enumerate(sorted_matches, 1):
+        f.write(f"{i}. {match['title']}: {match['score']:.1f}% compatibility\n")
+        f.write(f"   ✅ Required keywords matched: {match['required_found']}/{match['required_total']} ({(match['required_found']/match['required_total']*100):.0f}%)\n")
+        f.write(f"   ✅ Preferred keywords matched: {match['preferred_found']}/{match['preferred_total']} ({(match['preferred_found']/match['preferred_total']*100):.0f}%)\n")
+        f.write(f"   ✅ Action verbs used: {match['action_verbs_found']} relevant\n")
         
-        # Job Profile Analysis with detailed insights
-        f.write("💼 COMPREHENSIVE JOB PROFILE COMPATIBILITY\n")
-        f.write("-" * 60 + "\n")
-        for i, (profile_id, match) in enumerate(sorted_matches, 1):
-            f.write(f"{i}. {match['title']}: {match['score']:.1f}% compatibility\n")
-            f.write(f"   ✅ Required keywords matched: {match['required_found']}/{match['required_total']} ({(match['required_found']/match['required_total']*100):.0f}%)\n")
-            f.write(f"   ✅ Preferred keywords matched: {match['preferred_found']}/{match['preferred_total']} ({(match['preferred_found']/match['preferred_total']*100):.0f}%)\n")
-            f.write(f"   ✅ Action verbs used: {match['action_verbs_found']} relevant\n")
-            
-            if match['missing_required']:
-                f.write(f"   🚨 CRITICAL missing keywords: {', '.join(match['missing_required'][:5])}\n")
-                if len(match['missing_required']) > 5:
-                    f.write(f"   📝 Additional missing: {', '.join(match['missing_required'][5:])}\n")
-            
-            if match['missing_preferred']:
-                f.write(f"   💡 Could strengthen by adding: {', '.join(match['missing_preferred'][:5])}\n")
-                if len(match['missing_preferred']) > 5:
-                    f.write(f"   💡 More suggestions: {', '.join(match['missing_preferred'][5:])}\n")
-            
-            # Add role-specific advice
-            if i == 1:  # Best match
-                f.write(f"   🎯 ROLE FOCUS: This is your strongest match - tailor applications for {match['title']} positions\n")
-            elif match['score'] > 40:
-                f.write(f"   🔄 POTENTIAL: With improvements, this could become a strong secondary target\n")
-            
-            f.write("\n")
+        if match['missing_required']:
+            f.write(f"   🚨 CRITICAL missing keywords: {', '.join(match['missing_required'][:5])}\n")
+            if len(match['missing_required']) > 5:
+                f.write(f"   📝 Additional missing: {', '.join(match['missing_required'][5:])}\n")
         
-        # Enhanced Technical Keywords by Category
-        f.write("🔧 TECHNICAL KEYWORDS ANALYSIS BY CATEGORY\n")
-        f.write("-" * 60 + "\n")
-        for category, keywords in tech_keywords.items():
-            category_name = category.replace('_', ' ').title()
-            f.write(f"📂 {category_name} ({len(keywords)} found):\n")
-            f.write(f"   ✅ Present: {', '.join(keywords)}\n")
-            
-            # Suggest missing keywords from the category
-            all_category_keywords = TECH_CATEGORIES[category]
-            missing = [kw for kw in all_category_keywords if kw not in [k.lower() for k in keywords]]
-            if missing:
-                f.write(f"   💡 Consider adding: {', '.join(missing[:5])}\n")
-            f.write("\n")
+        if match['missing_preferred']:
+            f.write(f"   💡 Could strengthen by adding: {', '.join(match['missing_preferred'][:5])}\n")
+            if len(match['missing_preferred']) > 5:
+                f.write(f"   💡 More suggestions: {', '.join(match['missing_preferred'][5:])}\n")
         
-        if not tech_keywords:
-            f.write("⚠️ WARNING: No technical keywords detected! This is critical for technical roles.\n\n")
+        # Add role-specific advice
+        if i == 1:  # Best match
+            f.write(f"   🎯 ROLE FOCUS: This is your strongest match - tailor applications for {match['title']} positions\n")
+        elif match['score'] > 40:
+            f.write(f"   🔄 POTENTIAL: With improvements, this could become a strong secondary target\n")
         
-        # Section-by-Section Detailed Analysis
-        f.write("📋 COMPREHENSIVE SECTION-BY-SECTION ANALYSIS\n")
-        f.write("=" * 80 + "\n\n")
+        f.write("\n")
+    
+    # Enhanced Technical Keywords by Category
+    f.write("🔧 TECHNICAL KEYWORDS ANALYSIS BY CATEGORY\n")
+    f.write("-" * 60 + "\n")
+    for category, keywords in tech_keywords.items():
+        category_name = category.replace('_', ' ').title()
+        f.write(f"📂 {category_name} ({len(keywords)} found):\n")
+        f.write(f"   ✅ Present: {', '.join(keywords)}\n")
         
-        for i, (section_name, content) in enumerate(sections.items(), 1):
-            section_analysis = analyze_section_details(section_name, content)
-            
-            f.write(f"{i}. {section_name.upper()} SECTION DEEP DIVE\n")
-            f.write("=" * (len(section_name) + 25) + "\n")
-            
-            # Core Metrics
-            f.write("📊 CORE METRICS:\n")
-            f.write(f"   • Word Count: {section_analysis['word_count']}\n")
-            f.write(f"   • Sentence Count: {section_analysis['sentence_count']}\n")
-            f.write(f"   • Technical Terms: {len(section_analysis['technical_terms'])}\n")
-            f.write(f"   • Action Verbs: {len(set(section_analysis['action_verbs']))}\n")
-            f.write(f"   • Metrics/Numbers: {len(section_analysis['numbers_metrics'])}\n")
-            f.write(f"   • Benchmark Score: {section_analysis['benchmark_score']:.1f}/100\n")
-            f.write(f"   • Improvement Priority: {section_analysis['improvement_priority']}\n\n")
-            
-            # Detailed Content Analysis
-            if section_analysis['technical_terms']:
-                f.write("🔧 TECHNICAL TERMS IDENTIFIED:\n")
-                f.write(f"   {', '.join(section_analysis['technical_terms'])}\n\n")
-            
-            if section_analysis['action_verbs']:
-                f.write("💪 ACTION VERBS FOUND:\n")
-                f.write(f"   {', '.join(set(section_analysis['action_verbs']))}\n\n")
-            
-            if section_analysis['numbers_metrics']:
-                f.write("📈 QUANTITATIVE DATA:\n")
-                f.write(f"   {', '.join(section_analysis['numbers_metrics'])}\n\n")
-            
-            # Strengths
-            if section_analysis['strengths']:
-                f.write("✅ SECTION STRENGTHS:\n")
-                for strength in section_analysis['strengths']:
-                    f.write(f"   {strength}\n")
-                f.write("\n")
-            
-            # Issues & Problems
-            if section_analysis['issues']:
-                f.write("⚠️ ISSUES REQUIRING ATTENTION:\n")
-                for issue in section_analysis['issues']:
-                    f.write(f"   {issue}\n")
-                f.write("\n")
-            
-            # Specific Recommendations
-            if section_analysis['recommendations']:
-                f.write("💡 SPECIFIC IMPROVEMENT RECOMMENDATIONS:\n")
-                for rec in section_analysis['recommendations']:
-                    f.write(f"   {rec}\n")
-                f.write("\n")
-            
-            # Industry Insights
-            if section_analysis['industry_insights']:
-                f.write("🏢 INDUSTRY INSIGHTS & BEST PRACTICES:\n")
-                for insight in section_analysis['industry_insights']:
-                    f.write(f"   {insight}\n")
-                f.write("\n")
-            
-            f.write("=" * 80 + "\n\n")
+        # Suggest missing keywords from the category
+        missing = result['tech_keywords_missing'][category]
+        if missing:
+            f.write(f"   💡 Consider adding: {', '.join(missing[:5])}\n")
+        f.write("\n")
+    
+    if not tech_keywords:
+        f.write("⚠️ WARNING: No technical keywords detected! This is critical for technical roles.\n\n")
+    
+    # Section-by-Section Detailed Analysis
+    f.write("📋 COMPREHENSIVE SECTION-BY-SECTION ANALYSIS\n")
+    f.write("=" * 80 + "\n\n")
+    
+    for i, (section_name, content) in enumerate(sections.items(), 1):
+        section_analysis = section_analyses[section_name]
         
-        # Enhanced Final Verdict and Action Plan
-        f.write("🏆 COMPREHENSIVE IMPROVEMENT ACTION PLAN\n")
-        f.write("=" * 60 + "\n\n")
+        f.write(f"{i}. {section_name.upper()} SECTION DEEP DIVE\n")
+        f.write("=" * (len(section_name) + 25) + "\n")
         
-        f.write(f"🎯 PRIMARY TARGET ROLE: {best_match[1]['title']}\n")
-        f.write(f"🎯 CURRENT COMPATIBILITY: {best_match[1]['score']:.1f}%\n")
-        f.write(f"🎯 POTENTIAL WITH IMPROVEMENTS: {min(best_match[1]['score'] + 20, 95):.1f}%\n\n")
+        # Core Metrics
+        f.write("📊 CORE METRICS:\n")
+        f.write(f"   • Word Count: {section_analysis['word_count']}\n")
+        f.write(f"   • Sentence Count: {section_analysis['sentence_count']}\n")
+        f.write(f"   • Technical Terms: {len(section_analysis['technical_terms'])}\n")
+        f.write(f"   • Action Verbs: {len(set(section_analysis['action_verbs']))}\n")
+        f.write(f"   • Metrics/Numbers: {len(section_analysis['numbers_metrics'])}\n")
+        f.write(f"   • Benchmark Score: {section_analysis['benchmark_score']:.1f}/100\n")
+        f.write(f"   • Improvement Priority: {section_analysis['improvement_priority']}\n\n")
         
-        # Priority-based action items
-        f.write("🚨 CRITICAL PRIORITY ACTIONS (Do First):\n")
-        critical_actions = []
-        if best_match[1]['missing_required']:
-            critical_actions.append(f"Add missing critical keywords: {', '.join(best_match[1]['missing_required'][:3])}")
+        # Detailed Content Analysis
+        if section_analysis['technical_terms']:
+            f.write("🔧 TECHNICAL TERMS IDENTIFIED:\n")
+            f.write(f"   {', '.join(section_analysis['technical_terms'])}\n\n")
         
-        # Check for critical section issues
-        for section_name, content in sections.items():
-            analysis = analyze_section_details(section_name, content)
-            if analysis['improvement_priority'] == 'CRITICAL':
-                critical_actions.append(f"Fix {section_name} section - {analysis['issues'][0]}")
+        if section_analysis['action_verbs']:
+            f.write("💪 ACTION VERBS FOUND:\n")
+            f.write(f"   {', '.join(set(section_analysis['action_verbs']))}\n\n")
         
-        for i, action in enumerate(critical_actions[:5], 1):
-            f.write(f"   {i}. {action}\n")
-        f.write("\n")
+        if section_analysis['numbers_metrics']:
+            f.write("📈 QUANTITATIVE DATA:\n")
+            f.write(f"   {', '.join(section_analysis['numbers_metrics'])}\n\n")
         
-        f.write("⚠️ HIGH PRIORITY ACTIONS (Do Next):\n")
-        high_priority = [
-            "Increase action verb usage throughout resume",
-            "Add more quantifiable metrics and achievements",
-            "Expand experience descriptions with technical details",
-            f"Consider these additional keywords: {', '.join(best_match[1]['missing_preferred'][:3])}"
-        ]
-        for i, action in enumerate(high_priority, 1):
-            f.write(f"   {i}. {action}\n")
-        f.write("\n")
+        # Strengths
+        if section_analysis['strengths']:
+            f.write("✅ SECTION STRENGTHS:\n")
+            for strength in section_analysis['strengths']:
+                f.write(f"   {strength}\n")
+            f.write("\n")
         
-        f.write("💡 MEDIUM PRIORITY IMPROVEMENTS (Polish Phase):\n")
-        medium_priority = [
-            "Optimize formatting and visual consistency",
-            "Add links to portfolio/GitHub if missing",
-            "Include relevant certifications or courses",
-            "Tailor summary/objective for specific roles"
-        ]
-        for i, action in enumerate(medium_priority, 1):
-            f.write(f"   {i}. {action}\n")
-        f.write("\n")
+        # Issues & Problems
+        if section_analysis['issues']:
+            f.write("⚠️ ISSUES REQUIRING ATTENTION:\n")
+            for issue in section_analysis['issues']:
+                f.write(f"   {issue}\n")
+            f.write("\n")
         
-        # Success predictions
-        f.write("📈 PREDICTED IMPROVEMENTS WITH CHANGES:\n")
-        f.write(f"   🎯 ATS Score: {ats_score:.1f} → {min(ats_score + 15, 95):.1f} (+{min(15, 95-ats_score):.1f} points)\n")
-        f.write(f"   💼 Job Match: {best_match[1]['score']:.1f}% → {min(best_match[1]['score'] + 20, 90):.1f}% (+{min(20, 90-best_match[1]['score']):.1f}%)\n")
-        f.write(f"   📊 Interview Likelihood: +35% with critical fixes implemented\n\n")
-        
-        # Industry benchmarks comparison
-        f.write("📊 HOW YOU COMPARE TO INDUSTRY STANDARDS:\n")
-        total_words = len(resume_text.split())
-        if total_words < 300:
-            f.write("   📝 Resume Length: Below standard (aim for 400-600 words)\n")
-        elif total_words > 800:
-            f.write("   📝 Resume Length: Too long (aim for 400-600 words)\n")
-        else:
-            f.write("   📝 Resume Length: Good (within industry standards)\n")
+        # Specific Recommendations
+        if section_analysis['recommendations']:
+            f.write("💡 SPECIFIC IMPROVEMENT RECOMMENDATIONS:\n")
+            for rec in section_analysis['recommendations']:
+                f.write(f"   {rec}\n")
+            f.write("\n")
         
-        tech_count = sum(len(keywords) for keywords in tech_keywords.values())
-        if tech_count < 10:
-            f.write("   🔧 Technical Depth: Below average (aim for 15+ technical terms)\n")
-        elif tech_count >= 20:
-            f.write("   🔧 Technical Depth: Excellent (strong technical presence)\n")
-        else:
-            f.write("   🔧 Technical Depth: Good (solid technical foundation)\n")
+        # Industry Insights
+        if section_analysis['industry_insights']:
+            f.write("🏢 INDUSTRY INSIGHTS & BEST PRACTICES:\n")
+            for insight in section_analysis['industry_insights']:
+                f.write(f"   {insight}\n")
+            f.write("\n")
         
-        f.write("\n")
-        f.write("✨ ANALYSIS COMPLETE - READY FOR OPTIMIZATION! ✨\n")
+        f.write("=" * 80 + "\n\n")
     
-    return {
-        'ats_score': ats_score,
-        'best_job_match': best_match[1]['title'],
-        'match_percentage': best_match[1]['score'],
-        'sections_analyzed': len(sections),
-        'tech_keywords_found': sum(len(keywords) for keywords in tech_keywords.values()),
-        'total_words': len(resume_text.split()),
-        'improvement_potential': min(ats_score + 15, 95)
-    }
+    # Enhanced Final Verdict and Action Plan
+    f.write("🏆 COMPREHENSIVE IMPROVEMENT ACTION PLAN\n")
+    f.write("=" * 60 + "\n\n")
+    
+    f.write(f"🎯 PRIMARY TARGET ROLE: {best_match[1]['title']}\n")
+    f.write(f"🎯 CURRENT COMPATIBILITY: {best_match[1]['score']:.1f}%\n")
+    f.write(f"🎯 POTENTIAL WITH IMPROVEMENTS: {min(best_match[1]['score'] + 20, 95):.1f}%\n\n")
+    
+    # Priority-based action items
+    f.write("🚨 CRITICAL PRIORITY ACTIONS (Do First):\n")
+    critical_actions = []
+    if best_match[1]['missing_required']:
+        critical_actions.append(f"Add missing critical keywords: {', '.join(best_match[1]['missing_required'][:3])}")
+    
+    # Check for critical section issues
+    for section_name in sections:
+        analysis = section_analyses[section_name]
+        if analysis['improvement_priority'] == 'CRITICAL':
+            critical_actions.append(f"Fix {section_name} section - {analysis['issues'][0]}")
+    
+    for i, action in enumerate(critical_actions[:5], 1):
+        f.write(f"   {i}. {action}\n")
+    f.write("\n")
+    
+    f.write("⚠️ HIGH PRIORITY ACTIONS (Do Next):\n")
+    high_priority = [
+        "Increase action verb usage throughout resume",
+        "Add more quantifiable metrics and achievements",
+        "Expand experience descriptions with technical details",
+        f"Consider these additional keywords: {', '.join(best_match[1]['missing_preferred'][:3])}"
+    ]
+    for i, action in enumerate(high_priority, 1):
+        f.write(f"   {i}. {action}\n")
+    f.write("\n")
+    
+    f.write("💡 MEDIUM PRIORITY IMPROVEMENTS (Polish Phase):\n")
+    medium_priority = [
+        "Optimize formatting and visual consistency",
+        "Add links to portfolio/GitHub if missing",
+        "Include relevant certifications or courses",
+        "Tailor summary/objective for specific roles"
+    ]
+    for i, action in enumerate(medium_priority, 1):
+        f.write(f"   {i}. {action}\n")
+    f.write("\n")
+    
+    # Success predictions
+    f.write("📈 PREDICTED IMPROVEMENTS WITH CHANGES:\n")
+    f.write(f"   🎯 ATS Score: {ats_score:.1f} → {min(ats_score + 15, 95):.1f} (+{min(15, 95-ats_score):.1f} points)\n")
+    f.write(f"   💼 Job Match: {best_match[1]['score']:.1f}% → {min(best_match[1]['score'] + 20, 90):.1f}% (+{min(20, 90-best_match[1]['score']):.1f}%)\n")
+    f.write(f"   📊 Interview Likelihood: +35% with critical fixes implemented\n\n")
+    
+    # Industry benchmarks comparison
+    f.write("📊 HOW YOU COMPARE TO INDUSTRY STANDARDS:\n")
+    total_words = summary['total_words']
+    if total_words < 300:
+        f.write("   📝 Resume Length: Below standard (aim for 400-600 words)\n")
+    elif total_words > 800:
+        f.write("   📝 Resume Length: Too long (aim for 400-600 words)\n")
+    else:
+        f.write("   📝 Resume Length: Good (within industry standards)\n")
+    
+    tech_count = sum(len(keywords) for keywords in tech_keywords.values())
+    if tech_count < 10:
+        f.write("   🔧 Technical Depth: Below average (aim for 15+ technical terms)\n")
+    elif tech_count >= 20:
+        f.write("   🔧 Technical Depth: Excellent (strong technical presence)\n")
+    else:
+        f.write("   🔧 Technical Depth: Good (solid technical foundation)\n")
+    
+    f.write("\n")
+    f.write("✨ ANALYSIS COMPLETE - READY FOR OPTIMIZATION! ✨\n")
+
+def generate_comprehensive_report(resume_text, output_file=None):
+    """Generate the ultimate detailed resume analysis report"""
+    result = analyze_resume(resume_text)
+    if output_file:
+        write_analysis(result, output_file, 'text')
+    return result['summary']
+
+def report_to_json(result, indent=None):
+    """Serialize an analyze_resume result (or any record built from one) as JSON"""
+    return json.dumps(result, ensure_ascii=False, indent=indent)
+
+def write_ndjson(records, f):
+    """Write one compact JSON record per line, flushing so consumers can tail the stream"""
+    for record in records:
+        f.write(report_to_json(record) + "\n")
+        f.flush()
+
 
 def generate_perfectly_formatted_resume(resume_text, output_file):
     """Generate perfectly formatted resume with proper spacing"""
-    sections = parse_resume_sections(resume_text)
+    # Cleaning is idempotent, so one pass over the whole text replaces per-line cleaning.
+    # An existing ResumeAnalysis (already cleaned) reuses the sections parsed for its report.
+    if isinstance(resume_text, ResumeAnalysis):
+        sections = resume_text.sections
+    else:
+        sections = parse_resume_sections(clean_and_fix_text(resume_text))
     
     with open(output_file, 'w', encoding='utf-8') as f:
         for section_name, content in sections.items():
             if section_name == 'header':
                 # Header without title
                 for line in content:
-                    f.write(clean_and_fix_text(line) + "\n")
+                    f.write(line + "\n")
                 f.write("\n")
             else:
                 # Section with proper formatting
@@ -841,43 +1880,773 @@ def generate_perfectly_formatted_resume(resume_text, output_file):
                 f.write("=" * len(section_name) + "\n\n")
                 
                 for line in content:
-                    cleaned_line = clean_and_fix_text(line)
-                    
                     # Add bullets for appropriate sections
                     if section_name in ['experience', 'projects', 'achievements']:
-                        if not cleaned_line.startswith(('•', '-', '*', '◦')):
-                            cleaned_line = '• ' + cleaned_line
+                        if not line.startswith(('•', '-', '*', '◦')):
+                            line = '• ' + line
                     
-                    f.write(cleaned_line + "\n")
+                    f.write(line + "\n")
                 f.write("\n")
 
+SUPPORTED_EXTENSIONS = ('.pdf', '.txt')
+
+def collect_resume_files(sources, manifest=None):
+    """Expand files, directories, glob patterns and an optional manifest into resume paths"""
+    sources = list(sources)
+    if manifest:
+        with open(manifest, 'r', encoding='utf-8') as f:
+            sources.extend(line.strip() for line in f
+                           if line.strip() and not line.lstrip().startswith('#'))
+    
+    file_paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            for root, dirs, files in os.walk(source):
+                dirs.sort()
+                file_paths.extend(os.path.join(root, name) for name in sorted(files)
+                                  if name.lower().endswith(SUPPORTED_EXTENSIONS))
+        elif any(char in source for char in '*?['):
+            file_paths.extend(path for path in sorted(glob.glob(source, recursive=True))
+                              if path.lower().endswith(SUPPORTED_EXTENSIONS))
+        else:
+            file_paths.append(source)
+    
+    # Keep the first occurrence of each file
+    return list(dict.fromkeys(file_paths))
+
+# One ExtractionCache connection per worker process, keyed by (path, max_bytes)
+_WORKER_CACHES = {}
+
+def _worker_cache(cache_path, cache_max_bytes):
+    key = (cache_path, cache_max_bytes)
+    if key not in _WORKER_CACHES:
+        _WORKER_CACHES[key] = ExtractionCache(cache_path, cache_max_bytes)
+    return _WORKER_CACHES[key]
+
+# One ProfileRegistry per worker process, keyed by its profile paths
+_WORKER_REGISTRIES = {}
+
+def _worker_profiles(profile_paths):
+    """Current profile snapshot for this worker, picking up edited profile files"""
+    key = tuple(profile_paths)
+    if key not in _WORKER_REGISTRIES:
+        _WORKER_REGISTRIES[key] = ProfileRegistry(key)
+    registry = _WORKER_REGISTRIES[key]
+    registry.refresh()
+    return registry.current
+
+# One DedupIndex connection per worker process, keyed by (path, threshold)
+_WORKER_DEDUP = {}
+
+def _worker_dedup(dedup_path, threshold):
+    # Imported here: resume_dedup builds on this module
+    from resume_dedup import DedupIndex
+    key = (dedup_path, threshold)
+    if key not in _WORKER_DEDUP:
+        _WORKER_DEDUP[key] = DedupIndex(dedup_path, threshold)
+    return _WORKER_DEDUP[key]
+
+REPORT_EXTENSIONS = {'text': '.txt', 'json': '.json', 'ndjson': '.ndjson'}
+
+def write_analysis(analysis, output_file, output_format='text'):
+    """Write an analyze_resume result as a text report, a JSON document or one NDJSON line"""
+    with timed_stage('render'), open(output_file, 'w', encoding='utf-8') as f:
+        if output_format == 'text':
+            write_text_report(analysis, f)
+        elif output_format == 'json':
+            f.write(report_to_json(analysis, indent=2))
+        else:
+            write_ndjson([analysis], f)
+
+# Per-resume limits the batch CLI runs workers under (see document_watchdog)
+DOCUMENT_TIMEOUT = 120
+DOCUMENT_MAX_RSS_MB = 2048
+
+# Per-resume settings shared by the CLI, batch workers and other front ends
+DEFAULT_ANALYSIS_OPTIONS = {
+    'cache_path': None,
+    'cache_max_bytes': 512 * 1024 * 1024,
+    'max_pages': None,
+    'max_bytes': None,
+    'output_format': 'text',
+    'profile_paths': (),
+    'dedup_path': None,
+    'dedup_threshold': 0.85,
+    'search_entry': False,
+    'feature_entry': False,
+    'page_workers': None,
+    'page_threshold': PARALLEL_PAGE_THRESHOLD,
+    'extractor': DEFAULT_PDF_EXTRACTOR,
+    'instrument': False,
+    'timeout': None,
+    'max_rss_mb': None
+}
+
+def analyze_resume_file(file_path, output_file, options=None, record=None):
+    """Extract and analyze one resume, returning its summary or the error that stopped it
+
+    With no output_file the full analysis is returned under 'analysis' instead of written.
+    With options['instrument'] the stage records are returned under 'stages', and with
+    options['search_entry'] the fields resume_search indexes under 'search_entry', and with
+    options['feature_entry'] the features feature_store re-scores under 'feature_entry'.
+    A record (number, start, end) from iter_text_records analyzes just that record.
+    """
+    options = {**DEFAULT_ANALYSIS_OPTIONS, **(options or {})}
+    if not options['instrument']:
+        return _analyze_resume_file(file_path, output_file, options, record)
+    collector = ListSink()
+    previous = set_instrumentation(Instrumentation([collector]))
+    try:
+        result = _analyze_resume_file(file_path, output_file, options, record)
+    finally:
+        set_instrumentation(previous)
+    result['stages'] = collector.records
+    return result
+
+def _analyze_resume_file(file_path, output_file, options, record=None):
+    result = {'file': file_path}
+    if record is not None:
+        result['record'] = record[0]
+    if output_file:
+        result['report'] = output_file
+    try:
+        profiles = _worker_profiles(options['profile_paths']) if options['profile_paths'] else None
+        dedup = (_worker_dedup(options['dedup_path'], options['dedup_threshold'])
+                 if options['dedup_path'] else None)
+        check = None
+        doc = None
+        if record is not None:
+            resume_text = read_text_record(file_path, record[1], record[2], options['max_bytes'])
+            if dedup and resume_text:
+                check = dedup.check_text(resume_text, _dedup_analysis_key(profiles))
+        else:
+            cache = (_worker_cache(options['cache_path'], options['cache_max_bytes'])
+                     if options['cache_path'] else None)
+            hits_before, misses_before = (cache.hits, cache.misses) if cache else (0, 0)
+            extract_options = {'page_workers': options['page_workers'], 'page_threshold': options['page_threshold'],
+                               'extractor': options['extractor'], 'stats': {}}
+            if dedup:
+                check = dedup.check_file(file_path, _dedup_analysis_key(profiles), cache,
+                                         options['max_pages'], options['max_bytes'], **extract_options)
+                resume_text = check['text']
+            else:
+                resume_text = extract_resume_text(file_path, cache, options['max_pages'], options['max_bytes'],
+                                                  **extract_options)
+            if 'extractor' in extract_options['stats']:
+                result['extractor'] = extract_options['stats']['extractor']
+                if 'fallback' in extract_options['stats']:
+                    result['extractor_fallback'] = extract_options['stats']['fallback']
+            if cache and (cache.hits, cache.misses) != (hits_before, misses_before):
+                result['cache_hit'] = cache.hits > hits_before
+        if check and check['status'] == 'exact':
+            # Same cleaned text under the same profiles and scoring: reuse the stored analysis
+            analysis = check['analysis']
+        elif not resume_text:
+            result['error'] = "Could not extract text from the file"
+            return result
+        else:
+            doc = ResumeAnalysis(resume_text, profiles=profiles)
+            analysis = analyze_resume(doc, profiles)
+            if check:
+                if check['near_duplicates']:
+                    result['near_duplicates'] = check['near_duplicates']
+                dedup.add(resume_text, file_path, check['file_key'], _dedup_analysis_key(profiles),
+                          analysis, check['fingerprints'])
+        if output_file:
+            write_analysis(analysis, output_file, options['output_format'])
+        else:
+            result['analysis'] = analysis
+        if options['search_entry']:
+            # Imported here: resume_search builds on this module
+            from resume_search import search_entry
+            result['search_entry'] = search_entry(analysis)
+        if options['feature_entry']:
+            from feature_store import resume_features
+            features_key = f"features:{_dedup_analysis_key(profiles)}"
+            features = dedup.stored_analysis(check['text_hash'], features_key) if doc is None else None
+            if features is None:
+                if doc is None:
+                    # An exact duplicate indexed before its features were kept: build them once.
+                    # A file-level hit skipped extraction, so the text is read again here.
+                    if not resume_text:
+                        resume_text = extract_resume_text(file_path, cache, options['max_pages'],
+                                                          options['max_bytes'], **extract_options)
+                    doc = ResumeAnalysis(resume_text, profiles=profiles)
+                features = resume_features(doc)
+                if check:
+                    dedup.store_analysis(check['text_hash'], features_key, features)
+            result['feature_entry'] = features
+        result.update(analysis['summary'])
+        if check and check['status'] == 'exact':
+            # Only counted as reused once its result was actually produced
+            result['duplicate'] = check['text_hash']
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+def _dedup_analysis_key(profiles):
+    """Stored analyses are only reused under the same scoring version and profile set"""
+    return f"{ANALYSIS_VERSION}:{(profiles or builtin_profiles())['fingerprint']}"
+
+def _analyze_chunk(jobs, options=None):
+    """Worker entry point: analyze a chunk of (file_path, output_file) jobs"""
+    return [analyze_resume_file(file_path, output_file, options)
+            for file_path, output_file in jobs]
+
+def _analyze_record_chunk(file_path, jobs, options=None):
+    """Worker entry point: analyze a chunk of (record, output_file) jobs from one TXT export"""
+    return [analyze_resume_file(file_path, output_file, options, record)
+            for record, output_file in jobs]
+
+def run_record_batch(file_paths, delimiter, output_dir, workers=None, chunksize=1, options=None,
+                     max_in_flight=None):
+    """Analyze every delimiter-separated record of large TXT exports, yielding results as they finish
+
+    Workers get byte offsets, not text, and at most max_in_flight chunks are queued at a
+    time, so memory stays flat however many records the files hold. Records run under the
+    document watchdog like run_batch: a chunk the watchdog stops is rerun one record at a
+    time, and the record that hits the limit comes back quarantined.
+    """
+    from concurrent.futures import FIRST_COMPLETED, wait
+    from document_watchdog import DocumentLimitExceeded, quarantine_result
+    options = {**DEFAULT_ANALYSIS_OPTIONS, **(options or {})}
+    os.makedirs(output_dir, exist_ok=True)
+    extension = REPORT_EXTENSIONS[options['output_format']]
+    max_in_flight = max_in_flight or (workers or os.cpu_count() or 1) * 4
+    
+    def chunks():
+        for file_path in file_paths:
+            if not file_path.lower().endswith('.txt'):
+                yield file_path, None
+                continue
+            stem = os.path.splitext(os.path.basename(file_path))[0]
+            jobs = []
+            for record in iter_text_records(file_path, delimiter):
+                output_file = (None if options['output_format'] == 'ndjson' else
+                               os.path.join(output_dir, f"{stem}_{record[0]:05d}_intelligence_report{extension}"))
+                jobs.append((record, output_file))
+                if len(jobs) >= max(chunksize, 1):
+                    yield file_path, jobs
+                    jobs = []
+            if jobs:
+                yield file_path, jobs
+    
+    with batch_executor(workers, options) as executor:
+        watched = hasattr(executor, 'submit_chunk')
+        pending = {}
+        
+        def submit(file_path, jobs):
+            if watched:
+                future = executor.submit_chunk(len(jobs), _analyze_record_chunk, file_path, jobs, options)
+            else:
+                future = executor.submit(_analyze_record_chunk, file_path, jobs, options)
+            pending[future] = (file_path, jobs)
+        
+        def collect(done):
+            for future in done:
+                file_path, jobs = pending.pop(future)
+                try:
+                    yield from future.result()
+                except DocumentLimitExceeded as e:
+                    if len(jobs) > 1:
+                        for job in jobs:
+                            submit(file_path, [job])
+                        continue
+                    yield {**quarantine_result(file_path, e), 'record': jobs[0][0][0]}
+                except Exception as e:
+                    yield from ({'file': file_path, 'record': record[0], 'error': f"Worker failed: {e}"}
+                                for record, _ in jobs)
+        
+        for file_path, jobs in chunks():
+            if jobs is None:
+                yield {'file': file_path, 'error': "Record splitting needs a TXT file"}
+                continue
+            if len(pending) >= max_in_flight:
+                yield from collect(wait(pending, return_when=FIRST_COMPLETED)[0])
+            submit(file_path, jobs)
+        while pending:
+            yield from collect(wait(pending, return_when=FIRST_COMPLETED)[0])
+
+def report_jobs(file_paths, output_dir, output_format='text', taken=None):
+    """(file_path, report path) per resume; repeated file names get _2, _3... (no path for ndjson)
+
+    A suffixed name is skipped while it is already used, in this call or in taken (report
+    paths handed out earlier, e.g. by a job queue into output_dir), so x/a.txt, y/a.txt and
+    a_2.txt never share a report.
+    """
+    jobs = []
+    taken = set() if taken is None else taken
+    extension = REPORT_EXTENSIONS[output_format]
+    for file_path in file_paths:
+        if output_format == 'ndjson':
+            jobs.append((file_path, None))
+            continue
+        stem = os.path.splitext(os.path.basename(file_path))[0]
+        report = os.path.join(output_dir, f"{stem}_intelligence_report{extension}")
+        number = 1
+        while report in taken:
+            number += 1
+            report = os.path.join(output_dir, f"{stem}_{number}_intelligence_report{extension}")
+        taken.add(report)
+        jobs.append((file_path, report))
+    return jobs
+
+def batch_executor(workers=None, options=None):
+    """Process pool for batch work: a WatchdogExecutor when options set a time or memory limit"""
+    options = {**DEFAULT_ANALYSIS_OPTIONS, **(options or {})}
+    if options['timeout'] or options['max_rss_mb']:
+        from document_watchdog import WatchdogExecutor
+        return WatchdogExecutor(workers, options['timeout'], options['max_rss_mb'])
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=workers)
+
+def run_batch(file_paths, output_dir, workers=None, chunksize=1, options=None):
+    """Analyze resumes across a process pool, yielding results in completion order
+
+    For 'ndjson' output no per-resume files are written; each result carries its analysis.
+    With options['timeout'] or options['max_rss_mb'] each resume runs under the document
+    watchdog, and one that hits a limit comes back with a 'quarantined' reason code. A chunk
+    gets the time limit once per resume; when the watchdog stops it, its resumes are run
+    again one at a time so only the offending one is quarantined.
+    """
+    from concurrent.futures import FIRST_COMPLETED, wait
+    from document_watchdog import DocumentLimitExceeded, quarantine_result
+    options = {**DEFAULT_ANALYSIS_OPTIONS, **(options or {})}
+    os.makedirs(output_dir, exist_ok=True)
+    
+    jobs = report_jobs(file_paths, output_dir, options['output_format'])
+    chunksize = max(chunksize, 1)
+    chunks = [jobs[i:i + chunksize] for i in range(0, len(jobs), chunksize)]
+    
+    with batch_executor(workers, options) as executor:
+        watched = hasattr(executor, 'submit_chunk')
+        
+        def submit(chunk):
+            if watched:
+                return executor.submit_chunk(len(chunk), _analyze_chunk, chunk, options)
+            return executor.submit(_analyze_chunk, chunk, options)
+        
+        futures = {submit(chunk): chunk for chunk in chunks}
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = futures.pop(future)
+                try:
+                    results = future.result()
+                except DocumentLimitExceeded as e:
+                    if len(chunk) > 1:
+                        futures.update((submit([job]), [job]) for job in chunk)
+                        continue
+                    results = [quarantine_result(chunk[0][0], e)]
+                except Exception as e:
+                    # The worker itself died (e.g. killed by the OS); fail only its chunk
+                    results = [{'file': file_path, 'error': f"Worker failed: {e}"}
+                               for file_path, _ in chunk]
+                yield from results
+
+def analysis_options(args):
+    """analyze_resume_file options from parsed CLI arguments"""
+    return {
+        'cache_path': args.cache,
+        'cache_max_bytes': args.cache_size_mb * 1024 * 1024,
+        'max_pages': args.max_pages,
+        'max_bytes': args.max_bytes,
+        'output_format': args.format,
+        'profile_paths': tuple(args.profiles or ()),
+        'dedup_path': args.dedup,
+        'dedup_threshold': args.dedup_threshold,
+        'search_entry': bool(args.search_index),
+        'feature_entry': bool(args.feature_store),
+        'page_workers': args.page_workers,
+        'page_threshold': args.page_threshold,
+        'extractor': args.extractor,
+        'instrument': bool(args.profile or args.metrics_prom or args.metrics_jsonl),
+        'timeout': args.timeout,
+        'max_rss_mb': args.max_rss_mb
+    }
+
+def build_instrumentation(args):
+    """Instrumentation with the sinks selected on the command line, or None if none were"""
+    sinks = []
+    if args.profile:
+        sinks.append(MemorySink())
+    if args.metrics_prom:
+        sinks.append(PrometheusFileSink(args.metrics_prom))
+    if args.metrics_jsonl:
+        sinks.append(JsonLinesSink(args.metrics_jsonl))
+    return Instrumentation(sinks) if sinks else None
+
+def finish_instrumentation(instrumentation):
+    """Flush the sinks and print the --profile stage breakdown"""
+    if instrumentation is None:
+        return
+    instrumentation.close()
+    for sink in instrumentation.sinks:
+        if type(sink) is MemorySink:
+            print("\n⏱️ STAGE BREAKDOWN (self time, nested stages excluded):")
+            print(format_breakdown(sink.summary()))
+
+def start_profile_capture(kind):
+    """Begin a cProfile or tracemalloc capture for --profile-capture"""
+    if kind == 'cprofile':
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return kind, profiler
+    if kind == 'tracemalloc':
+        import tracemalloc
+        tracemalloc.start(25)
+        return kind, None
+    return None
+
+def stop_profile_capture(capture, output_prefix):
+    """End the capture, save it next to the report and print the top entries"""
+    if capture is None:
+        return
+    kind, profiler = capture
+    if kind == 'cprofile':
+        import pstats
+        profiler.disable()
+        capture_file = f"{output_prefix}_profile.prof"
+        profiler.dump_stats(capture_file)
+        print(f"\n🔬 cProfile capture: {capture_file} (top functions by cumulative time)")
+        pstats.Stats(profiler, stream=sys.stdout).sort_stats('cumulative').print_stats(15)
+    else:
+        import tracemalloc
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        top = snapshot.statistics('lineno')
+        capture_file = f"{output_prefix}_tracemalloc.txt"
+        with open(capture_file, 'w', encoding='utf-8') as f:
+            f.write(f"current={current} peak={peak}\n")
+            for stat in top[:50]:
+                f.write(f"{stat}\n")
+        print(f"\n🔬 tracemalloc capture: {capture_file} (peak {peak / 1024:.0f} KB traced)")
+        for stat in top[:10]:
+            print(f"   {stat}")
+
+def run_batch_cli(args):
+    """Batch mode: analyze every resume found in the given sources"""
+    file_paths = collect_resume_files(args.resume_file, args.manifest)
+    quarantine = None
+    if args.quarantine:
+        from document_watchdog import Quarantine
+        quarantine = Quarantine(args.quarantine)
+        skipped = [file_path for file_path in file_paths if file_path in quarantine]
+        if skipped:
+            print(f"🚧 Skipping {len(skipped)} quarantined resumes (listed in {args.quarantine})")
+            file_paths = [file_path for file_path in file_paths if file_path not in quarantine]
+    if not file_paths and not args.queue:
+        print("❌ Error: No PDF or TXT resumes found.")
+        sys.exit(1)
+    
+    options = analysis_options(args)
+    output_dir = args.output_dir
+    if args.queue:
+        import signal
+        from job_queue import JobQueue, run_queue
+        queue = JobQueue(args.queue, args.lease_seconds, args.max_attempts, network_fs=args.queue_network_fs)
+        config = queue.configure(args.output_dir, options) if file_paths else queue.config()
+        if config is None:
+            print(f"❌ Error: Queue '{args.queue}' has no jobs; give resumes to enqueue.")
+            sys.exit(1)
+        if file_paths and any(options[name] != value for name, value in config['options'].items()):
+            print("⚠️ Using the analysis options the queue was created with")
+        output_dir = config['output_dir']
+        added = queue.enqueue(file_paths) if file_paths else 0
+        stats = queue.stats()
+        print(f"🗂️ Queue {args.queue}: {added} added, {stats['pending'] + stats['leased']} to do, "
+              f"{stats['done']} done, {stats['failed']} failed")
+        # Let a SIGTERM (preemption, systemctl stop) unwind so leases are handed back
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+        results = run_queue(queue, args.workers, options)
+        args.format = config['options']['output_format']
+    elif args.split_records:
+        delimiter = (args.split_records.replace('\\n', '\n').replace('\\t', '\t')
+                     .replace('\\f', '\f').replace('\\r', '\r'))
+        print(f"🚀 Starting record analysis of {len(file_paths)} delimited exports...")
+        results = run_record_batch(file_paths, delimiter, args.output_dir, args.workers,
+                                   args.chunksize, options)
+    else:
+        print(f"🚀 Starting batch analysis of {len(file_paths)} resumes...")
+        results = run_batch(file_paths, args.output_dir, args.workers, args.chunksize, options)
+    # Workers time their own stages and send the records back with each result
+    instrumentation = build_instrumentation(args)
+    
+    stream = None
+    if args.format == 'ndjson':
+        # One streamed results file instead of a report per resume
+        os.makedirs(output_dir, exist_ok=True)
+        if args.queue:
+            # Appended across resumed runs, one file per host so writers never interleave
+            import socket
+            stream_path = os.path.join(output_dir, f"results_{socket.gethostname()}.ndjson")
+            stream = open(stream_path, 'a', encoding='utf-8')
+        else:
+            stream_path = os.path.join(output_dir, 'results.ndjson')
+            stream = open(stream_path, 'w', encoding='utf-8')
+    
+    search_index = None
+    if args.search_index:
+        from resume_search import ResumeSearchIndex
+        search_index = ResumeSearchIndex(args.search_index)
+    search_entries = []
+    
+    feature_store = None
+    if args.feature_store:
+        from feature_store import FeatureStore
+        feature_store = FeatureStore(args.feature_store)
+        feature_store.add_vocabulary(ProfileRegistry(args.profiles).current if args.profiles else builtin_profiles())
+    feature_entries = []
+    
+    succeeded = 0
+    failed = 0
+    quarantined = Counter()
+    quarantine_logged = 0
+    duplicates = Counter()
+    extractors = Counter()
+    cache_lookups = Counter()
+    for result in results:
+        for record in result.pop('stages', ()):
+            instrumentation.emit(record)
+        label = f"{result['file']}#{result['record']}" if 'record' in result else result['file']
+        if 'retrying' in result:
+            # The queue runs this resume again later; only its final outcome is reported
+            print(f"🔁 {label}: {result['error']} (attempt {result['attempt']}, will retry)")
+            continue
+        if 'search_entry' in result:
+            search_entries.append((label, result.pop('search_entry')))
+            if len(search_entries) >= 1000:
+                search_index.add_many(search_entries)
+                search_entries = []
+        if 'feature_entry' in result:
+            feature_entries.append((label, result.pop('feature_entry')))
+            if len(feature_entries) >= 1000:
+                feature_store.add_many(feature_entries)
+                feature_entries = []
+        if stream:
+            write_ndjson([result], stream)
+        if 'cache_hit' in result:
+            cache_lookups['hits' if result['cache_hit'] else 'misses'] += 1
+        if 'extractor' in result:
+            extractors[result['extractor']] += 1
+            if 'extractor_fallback' in result:
+                extractors[f"fallback: {result['extractor_fallback']}"] += 1
+        if 'quarantined' in result:
+            quarantined[result['quarantined']] += 1
+            # A record is not logged: that would skip its whole export next time
+            if quarantine is not None and 'record' not in result:
+                quarantine.add(result['file'], result['quarantined'], result['error'])
+                quarantine_logged += 1
+            print(f"🚧 {label}: {result['error']} [quarantined: {result['quarantined']}]")
+        elif 'error' in result:
+            failed += 1
+            print(f"❌ {label}: {result['error']}")
+        else:
+            succeeded += 1
+            if 'duplicate' in result:
+                duplicates['exact'] += 1
+            elif 'near_duplicates' in result:
+                duplicates['near'] += 1
+            marker = (" ♻️ duplicate" if 'duplicate' in result else
+                      f" 👯 near {result['near_duplicates'][0]['source']}" if 'near_duplicates' in result else "")
+            print(f"✅ {label}: ATS {result['ats_score']:.1f}/100, "
+                  f"{result['best_job_match']} ({result['match_percentage']:.1f}%){marker}")
+    
+    if stream:
+        stream.close()
+    if search_index:
+        search_index.add_many(search_entries)
+        indexed = search_index.stats()['resumes']
+        search_index.close()
+    if feature_store:
+        feature_store.add_many(feature_entries)
+        stored = feature_store.stats()['resumes']
+        feature_store.close()
+    
+    print(f"\n🎯 BATCH COMPLETE: {succeeded} analyzed, {failed} failed"
+          + (f", {sum(quarantined.values())} quarantined" if quarantined else ""))
+    print(f"   📋 Reports: {stream_path if stream else output_dir}")
+    if args.cache:
+        print(f"   💾 Extraction cache: {cache_lookups['hits']} hits, {cache_lookups['misses']} misses")
+    if args.dedup:
+        print(f"   ♻️ Dedup: {duplicates['exact']} exact duplicates reused, {duplicates['near']} near duplicates flagged")
+    if extractors:
+        print(f"   🧾 PDF extractors: {', '.join(f'{name} {count}' for name, count in sorted(extractors.items()))}")
+    if quarantined:
+        print(f"   🚧 Watchdog: {', '.join(f'{reason} {count}' for reason, count in sorted(quarantined.items()))}"
+              + (f", {quarantine_logged} logged in {args.quarantine}" if quarantine_logged else ""))
+    if args.search_index:
+        print(f"   🔎 Search index: {indexed} resumes in {args.search_index}")
+    if args.feature_store:
+        print(f"   🗃️ Feature store: {stored} resumes in {args.feature_store}")
+    if args.queue:
+        stats = queue.stats()
+        print(f"   🗂️ Queue: {stats['done']} done, {stats['failed']} failed, "
+              f"{stats['quarantined']} quarantined in {args.queue}")
+        queue.close()
+    finish_instrumentation(instrumentation)
+    if failed or quarantined:
+        sys.exit(1)
+
 def main():
     parser = argparse.ArgumentParser(description="Advanced Resume Intelligence System")
-    parser.add_argument("resume_file", help="Path to your resume (PDF or TXT)")
+    parser.add_argument("resume_file", nargs='*',
+                       help="Path to your resume (PDF or TXT); with --batch, any number of files, directories or glob patterns")
     parser.add_argument("-o", "--output", default="detailed_analysis", 
                        help="Output file prefix (default: detailed_analysis)")
+    parser.add_argument("--batch", action="store_true",
+                       help="Analyze many resumes in parallel, writing one report per resume")
+    parser.add_argument("--manifest",
+                       help="File listing one resume path, directory or glob per line (implies --batch)")
+    parser.add_argument("--workers", type=int, default=None,
+                       help="Worker processes for batch mode (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=1,
+                       help="Resumes handed to a worker at a time in batch mode; under --timeout the chunk gets the limit once per resume, and a chunk the watchdog stops is rerun one resume at a time (default: 1)")
+    parser.add_argument("--split-records", metavar="DELIMITER",
+                       help="Treat each TXT file as many resumes separated by DELIMITER (\\n, \\t, \\f escapes allowed; implies --batch)")
+    parser.add_argument("--timeout", type=float, default=DOCUMENT_TIMEOUT,
+                       help=f"Batch: seconds before a resume's worker is killed and the file quarantined, 0 = no limit (default: {DOCUMENT_TIMEOUT:g})")
+    parser.add_argument("--max-rss-mb", type=int, default=DOCUMENT_MAX_RSS_MB,
+                       help=f"Batch: worker resident memory that gets the resume quarantined, 0 = no limit (default: {DOCUMENT_MAX_RSS_MB})")
+    parser.add_argument("--quarantine",
+                       help="JSON-lines log of resumes the watchdog stopped; later batches skip them until the file changes")
+    parser.add_argument("--queue",
+                       help="SQLite job queue: enqueue the given resumes, then work it; rerun to resume (implies --batch)")
+    parser.add_argument("--max-attempts", type=int, default=3,
+                       help="Tries per resume before the queue marks it failed (default: 3)")
+    parser.add_argument("--lease-seconds", type=int, default=300,
+                       help="How long a queue job stays claimed without a heartbeat (default: 300)")
+    parser.add_argument("--queue-network-fs", action="store_true",
+                       help="The queue file is shared by several hosts: use the rollback journal instead of WAL")
+    parser.add_argument("--output-dir", default="batch_reports",
+                       help="Report directory for batch mode (default: batch_reports)")
+    parser.add_argument("--cache",
+                       help="SQLite file caching extracted PDF text across runs")
+    parser.add_argument("--cache-size-mb", type=int, default=512,
+                       help="Extraction cache size cap in MB (default: 512)")
+    parser.add_argument("--dedup",
+                       help="SQLite dedup index: reuse the analysis of exact duplicates, flag near duplicates")
+    parser.add_argument("--dedup-threshold", type=float, default=0.85,
+                       help="Estimated Jaccard similarity that counts as a near duplicate (default: 0.85)")
+    parser.add_argument("--search-index",
+                       help="Add every analyzed resume to this SQLite search index (see resume_search.py)")
+    parser.add_argument("--feature-store",
+                       help="Store every analyzed resume's scoring features in this SQLite file (see feature_store.py)")
+    parser.add_argument("--max-pages", type=int, default=None,
+                       help="Stop reading a PDF after this many pages")
+    parser.add_argument("--max-bytes", type=int, default=None,
+                       help="Stop reading a resume after this many bytes of cleaned text")
+    parser.add_argument("--page-workers", type=int, default=None,
+                       help="Processes extracting the pages of one long PDF in parallel (default: off)")
+    parser.add_argument("--page-threshold", type=int, default=PARALLEL_PAGE_THRESHOLD,
+                       help=f"Fewest pages before --page-workers splits a PDF (default: {PARALLEL_PAGE_THRESHOLD})")
+    parser.add_argument("--extractor", choices=['auto'] + sorted(PDF_EXTRACTORS), default=DEFAULT_PDF_EXTRACTOR,
+                       help="PDF extractor: the text layer, the layout engine, or auto = text layer "
+                            "unless it fails the quality check (default: auto)")
+    parser.add_argument("--format", choices=sorted(REPORT_EXTENSIONS), default="text",
+                       help="Report format; batch ndjson streams every result into one results.ndjson (default: text)")
+    parser.add_argument("--profiles", action="append",
+                       help="JSON/YAML file or directory of job profiles added to the built-ins (repeatable)")
+    parser.add_argument("--profile", action="store_true",
+                       help="Print wall/CPU time and counters for each pipeline stage")
+    parser.add_argument("--profile-capture", choices=['cprofile', 'tracemalloc'],
+                       help="With --profile on a single resume, also capture a cProfile or tracemalloc profile")
+    parser.add_argument("--metrics-prom",
+                       help="Write stage metrics to this file in Prometheus text format")
+    parser.add_argument("--metrics-jsonl",
+                       help="Append one JSON line per stage execution to this file")
     
     args = parser.parse_args()
     
-    if not os.path.exists(args.resume_file):
-        print(f"❌ Error: File '{args.resume_file}' not found.")
+    if args.profile_capture and not args.profile:
+        parser.error("--profile-capture requires --profile")
+    if args.queue and args.split_records:
+        parser.error("--queue works on whole files; it cannot be combined with --split-records")
+    if args.batch or args.manifest or args.split_records or args.queue:
+        if args.profile_capture:
+            parser.error("--profile-capture profiles one process; it cannot follow batch workers")
+        run_batch_cli(args)
+        return
+    
+    if len(args.resume_file) != 1:
+        parser.error("expected exactly one resume file (use --batch for several)")
+    resume_file = args.resume_file[0]
+    
+    if not os.path.exists(resume_file):
+        print(f"❌ Error: File '{resume_file}' not found.")
         sys.exit(1)
     
     print("🚀 Starting Advanced Resume Intelligence Analysis...")
     
+    instrumentation = build_instrumentation(args)
+    set_instrumentation(instrumentation)
+    capture = start_profile_capture(args.profile_capture)
+    
     # Extract and clean text
-    resume_text = extract_resume_text(args.resume_file)
+    cache = ExtractionCache(args.cache, args.cache_size_mb * 1024 * 1024) if args.cache else None
+    extraction = {}
+    resume_text = extract_resume_text(resume_file, cache, args.max_pages, args.max_bytes, args.page_workers,
+                                      args.page_threshold, args.extractor, extraction)
+    if cache:
+        stats = cache.stats()
+        print(f"💾 Extraction cache: {'hit' if stats['hits'] else 'miss'} "
+              f"({stats['entries']} entries, {stats['bytes'] / 1024:.0f} KB)")
+        cache.close()
     if not resume_text:
         print("❌ Error: Could not extract text from the file.")
         sys.exit(1)
     
     print("📖 Text extracted and cleaned successfully")
+    if 'fallback' in extraction:
+        print(f"🧾 Text layer rejected ({extraction['fallback']}); used the layout extractor")
+    elif 'extractor' in extraction:
+        print(f"🧾 Extractor: {extraction['extractor']}")
     
     # Generate comprehensive analysis
-    analysis_file = f"{args.output}_intelligence_report.txt"
+    analysis_file = f"{args.output}_intelligence_report{REPORT_EXTENSIONS[args.format]}"
+    
+    profiles = None
+    if args.profiles:
+        try:
+            profiles = ProfileRegistry(args.profiles).current
+        except (OSError, ValueError) as e:
+            print(f"❌ Error loading profiles: {e}")
+            sys.exit(1)
+        print(f"🗂️ Loaded {len(profiles['job_profiles'])} job profiles")
+    
+    dedup = _worker_dedup(args.dedup, args.dedup_threshold) if args.dedup else None
+    check = dedup.check_text(resume_text, _dedup_analysis_key(profiles)) if dedup else None
+    doc = None
+    if check and check['status'] == 'exact':
+        print("♻️ Exact duplicate of an analyzed resume: reusing its analysis")
+        analysis = check['analysis']
+    else:
+        print("🧠 Running comprehensive resume intelligence analysis...")
+        doc = ResumeAnalysis(resume_text, profiles=profiles)
+        analysis = analyze_resume(doc, profiles)
+        if check:
+            for match in check['near_duplicates']:
+                print(f"👯 Near duplicate of {match['source']} ({match['similarity']:.0%} similar)")
+            dedup.add(resume_text, resume_file, None, _dedup_analysis_key(profiles), analysis,
+                      check['fingerprints'])
+    write_analysis(analysis, analysis_file, args.format)
+    result = analysis['summary']
+    if args.search_index:
+        from resume_search import ResumeSearchIndex
+        search_index = ResumeSearchIndex(args.search_index)
+        search_index.add(resume_file, analysis)
+        search_index.close()
+    if args.feature_store:
+        from feature_store import FeatureStore
+        feature_store = FeatureStore(args.feature_store)
+        feature_store.add(resume_file, doc or ResumeAnalysis(resume_text, profiles=profiles))
+        feature_store.close()
     
-    print("🧠 Running comprehensive resume intelligence analysis...")
-    result = generate_comprehensive_report(resume_text, analysis_file)
+    stop_profile_capture(capture, args.output)
+    set_instrumentation(None)
+    finish_instrumentation(instrumentation)
     
     print(f"\n🎯 COMPREHENSIVE ANALYSIS COMPLETE!")
     print(f"📊 ATS Score: {result['ats_score']:.1f}/100")
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Vectorized Job Profile Matching
+Scores many resumes against many job profiles as sparse matrix products
+"""
+
+import argparse
+import json
+import sys
+
+import numpy as np
+from scipy import sparse
+
+from advanced_resume_analyzer import (
+    JOB_PROFILES, ProfileRegistry, ResumeAnalysis, build_keyword_index, collect_resume_files,
+    extract_resume_text, match_keywords
+)
+
+# Keyword lists scored by calculate_job_profile_match and their weights
+PROFILE_KEYWORD_KINDS = (
+    ('required_keywords', 60),
+    ('preferred_keywords', 25),
+    ('action_verbs', 15)
+)
+
+def compile_profile_matrix(job_profiles=None):
+    """Compile profiles into a keyword-by-(kind, profile) count matrix and list lengths"""
+    job_profiles = JOB_PROFILES if job_profiles is None else job_profiles
+    profile_ids = list(job_profiles)
+    index = build_keyword_index(job_profiles, {})
+    vocabulary = {keyword: column for column, keyword in enumerate(sorted(index['memberships']))}
+
+    # One column block per keyword kind; a keyword listed twice counts twice, as in the loop version
+    rows, cols, values = [], [], []
+    totals = np.zeros((len(PROFILE_KEYWORD_KINDS), len(profile_ids)))
+    for kind_number, (kind, _) in enumerate(PROFILE_KEYWORD_KINDS):
+        for profile_number, profile_id in enumerate(profile_ids):
+            keywords = job_profiles[profile_id][kind]
+            totals[kind_number, profile_number] = len(keywords)
+            for keyword in keywords:
+                rows.append(vocabulary[keyword.lower()])
+                cols.append(kind_number * len(profile_ids) + profile_number)
+                values.append(1)
+
+    counts = sparse.csr_matrix(
+        (values, (rows, cols)),
+        shape=(len(vocabulary), len(PROFILE_KEYWORD_KINDS) * len(profile_ids))
+    )
+    return {
+        'profile_ids': profile_ids,
+        'titles': [job_profiles[profile_id]['title'] for profile_id in profile_ids],
+        'vocabulary': vocabulary,
+        'index': index,
+        'counts': counts,
+        'totals': totals
+    }
+
+def resume_keyword_matrix(resume_texts, profile_matrix):
+    """Sparse resume-by-keyword presence matrix over the profiles' vocabulary"""
+    vocabulary = profile_matrix['vocabulary']
+    index = profile_matrix['index']
+    indptr, indices = [0], []
+    for resume_text in resume_texts:
+        if isinstance(resume_text, ResumeAnalysis):
+            text_lower = resume_text.text_lower
+        else:
+            text_lower = resume_text.lower()
+        present = {keyword for _, keyword, _ in match_keywords(text_lower, index)}
+        indices.extend(sorted(vocabulary[keyword] for keyword in present))
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.ones(len(indices)), indices, indptr),
+        shape=(len(indptr) - 1, len(vocabulary))
+    )
+
+def score_matrix(keyword_matrix, profile_matrix):
+    """Resume-by-profile match scores using the 60/25/15 formula of calculate_job_profile_match"""
+    found = (keyword_matrix @ profile_matrix['counts']).toarray()
+    profile_count = len(profile_matrix['profile_ids'])
+    scores = np.zeros((keyword_matrix.shape[0], profile_count))
+    for kind_number, (_, weight) in enumerate(PROFILE_KEYWORD_KINDS):
+        block = found[:, kind_number * profile_count:(kind_number + 1) * profile_count]
+        totals = profile_matrix['totals'][kind_number]
+        # Same operation order as (found / total) * weight so results match the loop exactly;
+        # an empty keyword list contributes nothing instead of dividing by zero
+        ratio = np.divide(block, totals, out=np.zeros_like(block), where=totals > 0)
+        scores += ratio * weight
+    return scores
+
+def _top_k(values, k):
+    """Indices of the k largest values, best first; ties keep the lower index first"""
+    k = min(k, len(values))
+    if k <= 0:
+        return []
+    if k < len(values):
+        # argpartition breaks ties at the cutoff arbitrarily; take the lowest tied indices instead
+        threshold = values[np.argpartition(-values, k - 1)[k - 1]]
+        above = np.flatnonzero(values > threshold)
+        candidates = np.concatenate([above, np.flatnonzero(values == threshold)[:k - len(above)]])
+    else:
+        candidates = np.arange(len(values))
+    return sorted(candidates.tolist(), key=lambda i: (-values[i], i))
+
+def top_profiles_per_resume(scores, profile_matrix, k=3):
+    """For each resume row, the k best (profile_id, score) pairs"""
+    profile_ids = profile_matrix['profile_ids']
+    return [[(profile_ids[column], round(float(row[column]), 1)) for column in _top_k(row, k)]
+            for row in scores]
+
+def top_resumes_per_profile(resume_texts, profile_matrix, k=50, chunk_rows=10000, resume_ids=None):
+    """For each profile, the k best (resume_id, score) pairs, scoring chunk_rows resumes at a time"""
+    profile_ids = profile_matrix['profile_ids']
+    best = {profile_id: [] for profile_id in profile_ids}
+    resume_ids = iter(resume_ids) if resume_ids is not None else None
+    offset = 0
+
+    def score_chunk(chunk):
+        ids = [next(resume_ids) for _ in chunk] if resume_ids else list(range(offset, offset + len(chunk)))
+        scores = score_matrix(resume_keyword_matrix(chunk, profile_matrix), profile_matrix)
+        for column, profile_id in enumerate(profile_ids):
+            merged = best[profile_id] + [(ids[row], float(scores[row, column]))
+                                         for row in _top_k(scores[:, column], k)]
+            merged.sort(key=lambda pair: -pair[1])
+            best[profile_id] = merged[:k]
+
+    chunk = []
+    for resume_text in resume_texts:
+        chunk.append(resume_text)
+        if len(chunk) >= chunk_rows:
+            score_chunk(chunk)
+            offset += len(chunk)
+            chunk = []
+    if chunk:
+        score_chunk(chunk)
+
+    return {profile_id: [(resume_id, round(score, 1)) for resume_id, score in pairs]
+            for profile_id, pairs in best.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank resumes against job profiles in bulk")
+    parser.add_argument("sources", nargs='+', help="Resume files, directories or glob patterns")
+    parser.add_argument("--profiles", action="append",
+                       help="JSON/YAML file or directory of job profiles; repeatable (default: built-in profiles)")
+    parser.add_argument("--no-builtin", action="store_true",
+                       help="Rank against only the --profiles files, not the built-in profiles")
+    parser.add_argument("--by", choices=['resume', 'profile'], default='profile',
+                       help="Top profiles per resume, or top resumes per profile (default: profile)")
+    parser.add_argument("--top", type=int, default=10, help="How many results to keep (default: 10)")
+    parser.add_argument("--chunk-rows", type=int, default=10000,
+                       help="Resumes scored per matrix product (default: 10000)")
+
+    args = parser.parse_args()
+
+    job_profiles = None
+    if args.profiles:
+        registry = ProfileRegistry(args.profiles, include_builtin=not args.no_builtin)
+        job_profiles = registry.current['job_profiles']
+    profile_matrix = compile_profile_matrix(job_profiles)
+
+    texts = {}
+    for file_path in collect_resume_files(args.sources):
+        resume_text = extract_resume_text(file_path)
+        if resume_text:
+            texts[file_path] = resume_text
+        else:
+            print(f"❌ {file_path}: Could not extract text from the file", file=sys.stderr)
+
+    if args.by == 'resume':
+        file_paths = list(texts)
+        for start in range(0, len(file_paths), args.chunk_rows):
+            chunk_paths = file_paths[start:start + args.chunk_rows]
+            scores = score_matrix(resume_keyword_matrix([texts[path] for path in chunk_paths],
+                                                        profile_matrix), profile_matrix)
+            for file_path, top in zip(chunk_paths, top_profiles_per_resume(scores, profile_matrix, args.top)):
+                print(json.dumps({'file': file_path, 'top_profiles': top}))
+    else:
+        ranking = top_resumes_per_profile(texts.values(), profile_matrix, args.top,
+                                          args.chunk_rows, resume_ids=list(texts))
+        for profile_id, top in ranking.items():
+            print(json.dumps({'profile': profile_id, 'top_resumes': top}))
+
+if __name__ == "__main__":
+    main()
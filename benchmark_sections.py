@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Section Parser Benchmark
+Times parse_resume_sections against the previous per-pattern parser on a synthetic corpus
+"""
+
+import argparse
+import re
+import time
+
+from advanced_resume_analyzer import parse_resume_sections, segment_resume
+from synthetic_resumes import generate_corpus
+
+def legacy_parse_resume_sections(text):
+    """The parser before segment_resume: nine uncompiled searches per line"""
+    sections = {}
+    
+    section_patterns = {
+        'contact': r'(contact|personal|info)',
+        'summary': r'(summary|profile|objective|about)',
+        'education': r'(education|academic|degree|university|college|school)',
+        'experience': r'(experience|employment|work|career|internship|intern)',
+        'projects': r'(projects?|portfolio|work)',
+        'skills': r'(skills?|technical|competencies|technologies|tools)',
+        'achievements': r'(achievements?|awards?|accomplishments?|certifications?|honors?)',
+        'languages': r'(languages?|linguistic)',
+        'interests': r'(interests?|hobbies|activities)'
+    }
+    
+    lines = text.split('\n')
+    current_section = 'header'
+    current_content = []
+    
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        
+        is_section_header = False
+        line_words = line.lower().split()
+        
+        for section_name, pattern in section_patterns.items():
+            if (re.search(pattern, line.lower()) and 
+                len(line_words) <= 4 and 
+                not any(char.isdigit() for char in line)):
+                
+                if current_content:
+                    sections[current_section] = current_content
+                current_section = section_name
+                current_content = []
+                is_section_header = True
+                break
+        
+        if not is_section_header:
+            current_content.append(line)
+    
+    if current_content:
+        sections[current_section] = current_content
+    
+    return sections
+
+def time_parser(parse, corpus, repeat):
+    """Best wall-clock seconds of `repeat` passes of parse over the corpus"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in corpus:
+            parse(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the resume section parser")
+    parser.add_argument("--resumes", type=int, default=10000, help="Synthetic corpus size (default: 10000)")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed (default: 0)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes, best is kept (default: 3)")
+    
+    args = parser.parse_args()
+    
+    corpus = generate_corpus(args.resumes, args.seed)
+    lines = sum(text.count('\n') + 1 for text in corpus)
+    print(f"📚 Corpus: {len(corpus)} resumes, {lines} lines (seed {args.seed})")
+    
+    mismatches = sum(legacy_parse_resume_sections(text) != parse_resume_sections(text) for text in corpus)
+    if mismatches:
+        print(f"⚠️ {mismatches} resumes parse differently from the legacy parser")
+    
+    results = [
+        ('legacy parser', time_parser(legacy_parse_resume_sections, corpus, args.repeat)),
+        ('parse_resume_sections', time_parser(parse_resume_sections, corpus, args.repeat)),
+        ('segment_resume (spans only)', time_parser(segment_resume, corpus, args.repeat))
+    ]
+    baseline = results[0][1]
+    for name, seconds in results:
+        print(f"   {name:<28} {seconds:7.3f}s  {len(corpus) / seconds:9.0f} resumes/s  "
+              f"{baseline / seconds:5.1f}x")
+
+if __name__ == "__main__":
+    main()
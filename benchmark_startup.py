@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Resume Analyzer Startup Benchmark
+Import-time budget for advanced_resume_analyzer, measured with python -X importtime
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+# Cumulative import time allowed for advanced_resume_analyzer, in milliseconds
+IMPORT_BUDGET_MS = 50.0
+
+# Loaded only on first use; importing the module must not pull them in
+LAZY_MODULES = ('pdfplumber', 'pdfminer', 'pypdfium2', 'concurrent.futures', 'multiprocessing', 'sqlite3')
+
+def import_time_ms(module='advanced_resume_analyzer'):
+    """Cumulative import time of module in a fresh interpreter, from -X importtime"""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                               capture_output=True, text=True, check=True)
+    for line in completed.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1000
+    raise RuntimeError(f"No -X importtime entry for {module}")
+
+def eagerly_loaded(module='advanced_resume_analyzer'):
+    """LAZY_MODULES that importing module (and analyzing a TXT resume) loaded anyway"""
+    code = (f"import sys, {module} as m; m.analyze_resume('Python developer with SQL and React experience'); "
+            f"print(' '.join(name for name in {LAZY_MODULES!r} if name in sys.modules))")
+    completed = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return completed.stdout.split()
+
+def command_ms(command, runs):
+    """Median wall time of a command, e.g. the CLI's --help"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the analyzer's import time against a budget")
+    parser.add_argument("--runs", type=int, default=9, help="Fresh interpreters per measurement (default: 9)")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS,
+                       help=f"Allowed median import time in ms (default: {IMPORT_BUDGET_MS:g})")
+
+    args = parser.parse_args()
+
+    # The first run also writes the bytecode cache, so it is not counted
+    import_time_ms()
+    median = statistics.median(import_time_ms() for _ in range(args.runs))
+    baseline = command_ms([sys.executable, '-c', 'pass'], args.runs)
+    script = command_ms([sys.executable, 'advanced_resume_analyzer.py', '--help'], args.runs)
+    module = command_ms([sys.executable, '-m', 'advanced_resume_analyzer', '--help'], args.runs)
+    loaded = eagerly_loaded()
+
+    print(f"⏱️ import advanced_resume_analyzer: {median:.1f} ms median (budget {args.budget_ms:g} ms)")
+    print(f"   python -c pass: {baseline:.1f} ms")
+    print(f"   advanced_resume_analyzer.py --help: {script:.1f} ms")
+    print(f"   python -m advanced_resume_analyzer --help: {module:.1f} ms (cached bytecode)")
+
+    failed = False
+    if loaded:
+        print(f"⚠️ Loaded at import or by a TXT analysis: {', '.join(loaded)}")
+        failed = True
+    if median > args.budget_ms:
+        print(f"⚠️ Import time {median:.1f} ms is over the {args.budget_ms:g} ms budget")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("✅ Import time within budget and heavy dependencies stay lazy")
+
+if __name__ == "__main__":
+    main()
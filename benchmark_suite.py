@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Resume Analyzer Benchmark Suite
+Per-stage throughput, p50/p99 latency and peak RSS over a seeded synthetic corpus
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is not reported
+    resource = None
+
+from advanced_resume_analyzer import (
+    analyze_section_details, calculate_job_profile_match, clean_and_fix_text, extract_resume_text,
+    generate_comprehensive_report, parse_resume_sections
+)
+from synthetic_resumes import RESUME_SIZES, write_corpus
+
+# Stage name -> the per-resume input each timed call receives
+STAGES = {
+    'extract_txt': 'txt path',
+    'extract_pdf': 'pdf path',
+    'extract_pdf_layout': 'pdf path',
+    'clean': 'raw text',
+    'parse_sections': 'text',
+    'job_match': 'text',
+    'section_details': 'text',
+    'full_report': 'text'
+}
+
+def _stage_inputs(stage, corpus_dir):
+    """Per-resume inputs for a stage, prepared before timing starts"""
+    names = sorted(os.listdir(corpus_dir))
+    if stage in ('extract_pdf', 'extract_pdf_layout'):
+        return [os.path.join(corpus_dir, name) for name in names if name.endswith('.pdf')]
+    txt_paths = [os.path.join(corpus_dir, name) for name in names if name.endswith('.txt')]
+    if stage == 'extract_txt':
+        return txt_paths
+    raw_texts = []
+    for path in txt_paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            raw_texts.append(f.read())
+    if stage == 'clean':
+        return raw_texts
+    texts = [clean_and_fix_text(raw) for raw in raw_texts]
+    if stage in ('job_match', 'section_details'):
+        return [(text, parse_resume_sections(text)) for text in texts]
+    return texts
+
+def _stage_call(stage, report_path):
+    """The function timed for one resume in this stage"""
+    if stage in ('extract_txt', 'extract_pdf'):
+        return extract_resume_text
+    if stage == 'extract_pdf_layout':
+        return lambda path: extract_resume_text(path, extractor='layout')
+    if stage == 'clean':
+        return clean_and_fix_text
+    if stage == 'parse_sections':
+        return parse_resume_sections
+    if stage == 'job_match':
+        return lambda item: calculate_job_profile_match(*item)
+    if stage == 'section_details':
+        return lambda item: [analyze_section_details(name, content) for name, content in item[1].items()]
+    return lambda text: generate_comprehensive_report(text, report_path)
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+def run_stage(stage, corpus_dir, repeat=1):
+    """Time one stage in this process and return its measurements"""
+    items = _stage_inputs(stage, corpus_dir)
+    with tempfile.TemporaryDirectory(prefix='resume_bench_') as workdir:
+        call = _stage_call(stage, os.path.join(workdir, 'report.txt'))
+        if items:
+            call(items[0])  # warm-up: first-call regex and import costs are not steady state
+        latencies = []
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for item in items:
+                start = time.perf_counter()
+                call(item)
+                latencies.append(time.perf_counter() - start)
+        elapsed = time.perf_counter() - started
+
+    if stage.startswith('extract_'):
+        input_bytes = sum(os.path.getsize(path) for path in items) * repeat
+    else:
+        input_bytes = sum(len((item[0] if isinstance(item, tuple) else item).encode('utf-8'))
+                          for item in items) * repeat
+    latencies.sort()
+
+    peak_rss_mb = None
+    if resource is not None:
+        # ru_maxrss is KB on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak_rss_mb = round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+    return {
+        'calls': len(latencies),
+        'seconds': round(elapsed, 4),
+        'resumes_per_s': round(len(latencies) / elapsed, 1) if elapsed else None,
+        'mb_per_s': round(input_bytes / elapsed / 1e6, 2) if elapsed else None,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'peak_rss_mb': peak_rss_mb
+    }
+
+def run_suite(corpus_dir, stages, repeat=1):
+    """Run every stage in its own fresh process so each peak RSS belongs to that stage alone"""
+    results = {}
+    context = multiprocessing.get_context('spawn')
+    for stage in stages:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results[stage] = executor.submit(run_stage, stage, corpus_dir, repeat).result()
+    return results
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Stages slower than the baseline by more than tolerance, as (stage, metric, old, new)"""
+    regressions = []
+    for stage, current in results.items():
+        previous = baseline.get('stages', {}).get(stage)
+        if not previous:
+            continue
+        if previous['resumes_per_s'] and current['resumes_per_s'] < previous['resumes_per_s'] * (1 - tolerance):
+            regressions.append((stage, 'resumes_per_s', previous['resumes_per_s'], current['resumes_per_s']))
+        if previous['p99_ms'] and current['p99_ms'] > previous['p99_ms'] * (1 + tolerance):
+            regressions.append((stage, 'p99_ms', previous['p99_ms'], current['p99_ms']))
+    return regressions
+
+def print_results(results, baseline=None):
+    print(f"   {'stage':<19} {'calls':>6} {'resumes/s':>10} {'MB/s':>7} {'p50 ms':>9} "
+          f"{'p99 ms':>9} {'peak RSS':>9} {'vs base':>8}")
+    for stage, result in results.items():
+        previous = (baseline or {}).get('stages', {}).get(stage)
+        change = (f"{result['resumes_per_s'] / previous['resumes_per_s']:7.2f}x"
+                  if previous and previous['resumes_per_s'] else '')
+        rss = f"{result['peak_rss_mb']:.0f} MB" if result['peak_rss_mb'] is not None else 'n/a'
+        print(f"   {stage:<19} {result['calls']:>6} {result['resumes_per_s']:>10.1f} "
+              f"{result['mb_per_s']:>7.2f} {result['p50_ms']:>9.3f} {result['p99_ms']:>9.3f} "
+              f"{rss:>9} {change:>8}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the resume analyzer stage by stage")
+    parser.add_argument("--count", type=int, default=50, help="Synthetic resumes per size (default: 50)")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed (default: 0)")
+    parser.add_argument("--sizes", nargs='+', choices=list(RESUME_SIZES), default=list(RESUME_SIZES),
+                       help="Resume lengths in the corpus (default: all)")
+    parser.add_argument("--stages", nargs='+', choices=list(STAGES), default=list(STAGES),
+                       help="Stages to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over the corpus per stage (default: 1)")
+    parser.add_argument("--corpus-dir",
+                       help="Keep the generated corpus here instead of a temporary directory")
+    parser.add_argument("--save", help="Write the results as a JSON baseline file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                       help="Allowed slowdown vs the baseline before failing (default: 0.10)")
+
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    with tempfile.TemporaryDirectory(prefix='resume_corpus_') as temp_dir:
+        corpus_dir = args.corpus_dir or temp_dir
+        file_paths = write_corpus(corpus_dir, args.count, args.seed, args.sizes, ('txt', 'pdf'))
+        print(f"📚 Corpus: {len(file_paths) // 2} resumes as TXT and PDF "
+              f"(sizes {', '.join(args.sizes)}, seed {args.seed})")
+        results = run_suite(corpus_dir, args.stages, args.repeat)
+
+    print_results(results, baseline)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({
+                'meta': {
+                    'python': platform.python_version(),
+                    'platform': platform.platform(),
+                    'cpu_count': os.cpu_count(),
+                    'count': args.count,
+                    'seed': args.seed,
+                    'sizes': args.sizes,
+                    'repeat': args.repeat
+                },
+                'stages': results
+            }, f, indent=2)
+            f.write('\n')
+        print(f"💾 Baseline written to {args.save}")
+
+    if baseline is not None:
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        for stage, metric, old, new in regressions:
+            print(f"⚠️ {stage}: {metric} {old} -> {new}")
+        if regressions:
+            sys.exit(1)
+        print(f"✅ No stage regressed more than {args.tolerance:.0%} against {args.compare}")
+
+if __name__ == "__main__":
+    main()
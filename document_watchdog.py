@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Document Watchdog
+Process pool with per-document wall-clock and memory limits, and a quarantine log for the files that hit them
+"""
+
+import atexit
+import json
+import os
+import signal
+import threading
+import time
+import weakref
+from collections import defaultdict, deque
+from concurrent.futures import CancelledError, Executor, Future
+
+# Why a document was stopped and quarantined
+QUARANTINE_REASONS = {
+    'timeout': 'exceeded the per-document time limit',
+    'rss_limit': 'exceeded the worker memory limit',
+    'worker_crash': 'killed its worker process'
+}
+
+class DocumentLimitExceeded(Exception):
+    """A document was stopped by the watchdog; reason is a QUARANTINE_REASONS code"""
+
+    def __init__(self, reason, detail):
+        super().__init__(detail)
+        self.reason = reason
+
+def quarantine_result(file_path, error):
+    """Batch result for a document the watchdog stopped"""
+    return {'file': file_path, 'error': str(error), 'quarantined': error.reason}
+
+_page_size = None
+
+def process_rss(pid):
+    """Resident set size of a process in bytes, or None where it cannot be read"""
+    global _page_size
+    try:
+        with open(f'/proc/{pid}/statm', 'rb') as f:
+            resident_pages = int(f.read().split()[1])
+        if _page_size is None:
+            _page_size = os.sysconf('SC_PAGE_SIZE')
+        return resident_pages * _page_size
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        return psutil.Process(pid).memory_info().rss
+    except psutil.Error:
+        return None
+
+def process_groups():
+    """{process group id: [pid, ...]} for every process in /proc, or None where it cannot be read"""
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return None
+    groups = defaultdict(list)
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'rb') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # After the parenthesized command name: state, parent pid, process group
+        fields = stat[stat.rfind(b')') + 2:].split()
+        if len(fields) > 2:
+            groups[int(fields[2])].append(int(entry))
+    return dict(groups)
+
+def _descendants(pid):
+    try:
+        import psutil
+        return [child.pid for child in psutil.Process(pid).children(recursive=True)]
+    except Exception:
+        return []
+
+def _exit_with_parent(parent_pid):
+    # A worker whose coordinator was killed outright must not linger on its own
+    while True:
+        time.sleep(1.0)
+        if os.getppid() != parent_pid:
+            os._exit(1)
+
+def _worker_loop(conn, parent_pid, initializer):
+    if hasattr(os, 'setpgrp'):
+        # Own process group, so a kill also takes any page-extraction processes it started
+        os.setpgrp()
+    # Ctrl-C is the coordinator's to handle; it shuts the workers down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    threading.Thread(target=_exit_with_parent, args=(parent_pid,), daemon=True).start()
+    if initializer is not None:
+        initializer()
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            return
+        except Exception as e:
+            # The job was read in full but cannot be unpickled here: fail just that job
+            conn.send((False, RuntimeError(f"Cannot load job in worker: {type(e).__name__}: {e}")))
+            continue
+        if job is None:
+            return
+        fn, args, kwargs = job
+        try:
+            reply = (True, fn(*args, **kwargs))
+        except Exception as e:
+            reply = (False, e)
+        try:
+            conn.send(reply)
+        except Exception as e:
+            # Unpicklable result or exception: report it rather than leave the document hanging
+            conn.send((False, RuntimeError(f"{type(e).__name__}: {e}")))
+
+class _Worker:
+    def __init__(self, context, initializer):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_loop, args=(child_conn, os.getpid(), initializer))
+        self.process.start()
+        child_conn.close()
+        self.future = None
+        self.deadline = None
+
+    def kill(self):
+        try:
+            if hasattr(os, 'killpg'):
+                os.killpg(self.process.pid, signal.SIGKILL)
+            else:
+                self.process.kill()
+        except (ProcessLookupError, PermissionError):
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+_live_executors = weakref.WeakSet()
+
+def _kill_workers_at_exit():
+    for executor in list(_live_executors):
+        executor.shutdown(wait=True, cancel_futures=True)
+
+# Seconds between scans for the processes a worker started; their memory counts towards its limit
+GROUP_SCAN_INTERVAL = 1.0
+
+class WatchdogExecutor(Executor):
+    """Process pool where each worker holds one document at a time, under a watchdog
+
+    A monitor thread hands jobs to idle workers and watches the busy ones. A worker
+    still busy after timeout seconds, or whose resident memory passes max_rss_mb, is
+    killed together with any processes it started and replaced by a fresh one. Its
+    future fails with DocumentLimitExceeded ('timeout', 'rss_limit'); a worker that dies
+    by itself fails its future with 'worker_crash'. Only that document is lost: the
+    other workers keep running, which is what keeps throughput and p99 latency flat
+    when pathological PDFs show up. Memory is polled every poll_interval seconds, from
+    /proc or psutil; where neither is available only the time limit applies. A worker's
+    memory includes the processes it started (page-extraction pools), found by process
+    group every GROUP_SCAN_INTERVAL seconds.
+
+    submit_chunk() hands a worker several documents as one job, with a time limit of
+    timeout per document; the watchdog stops such a job as a whole.
+
+    shutdown(cancel_futures=True) also stops the documents being analyzed.
+    """
+
+    def __init__(self, max_workers=None, timeout=None, max_rss_mb=None, initializer=None,
+                 poll_interval=0.05, mp_context=None):
+        import multiprocessing
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout or None
+        self.max_rss = max_rss_mb * 1024 * 1024 if max_rss_mb else None
+        self.poll_interval = poll_interval
+        self.stopped = {reason: 0 for reason in QUARANTINE_REASONS}
+        self._context = mp_context or multiprocessing.get_context()
+        self._initializer = initializer
+        self._jobs = deque()
+        self._lock = threading.Lock()
+        self._wake_recv, self._wake_send = self._context.Pipe(duplex=False)
+        self._woken = False
+        self._shutdown = False
+        self._cancel_running = False
+        self._groups = None
+        self._groups_scanned = None
+        self._workers = [_Worker(self._context, initializer) for _ in range(self.max_workers)]
+        self._monitor = threading.Thread(target=self._run, name='document-watchdog', daemon=True)
+        self._monitor.start()
+        if not _live_executors:
+            # Registered after multiprocessing's own exit hook so it runs first: that hook
+            # joins child processes, and idle workers would never exit by themselves
+            atexit.unregister(_kill_workers_at_exit)
+            atexit.register(_kill_workers_at_exit)
+        _live_executors.add(self)
+
+    def submit(self, fn, /, *args, **kwargs):
+        return self.submit_chunk(1, fn, *args, **kwargs)
+
+    def submit_chunk(self, documents, fn, /, *args, **kwargs):
+        """Schedule a job covering several documents, limited to timeout seconds for each"""
+        future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            self._jobs.append((future, max(documents, 1), fn, args, kwargs))
+            self._wake()
+        return future
+
+    def _wake(self):
+        # One wakeup at a time, so a burst of submits never fills the pipe
+        if not self._woken:
+            self._woken = True
+            self._wake_send.send_bytes(b'')
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        with self._lock:
+            if not self._shutdown:
+                self._shutdown = True
+                self._cancel_running = cancel_futures
+                if cancel_futures:
+                    while self._jobs:
+                        self._jobs.popleft()[0].cancel()
+                self._wake()
+        if wait:
+            self._monitor.join()
+
+    def _dispatch(self):
+        with self._lock:
+            for index, worker in enumerate(self._workers):
+                if worker.future is not None:
+                    continue
+                while self._jobs:
+                    future, documents, fn, args, kwargs = self._jobs.popleft()
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    if not worker.process.is_alive():
+                        worker.conn.close()
+                        worker = self._workers[index] = _Worker(self._context, self._initializer)
+                    try:
+                        worker.conn.send((fn, args, kwargs))
+                    except Exception as e:
+                        # An unpicklable job fails before anything is written, so the worker
+                        # stays usable; a broken pipe means it died and needs replacing
+                        future.set_exception(e)
+                        if isinstance(e, OSError):
+                            worker.kill()
+                            worker = self._workers[index] = _Worker(self._context, self._initializer)
+                        continue
+                    worker.future = future
+                    worker.deadline = time.monotonic() + self.timeout * documents if self.timeout else None
+                    break
+            return not self._jobs
+
+    def _replace(self, index, reason, detail):
+        worker = self._workers[index]
+        worker.kill()
+        if reason:
+            self.stopped[reason] += 1
+            worker.future.set_exception(DocumentLimitExceeded(reason, detail))
+        self._workers[index] = _Worker(self._context, self._initializer)
+
+    def _check(self):
+        now = time.monotonic()
+        for index, worker in enumerate(self._workers):
+            future = worker.future
+            if future is None:
+                continue
+            if worker.conn.poll():
+                try:
+                    ok, value = worker.conn.recv()
+                except (EOFError, OSError):
+                    self._replace(index, 'worker_crash', f"Worker exited with code {worker.process.exitcode}")
+                    continue
+                worker.future = None
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+                if self.max_rss and (self._worker_rss(worker) or 0) > self.max_rss:
+                    # Memory the last document left behind; start the next one in a clean worker
+                    self._replace(index, None, None)
+            elif not worker.process.is_alive():
+                self._replace(index, 'worker_crash', f"Worker exited with code {worker.process.exitcode}")
+            elif worker.deadline is not None and now > worker.deadline:
+                self._replace(index, 'timeout', f"Stopped after {self.timeout:g}s per document: "
+                                                f"{QUARANTINE_REASONS['timeout']}")
+            elif self.max_rss:
+                rss = self._worker_rss(worker)
+                if rss is not None and rss > self.max_rss:
+                    self._replace(index, 'rss_limit', f"Stopped at {rss / 1024 / 1024:.0f} MB resident: "
+                                                      f"{QUARANTINE_REASONS['rss_limit']}")
+
+    def _worker_rss(self, worker):
+        """Resident memory of a worker and every process in its process group, in bytes"""
+        now = time.monotonic()
+        if self._groups_scanned is None or now - self._groups_scanned >= GROUP_SCAN_INTERVAL:
+            self._groups = process_groups()
+            self._groups_scanned = now
+        pid = worker.process.pid
+        if self._groups is not None:
+            pids = set(self._groups.get(pid, ())) | {pid}
+        else:
+            pids = {pid, *_descendants(pid)}
+        sizes = [size for size in map(process_rss, pids) if size is not None]
+        return sum(sizes) if sizes else None
+
+    def _wait_time(self):
+        busy = [worker for worker in self._workers if worker.future is not None]
+        if not busy:
+            return None
+        wait_time = self.poll_interval if self.max_rss else None
+        if self.timeout:
+            until_timeout = max(min(worker.deadline for worker in busy) - time.monotonic(), 0)
+            wait_time = until_timeout if wait_time is None else min(wait_time, until_timeout)
+        return wait_time
+
+    def _run(self):
+        from multiprocessing.connection import wait
+        stop_error = CancelledError()
+        try:
+            while True:
+                queue_empty = self._dispatch()
+                busy = [worker for worker in self._workers if worker.future is not None]
+                if self._shutdown and (self._cancel_running or (not busy and queue_empty)):
+                    break
+                waitables = [self._wake_recv]
+                for worker in busy:
+                    waitables += [worker.conn, worker.process.sentinel]
+                if self._wake_recv in wait(waitables, self._wait_time()):
+                    with self._lock:
+                        self._wake_recv.recv_bytes()
+                        self._woken = False
+                self._check()
+        except Exception as e:
+            # Without the monitor nothing would ever resolve: fail every future instead of hanging
+            stop_error = e
+            with self._lock:
+                self._shutdown = True
+                while self._jobs:
+                    future = self._jobs.popleft()[0]
+                    if future.set_running_or_notify_cancel():
+                        future.set_exception(e)
+        for worker in self._workers:
+            if worker.future is not None:
+                worker.kill()
+                worker.future.set_exception(stop_error)
+            else:
+                worker.stop()
+        _live_executors.discard(self)
+
+class Quarantine:
+    """JSON-lines log of documents the watchdog stopped
+
+    A file stays quarantined while its size and modification time match the logged
+    entry, so a fixed re-upload under the same name is analyzed again.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._entries = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry['file']] = entry
+
+    @staticmethod
+    def _signature(file_path):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def __contains__(self, file_path):
+        entry = self._entries.get(file_path)
+        return entry is not None and entry['signature'] == self._signature(file_path)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, file_path):
+        return self._entries.get(file_path) if file_path in self else None
+
+    def add(self, file_path, reason, detail):
+        """Log a stopped document; returns the entry"""
+        entry = {'file': file_path, 'reason': reason, 'detail': detail,
+                 'signature': self._signature(file_path), 'quarantined_at': time.time()}
+        self._entries[file_path] = entry
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        return entry
@@ -0,0 +1,607 @@
+#!/usr/bin/env python3
+"""
+Resume Feature Store
+Per-resume scoring features in SQLite, re-scored without re-parsing when benchmarks or weights change
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import sqlite3
+import sys
+import time
+from array import array
+
+from advanced_resume_analyzer import (
+    ATS_REQUIRED_SECTIONS, ATS_WEIGHTS, ProfileRegistry, ResumeAnalysis, builtin_profiles,
+    collect_resume_files, extract_resume_text
+)
+
+FEATURE_VERSION = 2
+
+def vocabulary_fingerprint(profiles):
+    """Hash of the keywords a profile set's index can find; features record which one they used"""
+    keywords = sorted(profiles['keyword_index']['memberships'])
+    return hashlib.sha256('\n'.join(keywords).encode('utf-8')).hexdigest()[:16]
+
+def resume_features(doc):
+    """Everything analyze_resume's scores depend on, as counts and keyword sets
+
+    A keyword is found in a text whatever else the index holds, so features scanned with
+    one vocabulary score exactly under any profile set whose keywords it covers.
+    """
+    sections = {}
+    for section_name, content in doc.sections.items():
+        view = doc.section(section_name)
+        sections[section_name] = {
+            'lines': len(content),
+            'words': len(view.words),
+            'metrics': len(view.numbers_metrics),
+            'keywords': sorted(view.keywords)
+        }
+    return {
+        'vocabulary': vocabulary_fingerprint(doc.profiles),
+        'words': len(doc.words),
+        'metrics': len(doc.numbers_metrics),
+        'bullets': len(doc.bullet_positions),
+        'keywords': sorted(doc.keywords),
+        'sections': sections
+    }
+
+def load_ats_weights(path):
+    """ATS_WEIGHTS with the components a JSON file overrides, e.g. {"formatting": {"max": 10}}"""
+    with open(path, 'r', encoding='utf-8') as f:
+        overrides = json.load(f)
+    if not isinstance(overrides, dict):
+        raise ValueError(f"{path}: top level must be a mapping")
+    weights = copy.deepcopy(ATS_WEIGHTS)
+    for component, values in overrides.items():
+        if component not in weights or not isinstance(values, dict):
+            raise ValueError(f"{path}: unknown ATS component '{component}'")
+        for key, value in values.items():
+            if key not in weights[component]:
+                raise ValueError(f"{path}: unknown weight '{component}.{key}'")
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                raise ValueError(f"{path}: weight '{component}.{key}' must be a non-negative number")
+            weights[component][key] = value
+    return weights
+
+def _pack(keyword_ids):
+    return array('I', keyword_ids).tobytes()
+
+def _unpack(blobs):
+    """CSR indptr and indices for a list of packed keyword id blobs"""
+    import numpy as np
+    lengths = np.fromiter((len(blob) // 4 for blob in blobs), dtype=np.int64, count=len(blobs))
+    indices = np.frombuffer(b''.join(blobs), dtype=np.uint32)
+    return np.concatenate(([0], np.cumsum(lengths))), indices
+
+def _round1(values):
+    """round(value, 1) for every element, matching Python's rounding exactly"""
+    import numpy as np
+    scaled = values * 10
+    rounded = np.round(scaled) / 10
+    # Only values within float error of a .x5 boundary can round differently from round()
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    rounded[near_half] = [round(value, 1) for value in values[near_half].tolist()]
+    return rounded
+
+# Resumes per columnar segment; a segment is rebuilt from the row tables when any of its rows change
+SEGMENT_ROWS = 65536
+
+class FeatureStore:
+    """SQLite store of resume_features, scored in bulk with numpy
+
+    resumes holds one row per source: whole-text counts and its keyword ids packed as
+    uint32 blobs; sections holds one row per (resume, section). Those row tables take
+    incremental adds. Scoring reads segments instead: the same data for SEGMENT_ROWS
+    consecutive resume ids as numpy column arrays in one blob, rebuilt only when marked
+    stale, so re-scoring a million resumes reads a few dozen blobs rather than millions
+    of rows. vocabularies records the keyword list behind each vocabulary fingerprint,
+    so scoring can refuse a profile set that needs keywords the stored scans never
+    looked for.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=60)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        with self._conn:
+            self._conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+            self._conn.execute('INSERT OR IGNORE INTO meta VALUES (?, ?)', ('feature_version', str(FEATURE_VERSION)))
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS vocabularies (fingerprint TEXT PRIMARY KEY, keywords TEXT NOT NULL)'
+            )
+            self._conn.execute('CREATE TABLE IF NOT EXISTS keywords (id INTEGER PRIMARY KEY, keyword TEXT UNIQUE NOT NULL)')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS resumes (id INTEGER PRIMARY KEY, source TEXT UNIQUE NOT NULL, '
+                'vocabulary TEXT NOT NULL, words INTEGER NOT NULL, metrics INTEGER NOT NULL, '
+                'bullets INTEGER NOT NULL, keyword_ids BLOB NOT NULL, added REAL NOT NULL)'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS resumes_by_vocabulary ON resumes (vocabulary)')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS sections (resume_id INTEGER NOT NULL, section TEXT NOT NULL, '
+                'lines INTEGER NOT NULL, words INTEGER NOT NULL, metrics INTEGER NOT NULL, '
+                'keyword_ids BLOB NOT NULL, PRIMARY KEY (resume_id, section)) WITHOUT ROWID'
+            )
+            self._conn.execute('CREATE TABLE IF NOT EXISTS segments (segment INTEGER PRIMARY KEY, data BLOB NOT NULL)')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS stale_segments (segment INTEGER PRIMARY KEY)')
+        version = int(self._conn.execute("SELECT value FROM meta WHERE key = 'feature_version'").fetchone()[0])
+        if version != FEATURE_VERSION:
+            self._conn.close()
+            raise ValueError(f"{path} holds version {version} features; this code reads version {FEATURE_VERSION}")
+        self._keyword_ids = dict(self._conn.execute('SELECT keyword, id FROM keywords'))
+
+    def _keyword_id(self, keyword):
+        if keyword not in self._keyword_ids:
+            self._keyword_ids[keyword] = self._conn.execute(
+                'INSERT INTO keywords (keyword) VALUES (?)', (keyword,)).lastrowid
+        return self._keyword_ids[keyword]
+
+    def add_vocabulary(self, profiles):
+        """Record the keyword list behind a profile set's vocabulary fingerprint"""
+        with self._conn:
+            self._conn.execute('INSERT OR IGNORE INTO vocabularies VALUES (?, ?)',
+                               (vocabulary_fingerprint(profiles),
+                                json.dumps(sorted(profiles['keyword_index']['memberships']))))
+
+    def add_many(self, entries):
+        """Store (source, resume_features) pairs in one transaction, replacing earlier ones for a source"""
+        try:
+            with self._conn:
+                return self._add_many(entries)
+        except Exception:
+            # The transaction rolled back; forget ids handed out inside it
+            self._keyword_ids = dict(self._conn.execute('SELECT keyword, id FROM keywords'))
+            raise
+
+    def _add_many(self, entries):
+        added = 0
+        stale = set()
+        for source, features in entries:
+            previous = self._conn.execute('SELECT id FROM resumes WHERE source = ?', (source,)).fetchone()
+            if previous:
+                self._conn.execute('DELETE FROM sections WHERE resume_id = ?', previous)
+                self._conn.execute('DELETE FROM resumes WHERE id = ?', previous)
+                stale.add(previous[0] // SEGMENT_ROWS)
+            resume_id = self._conn.execute(
+                'INSERT INTO resumes (source, vocabulary, words, metrics, bullets, keyword_ids, added) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (source, features['vocabulary'], features['words'], features['metrics'], features['bullets'],
+                 _pack(sorted(self._keyword_id(keyword) for keyword in features['keywords'])), time.time())
+            ).lastrowid
+            self._conn.executemany(
+                'INSERT INTO sections VALUES (?, ?, ?, ?, ?, ?)',
+                [(resume_id, section_name, section['lines'], section['words'], section['metrics'],
+                  _pack(sorted(self._keyword_id(keyword) for keyword in section['keywords'])))
+                 for section_name, section in features['sections'].items()]
+            )
+            stale.add(resume_id // SEGMENT_ROWS)
+            added += 1
+        self._conn.executemany('INSERT OR IGNORE INTO stale_segments VALUES (?)', [(segment,) for segment in stale])
+        return added
+
+    def add(self, source, doc):
+        """Store the features of one ResumeAnalysis under source"""
+        self.add_vocabulary(doc.profiles)
+        return self.add_many([(source, resume_features(doc))])
+
+    def _build_segment(self, segment):
+        """Column arrays for one segment's resumes and sections, saved as npz bytes"""
+        import io
+        import numpy as np
+        first, stop = segment * SEGMENT_ROWS, (segment + 1) * SEGMENT_ROWS
+        rows = self._conn.execute('SELECT id, words, metrics, bullets, keyword_ids FROM resumes '
+                                  'WHERE id >= ? AND id < ? ORDER BY id', (first, stop)).fetchall()
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+        columns = {'ids': ids}
+        for column, name in enumerate(('words', 'metrics', 'bullets'), 1):
+            columns[name] = np.array([row[column] for row in rows], dtype=np.int32)
+        columns['keyword_indptr'], columns['keyword_indices'] = _unpack([row[4] for row in rows])
+
+        by_section = {}
+        for row in self._conn.execute('SELECT section, resume_id, lines, words, metrics, keyword_ids FROM sections '
+                                      'WHERE resume_id >= ? AND resume_id < ?', (first, stop)):
+            by_section.setdefault(row[0], []).append(row)
+        for section_name, section_rows in by_section.items():
+            prefix = f"section.{section_name}."
+            columns[prefix + 'rows'] = np.searchsorted(ids, [row[1] for row in section_rows]).astype(np.int32)
+            for column, name in enumerate(('lines', 'words', 'metrics'), 2):
+                columns[prefix + name] = np.array([row[column] for row in section_rows], dtype=np.int32)
+            columns[prefix + 'keyword_indptr'], columns[prefix + 'keyword_indices'] = _unpack(
+                [row[5] for row in section_rows])
+        buffer = io.BytesIO()
+        np.savez(buffer, **columns)
+        return buffer.getvalue()
+
+    def _refresh_segments(self):
+        """Rebuild the segments whose rows changed since they were last built"""
+        stale = [segment for segment, in self._conn.execute('SELECT segment FROM stale_segments ORDER BY segment')]
+        for segment in stale:
+            with self._conn:
+                data = self._build_segment(segment)
+                self._conn.execute('INSERT OR REPLACE INTO segments VALUES (?, ?)', (segment, data))
+                self._conn.execute('DELETE FROM stale_segments WHERE segment = ?', (segment,))
+        return len(stale)
+
+    def load(self):
+        """Every stored resume's features as column arrays, in resume id order"""
+        import io
+        import numpy as np
+        self._refresh_segments()
+        parts = []
+        for segment, data in self._conn.execute('SELECT segment, data FROM segments ORDER BY segment'):
+            with np.load(io.BytesIO(data)) as arrays:
+                parts.append({name: arrays[name] for name in arrays.files})
+
+        def stack(name):
+            return np.concatenate([part[name] for part in parts]) if parts else np.zeros(0, dtype=np.int64)
+
+        def stack_csr(prefix, part_rows):
+            # Shift each segment's indptr past the entries of the segments before it
+            indptrs, indices, offset = [np.zeros(1, dtype=np.int64)], [], 0
+            for part, count in zip(parts, part_rows):
+                if count:
+                    indptrs.append(part[prefix + 'keyword_indptr'][1:] + offset)
+                    indices.append(part[prefix + 'keyword_indices'])
+                    offset = indptrs[-1][-1]
+            return (np.concatenate(indptrs),
+                    np.concatenate(indices) if indices else np.zeros(0, dtype=np.uint32))
+
+        row_counts = [len(part['ids']) for part in parts]
+        columns = {name: stack(name) for name in ('ids', 'words', 'metrics', 'bullets')}
+        columns['keywords'] = stack_csr('', row_counts)
+        section_names = sorted({name.split('.')[1] for part in parts for name in part if name.startswith('section.')})
+        columns['sections'] = {}
+        for section_name in section_names:
+            prefix = f"section.{section_name}."
+            section = {'rows': [], 'lines': [], 'words': [], 'metrics': []}
+            section_counts = []
+            base = 0
+            for part, count in zip(parts, row_counts):
+                present = prefix + 'rows' in part
+                section_counts.append(len(part[prefix + 'rows']) if present else 0)
+                if present:
+                    section['rows'].append(part[prefix + 'rows'].astype(np.int64) + base)
+                    for name in ('lines', 'words', 'metrics'):
+                        section[name].append(part[prefix + name])
+                base += count
+            section = {name: np.concatenate(values) for name, values in section.items()}
+            section['keywords'] = stack_csr(prefix, section_counts)
+            columns['sections'][section_name] = section
+        return columns
+
+    def sources(self, ids):
+        """Source of each resume id"""
+        ids = [int(resume_id) for resume_id in ids]
+        found = {}
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            found.update(self._conn.execute(
+                f"SELECT id, source FROM resumes WHERE id IN ({','.join('?' * len(chunk))})", chunk))
+        return [found.get(resume_id) for resume_id in ids]
+
+    def _vocabularies(self):
+        """Distinct vocabulary fingerprints of stored resumes, by skipping along their index"""
+        fingerprints = []
+        row = self._conn.execute('SELECT MIN(vocabulary) FROM resumes').fetchone()
+        while row[0] is not None:
+            fingerprints.append(row[0])
+            row = self._conn.execute('SELECT MIN(vocabulary) FROM resumes WHERE vocabulary > ?', row).fetchone()
+        return fingerprints
+
+    def _check_vocabulary(self, profiles):
+        """Raise ValueError if scoring profiles would need keywords some stored scan did not look for"""
+        needed = set(profiles['keyword_index']['memberships'])
+        known = dict(self._conn.execute('SELECT fingerprint, keywords FROM vocabularies'))
+        for fingerprint in self._vocabularies():
+            if fingerprint not in known:
+                missing = None
+            else:
+                missing = needed - set(json.loads(known[fingerprint]))
+                if not missing:
+                    continue
+            count = self._conn.execute('SELECT COUNT(*) FROM resumes WHERE vocabulary = ?', (fingerprint,)).fetchone()[0]
+            if missing is None:
+                raise ValueError(f"{count} resumes were scanned with an unrecorded vocabulary; "
+                                 f"re-run the analyzer with --feature-store")
+            raise ValueError(f"{count} resumes were scanned without the keywords "
+                             f"{', '.join(sorted(missing)[:10])}; re-run the analyzer with --feature-store")
+
+    def score(self, profiles=None, weights=None, columns=None):
+        """Score every stored resume as analyze_resume would under these profiles and ATS weights
+
+        Returns numpy arrays in resume id order: 'ids', 'ats_score' and each
+        'score_breakdown' component, 'job_scores' (one column per profile in
+        'profile_ids'), 'best_profile' (a column number), and per benchmarked section
+        its 'benchmark_score' and 'improvement_priority' (NaN and None where a resume
+        has no such section). Pass columns from load() to score them again without reloading.
+        """
+        # Imported here: analysis workers only need resume_features
+        import numpy as np
+        from scipy import sparse
+        from batch_matching import PROFILE_KEYWORD_KINDS
+        profiles = profiles or builtin_profiles()
+        weights = weights or ATS_WEIGHTS
+        self._check_vocabulary(profiles)
+        if columns is None:
+            columns = self.load()
+
+        row_count = len(columns['ids'])
+        keywords = [None] * (max(self._keyword_ids.values(), default=0) + 1)
+        for keyword, keyword_id in self._keyword_ids.items():
+            keywords[keyword_id] = keyword
+
+        def presence(csr, rows):
+            indptr, indices = csr
+            return sparse.csr_matrix((np.ones(len(indices)), indices.astype(np.int64), indptr),
+                                     shape=(rows, len(keywords)))
+
+        resume_keywords = presence(columns['keywords'], row_count)
+
+        # Per-keyword weights, mirroring how each scorer tests membership
+        job_profiles = profiles['job_profiles']
+        tech_list = [kw for category in profiles['tech_categories'].values() for kw in category]
+        action_verbs = {verb for profile in job_profiles.values() for verb in profile['action_verbs']}
+        ats_tech = np.array([tech_list.count(kw) if kw else 0 for kw in keywords], dtype=float)
+        ats_verbs = np.array([1.0 if kw in action_verbs else 0.0 for kw in keywords])
+        tech_lower = [kw.lower() for kw in tech_list]
+        section_tech = np.array([tech_lower.count(kw) if kw else 0 for kw in keywords], dtype=float)
+        verb_lower = [verb.lower() for verb in action_verbs]
+        section_verbs = np.array([verb_lower.count(kw) if kw else 0 for kw in keywords], dtype=float)
+
+        # calculate_job_profile_match: (found / total) * weight per keyword kind
+        profile_ids = list(job_profiles)
+        job_scores = np.zeros((row_count, len(profile_ids)))
+        for kind, weight in PROFILE_KEYWORD_KINDS:
+            counts = np.array([[job_profiles[profile_id][kind].count(kw) if kw else 0 for profile_id in profile_ids]
+                               for kw in keywords], dtype=float).reshape(len(keywords), len(profile_ids))
+            totals = np.array([len(job_profiles[profile_id][kind]) for profile_id in profile_ids], dtype=float)
+            found = resume_keywords @ counts
+            job_scores += np.divide(found, totals, out=np.zeros_like(found), where=totals > 0) * weight
+        job_scores = _round1(job_scores)
+        best_profile = job_scores.argmax(axis=1)
+        best_score = job_scores[np.arange(row_count), best_profile]
+
+        # Sections: the ones completeness checks and the benchmarked ones, spread over all rows
+        benchmarks = profiles['section_benchmarks']
+        sections = {}
+        for section_name in set(ATS_REQUIRED_SECTIONS) | {'contact'} | set(benchmarks):
+            stored = columns['sections'].get(section_name)
+            section = {name: np.zeros(row_count) for name in ('lines', 'words', 'metrics', 'tech', 'verbs')}
+            section['present'] = np.zeros(row_count, dtype=bool)
+            if stored is not None:
+                rows = stored['rows']
+                section['present'][rows] = True
+                for name in ('lines', 'words', 'metrics'):
+                    section[name][rows] = stored[name]
+                section_keywords = presence(stored['keywords'], len(rows))
+                section['tech'][rows] = section_keywords @ section_tech
+                section['verbs'][rows] = section_keywords @ section_verbs
+            sections[section_name] = section
+
+        # calculate_comprehensive_ats_score, component by component and summed in the same order
+        breakdown = {
+            'technical_keywords': np.minimum(resume_keywords @ ats_tech * weights['technical_keywords']['per_hit'],
+                                             weights['technical_keywords']['max']),
+            'action_verbs': np.minimum(resume_keywords @ ats_verbs * weights['action_verbs']['per_hit'],
+                                       weights['action_verbs']['max']),
+            'quantification': np.minimum(columns['metrics'] * weights['quantification']['per_hit'],
+                                         weights['quantification']['max']),
+            'formatting': np.minimum(columns['bullets'] * weights['formatting']['per_hit'],
+                                     weights['formatting']['max']),
+            'completeness': (sum((sections[name]['lines'] > 0).astype(float) for name in ATS_REQUIRED_SECTIONS) *
+                             weights['completeness']['per_section'] +
+                             np.where(sections['contact']['present'], weights['completeness']['contact'], 0)),
+            'job_relevance': np.minimum(best_score / weights['job_relevance']['divisor'],
+                                        weights['job_relevance']['max'])
+        }
+        ats_score = np.zeros(row_count)
+        for component in breakdown.values():
+            ats_score = ats_score + component
+
+        # analyze_section_details' benchmark_score and improvement_priority per benchmarked section
+        section_grades = {}
+        for section_name, benchmark in benchmarks.items():
+            section = sections[section_name]
+            factors = []
+            if 'min_words' in benchmark:
+                factors.append(np.minimum(section['words'] / benchmark['ideal_words'], 1.0) * 30)
+            if 'min_tech_terms' in benchmark:
+                factors.append(np.minimum(section['tech'] / benchmark.get('ideal_tech_terms', benchmark['min_tech_terms']),
+                                          1.0) * 25)
+            if 'min_action_verbs' in benchmark:
+                factors.append(np.minimum(section['verbs'] / benchmark['min_action_verbs'], 1.0) * 25)
+            if 'min_metrics' in benchmark:
+                factors.append(np.minimum(section['metrics'] / benchmark.get('ideal_metrics', benchmark['min_metrics']),
+                                          1.0) * 20)
+            score = np.full(row_count, 75.0)
+            if factors:
+                score = np.zeros(row_count)
+                for factor in factors:
+                    score = score + factor
+
+            priority = np.full(row_count, 'Medium', dtype=object)
+            if section_name == 'experience':
+                priority[(section['words'] < benchmark['min_words']) |
+                         (section['verbs'] < benchmark['min_action_verbs'])] = 'CRITICAL'
+            elif section_name == 'projects':
+                priority[section['tech'] < benchmark['min_tech_terms']] = 'HIGH'
+            empty = section['present'] & (section['lines'] == 0)
+            score[empty] = 0
+            priority[empty] = 'CRITICAL'
+            score[~section['present']] = np.nan
+            priority[~section['present']] = None
+            section_grades[section_name] = {'benchmark_score': score, 'improvement_priority': priority}
+
+        return {
+            'ids': columns['ids'],
+            'ats_score': ats_score,
+            'score_breakdown': breakdown,
+            'profile_ids': profile_ids,
+            'job_scores': job_scores,
+            'best_profile': best_profile,
+            'sections': section_grades
+        }
+
+    def what_if(self, baseline, candidate, top=20):
+        """Score changes from baseline to candidate, each a (profiles, ats_weights) pair"""
+        import numpy as np
+        columns = self.load()
+        before = self.score(*baseline, columns=columns)
+        after = self.score(*candidate, columns=columns)
+        delta = after['ats_score'] - before['ats_score']
+        # Round like the report does, so float noise is not a change
+        changed = np.round(after['ats_score'], 1) != np.round(before['ats_score'], 1)
+        best_before = np.array(before['profile_ids'], dtype=object)[before['best_profile']]
+        best_after = np.array(after['profile_ids'], dtype=object)[after['best_profile']]
+        best_changed = best_before != best_after
+
+        sections = {}
+        for section_name in sorted(set(before['sections']) | set(after['sections'])):
+            if section_name not in before['sections'] or section_name not in after['sections']:
+                sections[section_name] = {'benchmark': 'added' if section_name in after['sections'] else 'removed'}
+                continue
+            old, new = before['sections'][section_name], after['sections'][section_name]
+            scored = ~np.isnan(old['benchmark_score'])
+            section_delta = (new['benchmark_score'] - old['benchmark_score'])[scored]
+            sections[section_name] = {
+                'scored': int(scored.sum()),
+                'changed': int((np.round(section_delta, 1) != 0).sum()),
+                'mean_delta': float(section_delta.mean()) if scored.any() else 0.0,
+                'priority_changed': int((old['improvement_priority'] != new['improvement_priority'])[scored].sum())
+            }
+
+        moved = np.flatnonzero(changed | best_changed)
+        movers = moved[np.argsort(-np.abs(delta[moved]), kind='stable')[:top]]
+        sources = self.sources(before['ids'][movers])
+        return {
+            'resumes': len(delta),
+            'ats_changed': int(changed.sum()),
+            'ats_mean_delta': float(delta.mean()) if len(delta) else 0.0,
+            'ats_min_delta': float(delta.min()) if len(delta) else 0.0,
+            'ats_max_delta': float(delta.max()) if len(delta) else 0.0,
+            'best_profile_changed': int(best_changed.sum()),
+            'sections': sections,
+            'movers': [{
+                'source': source,
+                'ats_before': round(float(before['ats_score'][row]), 1),
+                'ats_after': round(float(after['ats_score'][row]), 1),
+                'best_before': best_before[row],
+                'best_after': best_after[row]
+            } for row, source in zip(movers.tolist(), sources)]
+        }
+
+    def stats(self):
+        return {
+            'resumes': self._conn.execute('SELECT COUNT(*) FROM resumes').fetchone()[0],
+            'keywords': len(self._keyword_ids),
+            'vocabularies': self._conn.execute('SELECT COUNT(*) FROM vocabularies').fetchone()[0],
+            'stale_segments': self._conn.execute('SELECT COUNT(*) FROM stale_segments').fetchone()[0]
+        }
+
+    def close(self):
+        self._conn.close()
+
+def profile_set(paths):
+    """Compiled profiles from --profiles style paths, or the built-ins"""
+    return ProfileRegistry(paths).current if paths else builtin_profiles()
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score stored resume features after benchmark or weight changes")
+    parser.add_argument("--store", default="resume_features.sqlite",
+                       help="SQLite feature store (default: resume_features.sqlite)")
+    parser.add_argument("--add", nargs='+', metavar="SOURCE",
+                       help="Analyze resumes (files, directories, globs) and store their features first")
+    parser.add_argument("--profiles", action="append",
+                       help="JSON/YAML file or directory of profiles and benchmarks to score with (repeatable)")
+    parser.add_argument("--ats-weights", help="JSON file overriding ATS_WEIGHTS components")
+    parser.add_argument("--what-if-profiles", action="append",
+                       help="Profiles and benchmarks to compare against the --profiles scores (repeatable)")
+    parser.add_argument("--what-if-weights", help="ATS weights JSON to compare against the --ats-weights scores")
+    parser.add_argument("-k", "--top", type=int, default=20, help="Resumes to list (default: 20)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    args = parser.parse_args()
+
+    import numpy as np
+    try:
+        profiles = profile_set(args.profiles)
+        weights = load_ats_weights(args.ats_weights) if args.ats_weights else ATS_WEIGHTS
+        store = FeatureStore(args.store)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    if args.add:
+        store.add_vocabulary(profiles)
+        batch = []
+        added = 0
+        for file_path in collect_resume_files(args.add):
+            resume_text = extract_resume_text(file_path)
+            if not resume_text:
+                print(f"❌ {file_path}: Could not extract text from the file", file=sys.stderr)
+                continue
+            batch.append((file_path, resume_features(ResumeAnalysis(resume_text, profiles=profiles))))
+            if len(batch) >= 1000:
+                added += store.add_many(batch)
+                batch = []
+        added += store.add_many(batch)
+        print(f"🗃️ Stored features of {added} resumes ({store.stats()['resumes']} in {args.store})")
+
+    started = time.perf_counter()
+    try:
+        if args.what_if_profiles or args.what_if_weights:
+            candidate = (profile_set(args.what_if_profiles) if args.what_if_profiles else profiles,
+                         load_ats_weights(args.what_if_weights) if args.what_if_weights else weights)
+            diff = store.what_if((profiles, weights), candidate, args.top)
+            scores = None
+        else:
+            scores = store.score(profiles, weights)
+            order = np.argsort(-scores['ats_score'], kind='stable')[:args.top]
+            sources = store.sources(scores['ids'][order])
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    finally:
+        store.close()
+    elapsed = time.perf_counter() - started
+
+    if scores is not None:
+        top = [{
+            'source': source,
+            'ats_score': float(scores['ats_score'][row]),
+            'best_job_profile': scores['profile_ids'][scores['best_profile'][row]]
+        } for row, source in zip(order.tolist(), sources)]
+        if args.json:
+            for entry in top:
+                print(json.dumps(entry, ensure_ascii=False))
+            return
+        print(f"🧮 Scored {len(scores['ids'])} resumes from stored features in {elapsed:.2f}s")
+        for rank, entry in enumerate(top, 1):
+            print(f"   {rank:>3}. ATS {entry['ats_score']:5.1f}  {entry['best_job_profile']:<20} {entry['source']}")
+        return
+
+    if args.json:
+        print(json.dumps(diff, ensure_ascii=False, indent=2))
+        return
+    print(f"🔀 What-if over {diff['resumes']} resumes, scored twice in {elapsed:.2f}s")
+    print(f"   ATS score: {diff['ats_changed']} changed, mean {diff['ats_mean_delta']:+.2f}, "
+          f"range {diff['ats_min_delta']:+.1f} to {diff['ats_max_delta']:+.1f}")
+    print(f"   Best job profile: {diff['best_profile_changed']} changed")
+    for section_name, change in diff['sections'].items():
+        if 'scored' in change:
+            print(f"   {section_name} grade: {change['changed']} of {change['scored']} changed, "
+                  f"mean {change['mean_delta']:+.2f}, priority changed for {change['priority_changed']}")
+        else:
+            print(f"   {section_name} grade: benchmark {change['benchmark']}")
+    if diff['movers']:
+        print("   Biggest movers:")
+        for mover in diff['movers']:
+            profile_change = (f", {mover['best_before']} → {mover['best_after']}"
+                              if mover['best_before'] != mover['best_after'] else "")
+            print(f"     {mover['ats_before']:5.1f} → {mover['ats_after']:5.1f}  {mover['source']}{profile_change}")
+
+if __name__ == "__main__":
+    main()
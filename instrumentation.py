@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Pipeline Instrumentation
+Per-stage wall/CPU time and counters, fanned out to pluggable sinks
+"""
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+class _NullStage:
+    """Stage handle used while instrumentation is off: enter, add and exit do nothing"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def add(self, **counters):
+        pass
+
+NULL_STAGE = _NullStage()
+
+class Stage:
+    """One timed stage; times are exclusive of stages nested inside it"""
+
+    def __init__(self, instrumentation, name, labels):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.labels = labels
+        self.counters = {}
+        self.child_wall = 0.0
+        self.child_cpu = 0.0
+
+    def add(self, **counters):
+        for key, value in counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def __enter__(self):
+        self.instrumentation._stack().append(self)
+        self._wall = time.perf_counter()
+        # Per thread like the stage stack; process_time() would also count other threads' work
+        self._cpu = time.thread_time()
+        return self
+
+    def __exit__(self, *exc_info):
+        wall = time.perf_counter() - self._wall
+        cpu = time.thread_time() - self._cpu
+        stack = self.instrumentation._stack()
+        stack.pop()
+        if stack:
+            stack[-1].child_wall += wall
+            stack[-1].child_cpu += cpu
+        self.instrumentation.emit({
+            'stage': self.name,
+            'wall_s': wall - self.child_wall,
+            'cpu_s': max(cpu - self.child_cpu, 0.0),
+            'counters': self.counters,
+            **self.labels
+        })
+        return False
+
+class Instrumentation:
+    """Creates stage timers and hands every finished stage record to its sinks"""
+
+    def __init__(self, sinks=()):
+        self.sinks = list(sinks)
+        self._local = threading.local()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def stage(self, name, **labels):
+        return Stage(self, name, labels)
+
+    def emit(self, record):
+        for sink in self.sinks:
+            sink.record(record)
+
+    def gauge(self, name, value, description=''):
+        """Set a point-in-time value (queue depth, lag) on the sinks that keep gauges"""
+        for sink in self.sinks:
+            if hasattr(sink, 'gauge'):
+                sink.gauge(name, value, description)
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+_active = None
+
+def set_instrumentation(instrumentation):
+    """Install (or with None, remove) the process-wide instrumentation; returns the previous one"""
+    global _active
+    previous, _active = _active, instrumentation
+    return previous
+
+def get_instrumentation():
+    return _active
+
+def timed_stage(name, **labels):
+    """Context manager timing one pipeline stage; a shared no-op while instrumentation is off"""
+    if _active is None:
+        return NULL_STAGE
+    return _active.stage(name, **labels)
+
+class MemorySink:
+    """Aggregates calls, wall/CPU seconds and counters per stage in memory
+
+    Safe to share between threads, e.g. the analysis service's request handlers.
+    """
+
+    def __init__(self):
+        self.stages = defaultdict(lambda: {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'counters': {}})
+        self._lock = threading.Lock()
+
+    def record(self, record):
+        with self._lock:
+            totals = self.stages[record['stage']]
+            totals['calls'] += 1
+            totals['wall_s'] += record['wall_s']
+            totals['cpu_s'] += record['cpu_s']
+            for key, value in record['counters'].items():
+                totals['counters'][key] = totals['counters'].get(key, 0) + value
+
+    def _snapshot(self):
+        """Copy of the per-stage totals, taken under the lock"""
+        with self._lock:
+            return {stage: {**totals, 'counters': dict(totals['counters'])} for stage, totals in self.stages.items()}
+
+    def summary(self):
+        """Per-stage totals, slowest stage first"""
+        return dict(sorted(self._snapshot().items(), key=lambda item: -item[1]['wall_s']))
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+class PrometheusFileSink(MemorySink):
+    """Aggregates like MemorySink and writes the totals in Prometheus text format on flush
+
+    Point node_exporter's textfile collector at the file. It is replaced atomically, so a
+    scrape never sees a half-written file.
+    """
+
+    def __init__(self, path, prefix='resume_analyzer'):
+        super().__init__()
+        self.path = path
+        self.prefix = prefix
+        self.gauges = {}
+
+    def gauge(self, name, value, description=''):
+        with self._lock:
+            self.gauges[name] = (value, description)
+
+    def render(self):
+        lines = []
+        stages = self._snapshot()
+        with self._lock:
+            gauges = dict(self.gauges)
+        metrics = [
+            ('stage_calls_total', 'counter', 'Stage executions', lambda totals: totals['calls']),
+            ('stage_wall_seconds_total', 'counter', 'Wall-clock seconds spent in the stage itself',
+             lambda totals: totals['wall_s']),
+            ('stage_cpu_seconds_total', 'counter', 'CPU seconds the stage itself used on its thread',
+             lambda totals: totals['cpu_s'])
+        ]
+        for metric, metric_type, description, value in metrics:
+            lines.append(f"# HELP {self.prefix}_{metric} {description}")
+            lines.append(f"# TYPE {self.prefix}_{metric} {metric_type}")
+            for stage, totals in sorted(stages.items()):
+                lines.append(f'{self.prefix}_{metric}{{stage="{stage}"}} {value(totals)}')
+
+        counter_names = sorted({key for totals in stages.values() for key in totals['counters']})
+        for key in counter_names:
+            lines.append(f"# HELP {self.prefix}_stage_{key}_total Stage counter '{key}'")
+            lines.append(f"# TYPE {self.prefix}_stage_{key}_total counter")
+            for stage, totals in sorted(stages.items()):
+                if key in totals['counters']:
+                    lines.append(f'{self.prefix}_stage_{key}_total{{stage="{stage}"}} {totals["counters"][key]}')
+
+        for name, (value, description) in sorted(gauges.items()):
+            lines.append(f"# HELP {self.prefix}_{name} {description or name}")
+            lines.append(f"# TYPE {self.prefix}_{name} gauge")
+            lines.append(f"{self.prefix}_{name} {value}")
+        return '\n'.join(lines) + '\n'
+
+    def flush(self):
+        import tempfile
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.metrics_', suffix='.prom')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(temp_path, self.path)
+
+    def close(self):
+        self.flush()
+
+class JsonLinesSink:
+    """Appends one JSON object per stage record"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def record(self, record):
+        self._file.write(json.dumps({'ts': round(time.time(), 6), **record}, ensure_ascii=False) + '\n')
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+class ListSink:
+    """Keeps every record, e.g. to ship a worker's records back to the parent process"""
+
+    def __init__(self):
+        self.records = []
+
+    def record(self, record):
+        self.records.append(record)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+def format_breakdown(summary):
+    """Text table of a MemorySink summary for --profile output"""
+    total_wall = sum(totals['wall_s'] for totals in summary.values()) or 1.0
+    lines = [f"   {'stage':<14} {'calls':>7} {'wall ms':>10} {'cpu ms':>10} {'share':>6}  counters"]
+    for stage, totals in summary.items():
+        counters = ', '.join(f"{key}={value}" for key, value in sorted(totals['counters'].items()))
+        lines.append(f"   {stage:<14} {totals['calls']:>7} {totals['wall_s'] * 1000:>10.1f} "
+                     f"{totals['cpu_s'] * 1000:>10.1f} {totals['wall_s'] / total_wall:>6.1%}  {counters}")
+    return '\n'.join(lines)
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Job Description Matching
+Turns pasted job description text into a job profile and ranks resumes against it
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+import re
+import sys
+import threading
+from collections import Counter, OrderedDict
+
+from advanced_resume_analyzer import (
+    ProfileRegistry, ResumeAnalysis, build_keyword_index, builtin_profiles, calculate_job_profile_match,
+    collect_resume_files, extract_resume_text, match_keywords, profile_fingerprint
+)
+
+# Section headings that decide whether the skills under them are required or preferred;
+# preferred is checked first because "Preferred Qualifications" also says "qualifications"
+PREFERRED_HEADING = re.compile(
+    r"\b(nice[ -]to[ -]haves?|preferred|bonus|pluses|desired|desirable|good[ -]to[ -]have|ideally)\b", re.I)
+REQUIRED_HEADING = re.compile(
+    r"\b(requirements?|required|must[ -]haves?|qualifications|what you(?:'ll)? (?:need|bring)|"
+    r"you have|skills|tech stack)\b", re.I)
+IGNORED_HEADING = re.compile(r"\b(benefits|perks|about us|who we are|equal opportunity|compensation)\b", re.I)
+NEUTRAL_HEADING = re.compile(
+    r"\b(responsibilities|what you(?:'ll)? do|about the (?:role|team|job)|overview|description|the role)\b", re.I)
+
+# A line that softens its own skills, even under a required heading
+PREFERRED_CUE = re.compile(
+    r"\b(nice to have|a plus|bonus|preferred|ideally|good to have|desirable|familiarity with|exposure to)\b",
+    re.I)
+
+BULLET_LINE = re.compile(r'^\s*(?:[-•*·▪◦]|\d+[.)])\s*')
+JD_TOKEN = re.compile(r'[A-Za-z][A-Za-z0-9]*(?:[.+#][A-Za-z0-9]+)*[+#]*')
+
+# Vocabulary terms that are also everyday words; in a job description they count only
+# when written as a proper noun or acronym ("Go", "R", "REST"), not "go beyond" or "the rest"
+AMBIGUOUS_KEYWORDS = {'go', 'r', 'rest', 'express', 'swift', 'rust', 'dart', 'apache', 'oracle', 'responsive'}
+
+# Vendor names that are not a skill of their own when they prefix one ("Apache Spark")
+VENDOR_PREFIXES = {'apache', 'adobe', 'google', 'microsoft', 'amazon'}
+VENDOR_NEXT_WORD = re.compile(r'\s+([A-Za-z][A-Za-z0-9]*(?:[.+#][A-Za-z0-9]+)*[+#]*)')
+
+# Capitalized words common in job descriptions that are not skills
+JD_STOPWORDS = {
+    'a', 'an', 'and', 'or', 'the', 'we', 'you', 'our', 'your', 'us', 'in', 'on', 'at', 'for', 'with', 'to',
+    'of', 'is', 'are', 'be', 'as', 'by', 'this', 'that', 'it', 'if', 'etc', 'e.g', 'i.e', 'inc', 'ltd', 'llc',
+    'team', 'teams', 'role', 'company', 'experience', 'years', 'year', 'plus', 'bonus', 'strong', 'excellent',
+    'solid', 'proven', 'good', 'great', 'deep', 'knowledge', 'understanding', 'familiarity', 'ability',
+    'bachelor', 'bachelors', 'master', 'masters', 'degree', 'phd', 'bs', 'ms', 'ba', 'cs', 'equivalent',
+    'senior', 'junior', 'lead', 'staff', 'principal', 'engineer', 'engineering', 'developer', 'remote',
+    'hybrid', 'onsite', 'full', 'time', 'usa', 'uk', 'eu', 'eoe', 'pto', 'ceo', 'cto', 'hr', 'api', 'apis',
+    'english', 'monday', 'friday', 'january', 'december', 'product', 'business', 'customers', 'users'
+}
+
+# Past-tense action verbs whose present tense is not a suffix change
+IRREGULAR_VERBS = {'built': 'build', 'led': 'lead', 'wrote': 'write', 'ran': 'run', 'drove': 'drive',
+                   'taught': 'teach', 'won': 'win', 'made': 'make'}
+
+MAX_DISCOVERED_TERMS = 20
+
+def jd_hash(jd_text):
+    """Stable hash of a job description, ignoring whitespace differences"""
+    return hashlib.sha256(' '.join(jd_text.split()).encode('utf-8')).hexdigest()[:16]
+
+def _heading_context(label):
+    """Context a section heading sets, or None when the label is not a known heading"""
+    if IGNORED_HEADING.search(label):
+        return 'ignore'
+    if PREFERRED_HEADING.search(label):
+        return 'preferred'
+    if REQUIRED_HEADING.search(label):
+        return 'required'
+    if NEUTRAL_HEADING.search(label):
+        return 'neutral'
+    return None
+
+def _jd_lines(jd_text):
+    """(line, context) pairs, context being 'required', 'preferred' or 'neutral'"""
+    context = 'neutral'
+    for line in jd_text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        label, colon, rest = stripped.partition(':')
+        label_context = None
+        if not BULLET_LINE.match(stripped) and len(label.split()) <= 6:
+            label_context = _heading_context(label)
+        if label_context and not rest.strip():
+            context = label_context
+            continue
+        # "Nice to have: Kafka, Redis" labels only its own line
+        line_context = label_context if label_context and colon else context
+        if line_context == 'ignore':
+            continue
+        yield stripped, 'preferred' if PREFERRED_CUE.search(stripped) else line_context
+
+def _verb_forms(verb):
+    """Present-tense and -ing forms a job description uses for a past-tense resume verb"""
+    if verb in IRREGULAR_VERBS:
+        stems = {IRREGULAR_VERBS[verb]}
+    elif verb.endswith('ied'):
+        stems = {verb[:-3] + 'y'}
+    elif verb.endswith('ed'):
+        stems = {verb[:-2], verb[:-1]}
+    else:
+        stems = {verb}
+    forms = set(stems)
+    for stem in stems:
+        forms.update({stem + 's', stem + 'ing', stem.rstrip('e') + 'ing'})
+    return forms
+
+def _vocabulary_hits(line, index, vocabulary):
+    """(offset, keyword) for the vocabulary skills on a line; where matches overlap the longest wins"""
+    hits = []
+    for offset, keyword, _ in match_keywords(line.lower(), index):
+        if keyword not in vocabulary:
+            continue
+        if keyword in AMBIGUOUS_KEYWORDS and line[offset:offset + len(keyword)].islower():
+            continue
+        hits.append((offset, keyword))
+    hits.sort(key=lambda hit: (hit[0], -len(hit[1])))
+    kept = []
+    for offset, keyword in hits:
+        if kept and offset < kept[-1][0] + len(kept[-1][1]):
+            continue
+        kept.append((offset, keyword))
+    return kept
+
+def _discover_terms(line, vocabulary, lowercase_words, skill_line=False):
+    """Skill-like tokens on a line that the vocabulary does not know yet
+
+    Adjacent ones are joined into one term, so "Delta Lake" stays a single skill. On a
+    skill_line (under a skills heading), single-word items of a short comma list count even
+    in lowercase, so "Snowflake, dbt" keeps dbt.
+    """
+    body = BULLET_LINE.sub('', line)
+    label, colon, rest = body.partition(':')
+    if colon and len(label.split()) <= 6:
+        body = rest
+    # The first word of a short list like "Snowflake, Airflow or dbt" is a skill, not a sentence start
+    short_list = ',' in body and len(body.split()) <= 6
+    listed = set()
+    if skill_line and short_list:
+        listed = {item.strip().lower() for item in re.split(r',|\b(?:and|or)\b', body)
+                  if JD_TOKEN.fullmatch(item.strip())}
+    terms = []
+    last_end = None
+    for match in JD_TOKEN.finditer(body):
+        token = match.group()
+        term = token.lower()
+        if len(term) < 2 or term in vocabulary or term in JD_STOPWORDS:
+            last_end = None
+            continue
+        technical = bool(re.search(r'[0-9.+#]', token)) or any(char.isupper() for char in token[1:])
+        before = body[:match.start()].rstrip()
+        sentence_start = before.endswith(('.', '!', '?', ';')) or (not before and not short_list)
+        proper_noun = token[0].isupper() and not sentence_start and term not in lowercase_words
+        if not (technical or proper_noun or term in listed):
+            last_end = None
+            continue
+        if last_end is not None and body[last_end:match.start()] == ' ':
+            terms[-1] += ' ' + term
+        else:
+            terms.append(term)
+        last_end = match.end()
+    return terms
+
+def extract_jd_profile(jd_text, profiles=None, title=None):
+    """Job profile (title, required/preferred keywords, action verbs) described by a job description
+
+    Known skills come from the profile set's vocabulary: its tech categories and every
+    profile's required and preferred keywords. Where they overlap the longest match wins,
+    and a vendor name such as "Apache" directly before another skill is not a skill itself.
+    Skills under a "nice to have" heading, or on a line that calls them a plus, are
+    preferred; every other mention makes a skill required. Capitalized or technical-looking
+    tokens on skill lines that the vocabulary lacks are added as discovered terms. Keywords
+    are ordered by how often the description mentions them, so the most emphasized ones
+    lead the missing-keyword lists.
+    """
+    profiles = profiles or builtin_profiles()
+    memberships = profiles['keyword_index']['memberships']
+    vocabulary = {keyword for keyword, member in memberships.items()
+                  if member['categories'] or any(kind != 'action_verbs' for _, kind in member['profiles'])}
+    lines = list(_jd_lines(jd_text))
+    lowercase_words = set(re.findall(r'\b[a-z][a-z0-9]*\b', jd_text))
+
+    mentions = Counter()
+    first_seen = {}
+    required = set()
+    discovered = set()
+    for line_number, (line, context) in enumerate(lines):
+        hits = _vocabulary_hits(line, profiles['keyword_index'], vocabulary)
+        new_terms = []
+        if context != 'neutral' or BULLET_LINE.match(line) or line.count(',') >= 2:
+            new_terms = _discover_terms(line, vocabulary, lowercase_words, context != 'neutral')
+            discovered.update(new_terms)
+        skill_words = {keyword for _, keyword in hits} | {term.split()[0] for term in new_terms}
+        found = []
+        for offset, keyword in hits:
+            if keyword in VENDOR_PREFIXES:
+                next_word = VENDOR_NEXT_WORD.match(line, offset + len(keyword))
+                if next_word and next_word.group(1).lower() in skill_words:
+                    continue
+            found.append(keyword)
+        found.extend(new_terms)
+        for keyword in found:
+            mentions[keyword] += 1
+            first_seen.setdefault(keyword, (line_number, len(first_seen)))
+            if context != 'preferred':
+                required.add(keyword)
+
+    # Keep only the most mentioned discovered terms; a long prose JD yields some noise
+    kept = sorted(discovered, key=lambda term: (-mentions[term], first_seen[term]))[:MAX_DISCOVERED_TERMS]
+    dropped = discovered - set(kept)
+    ordered = sorted((keyword for keyword in mentions if keyword not in dropped),
+                     key=lambda keyword: (-mentions[keyword], first_seen[keyword]))
+    required_keywords = [keyword for keyword in ordered if keyword in required]
+    preferred_keywords = [keyword for keyword in ordered if keyword not in required]
+    if not required_keywords:
+        required_keywords, preferred_keywords = preferred_keywords, []
+
+    # Action verbs: the ones the description uses, else those of the closest existing profile
+    jd_words = set(re.findall(r'[a-z]+', jd_text.lower()))
+    all_verbs = sorted({verb for profile in profiles['job_profiles'].values() for verb in profile['action_verbs']})
+    action_verbs = [verb for verb in all_verbs if _verb_forms(verb) & jd_words]
+    if not action_verbs and profiles['job_profiles']:
+        skills = set(ordered)
+        closest = max(profiles['job_profiles'].values(), key=lambda profile: len(
+            skills & set(profile['required_keywords'] + profile['preferred_keywords'])))
+        action_verbs = list(closest['action_verbs'])
+
+    if title is None:
+        first_line = next((line.strip() for line in jd_text.splitlines() if line.strip()), '')
+        title = first_line.rstrip(':') if 0 < len(first_line.split()) <= 10 else 'Job Description'
+    return {
+        'title': title[:80],
+        'required_keywords': required_keywords,
+        'preferred_keywords': preferred_keywords,
+        'action_verbs': action_verbs,
+        'discovered_keywords': [keyword for keyword in ordered if keyword in discovered]
+    }
+
+def compile_jd_matcher(jd_text, profiles=None, title=None):
+    """Profile set holding one job description profile, with its keyword index compiled
+
+    Shaped like compile_profile_set's result, so analyze_resume and calculate_job_profile_match
+    accept it; 'profile_id' names the job description's entry in 'job_profiles'.
+    """
+    profiles = profiles or builtin_profiles()
+    profile = extract_jd_profile(jd_text, profiles, title)
+    if not profile['required_keywords']:
+        raise ValueError("No skills found in the job description")
+    profile_id = f"jd_{jd_hash(jd_text)}"
+    job_profiles = {profile_id: profile}
+    return {
+        'source': 'job description',
+        'fingerprint': profile_fingerprint(job_profiles, profiles['tech_categories'],
+                                           profiles['section_benchmarks']),
+        'job_profiles': job_profiles,
+        'tech_categories': profiles['tech_categories'],
+        'section_benchmarks': profiles['section_benchmarks'],
+        'keyword_index': build_keyword_index(job_profiles, profiles['tech_categories']),
+        'profile_id': profile_id,
+        'jd_hash': jd_hash(jd_text)
+    }
+
+class JDMatcherCache:
+    """Bounded LRU of compiled job description matchers keyed by JD hash
+
+    The key also holds the fingerprint of the profile set supplying the vocabulary and the
+    title, so a profile reload compiles fresh matchers. Compiling happens outside the lock;
+    two threads missing on the same description at once both compile it, and one copy wins.
+    """
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._matchers = OrderedDict()
+
+    def get(self, jd_text, profiles=None, title=None):
+        profiles = profiles or builtin_profiles()
+        key = (jd_hash(jd_text), profiles['fingerprint'], title)
+        with self._lock:
+            matcher = self._matchers.get(key)
+            if matcher is not None:
+                self._matchers.move_to_end(key)
+                self.hits += 1
+                return matcher
+            self.misses += 1
+
+        matcher = compile_jd_matcher(jd_text, profiles, title)
+        with self._lock:
+            self._matchers[key] = matcher
+            self._matchers.move_to_end(key)
+            while len(self._matchers) > self.max_entries:
+                self._matchers.popitem(last=False)
+                self.evictions += 1
+        return matcher
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._matchers),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+_JD_MATCHERS = JDMatcherCache()
+
+def jd_matcher(jd_text, profiles=None, title=None):
+    """Compiled matcher for a job description from the process-wide LRU"""
+    return _JD_MATCHERS.get(jd_text, profiles, title)
+
+def score_resume(resume_text, matcher):
+    """calculate_job_profile_match entry for one resume against a compiled JD matcher"""
+    if isinstance(resume_text, ResumeAnalysis):
+        resume_text = resume_text.text
+    doc = ResumeAnalysis(resume_text, sections={}, profiles=matcher)
+    return calculate_job_profile_match(doc, {})[matcher['profile_id']]
+
+def rank_resumes(jd_text, resumes, k=50, profiles=None, cache=None):
+    """The k best (resume_id, match) pairs for a job description, best first
+
+    resumes yields (resume_id, resume_text) pairs and is consumed once; the matcher is
+    compiled once (or taken from the cache) and shared by every resume. Ties keep input order.
+    """
+    matcher = (cache or _JD_MATCHERS).get(jd_text, profiles)
+    scored = ((match['score'], -position, resume_id, match)
+              for position, (resume_id, match) in enumerate(
+                  (resume_id, score_resume(resume_text, matcher)) for resume_id, resume_text in resumes))
+    return [(resume_id, match) for _, _, resume_id, match in heapq.nlargest(k, scored, key=lambda item: item[:2])]
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank resumes against pasted job descriptions")
+    parser.add_argument("sources", nargs='+', help="Resume files, directories or glob patterns")
+    parser.add_argument("--jd", action="append", required=True,
+                       help="Text file holding a job description; repeatable")
+    parser.add_argument("--profiles", action="append",
+                       help="JSON/YAML file or directory of job profiles whose keywords extend the vocabulary")
+    parser.add_argument("-k", "--top", type=int, default=20, help="Resumes to list per job description (default: 20)")
+    parser.add_argument("--json", action="store_true", help="Print one JSON line per job description")
+
+    args = parser.parse_args()
+
+    profiles = ProfileRegistry(args.profiles).current if args.profiles else None
+    resumes = []
+    for file_path in collect_resume_files(args.sources):
+        resume_text = extract_resume_text(file_path)
+        if resume_text:
+            resumes.append((file_path, resume_text))
+        else:
+            print(f"❌ {file_path}: Could not extract text from the file", file=sys.stderr)
+
+    for jd_path in args.jd:
+        try:
+            with open(jd_path, 'r', encoding='utf-8') as f:
+                jd_text = f.read()
+            matcher = jd_matcher(jd_text, profiles)
+        except (OSError, ValueError) as e:
+            print(f"❌ {jd_path}: {e}", file=sys.stderr)
+            continue
+        profile = matcher['job_profiles'][matcher['profile_id']]
+        ranking = rank_resumes(jd_text, resumes, args.top, profiles)
+
+        if args.json:
+            print(json.dumps({
+                'jd': jd_path,
+                'profile_id': matcher['profile_id'],
+                'profile': profile,
+                'top_resumes': [{'file': file_path, **match} for file_path, match in ranking]
+            }, ensure_ascii=False))
+            continue
+
+        print(f"\n📋 {profile['title']} ({jd_path})")
+        print(f"   Required: {', '.join(profile['required_keywords'])}")
+        if profile['preferred_keywords']:
+            print(f"   Preferred: {', '.join(profile['preferred_keywords'])}")
+        if profile['discovered_keywords']:
+            print(f"   🆕 Not in the vocabulary: {', '.join(profile['discovered_keywords'])}")
+        for rank, (file_path, match) in enumerate(ranking, 1):
+            print(f"   {rank:>3}. {match['score']:5.1f}%  {file_path} "
+                  f"({match['required_found']}/{match['required_total']} required, "
+                  f"{match['preferred_found']}/{match['preferred_total']} preferred)")
+        print(f"   🏁 Ranked {len(resumes)} resumes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Resume Job Queue
+Durable SQLite batch queue with leases and capped retries, so interrupted runs resume where they stopped
+"""
+
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import sys
+import time
+
+from advanced_resume_analyzer import DEFAULT_ANALYSIS_OPTIONS, analyze_resume_file, batch_executor, report_jobs
+from document_watchdog import DocumentLimitExceeded, quarantine_result
+
+# Options that only say what this host does with a result; everything else is fixed per queue
+LOCAL_OPTIONS = ('search_entry', 'feature_entry', 'instrument')
+
+# Result fields too large or too host-specific to keep in the queue
+UNSTORED_RESULT_KEYS = ('analysis', 'stages', 'search_entry', 'feature_entry')
+
+JOB_STATUSES = ('pending', 'leased', 'done', 'failed', 'quarantined')
+
+# UPDATE ... RETURNING arrived in SQLite 3.35; older libraries claim with SELECT then UPDATE
+SQLITE_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+READY_JOBS = ("SELECT id FROM jobs WHERE status = 'pending' AND ready_at <= ? "
+              "UNION ALL SELECT id FROM jobs WHERE status = 'leased' AND lease_expires < ? "
+              "ORDER BY id LIMIT ?")
+
+class JobQueue:
+    """SQLite queue of resume jobs shared by worker processes, or hosts on one filesystem
+
+    A job is pending, leased, done, failed or quarantined. claim() leases ready jobs to one
+    worker until lease_expires; a worker that dies stops renewing, and once its leases run
+    out the jobs are claimed again. Every claim counts as an attempt, so a resume that
+    keeps failing (or keeps killing its worker) is marked failed after max_attempts.
+    complete() and fail() only apply while the caller still holds the lease. Failed
+    attempts wait retry_delay seconds, doubling each time, before the job is ready again.
+    A job the document watchdog stopped is quarantined at once instead: retrying it would
+    only stall another worker for the full limit.
+
+    network_fs uses SQLite's rollback journal instead of WAL, which needs shared memory
+    and so cannot span hosts; every host must then open the queue the same way.
+    """
+
+    def __init__(self, path, lease_seconds=300, max_attempts=3, retry_delay=10, network_fs=False):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._conn = sqlite3.connect(path, timeout=60)
+        self._conn.execute(f"PRAGMA journal_mode={'DELETE' if network_fs else 'WAL'}")
+        with self._conn:
+            self._conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs (id INTEGER PRIMARY KEY, source TEXT UNIQUE NOT NULL, "
+                "output TEXT, status TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0, "
+                "ready_at REAL NOT NULL DEFAULT 0, lease_owner TEXT, lease_expires REAL, error TEXT, "
+                "result TEXT, updated REAL NOT NULL)"
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, ready_at)')
+
+    def configure(self, output_dir, options):
+        """Record the run's output directory and analysis options, unless the queue already has them
+
+        Returns the recorded configuration, which every worker uses.
+        """
+        options = {name: value for name, value in options.items() if name not in LOCAL_OPTIONS}
+        with self._conn:
+            self._conn.execute('INSERT OR IGNORE INTO meta (key, value) VALUES (?, ?)',
+                               ('config', json.dumps({'output_dir': output_dir, 'options': options})))
+        return self.config()
+
+    def config(self):
+        """The recorded {'output_dir', 'options'}, or None before configure()"""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'config'").fetchone()
+        if row is None:
+            return None
+        config = json.loads(row[0])
+        config['options']['profile_paths'] = tuple(config['options'].get('profile_paths', ()))
+        return config
+
+    def enqueue(self, file_paths):
+        """Add resumes not already queued, naming their reports after the recorded output dir
+
+        Returns how many were added; re-enqueueing the same sources is a no-op.
+        """
+        config = self.config()
+        if config is None:
+            raise ValueError("Queue is not configured; call configure() first")
+        queued = set()
+        reports = set()
+        for source, output in self._conn.execute('SELECT source, output FROM jobs'):
+            queued.add(source)
+            reports.add(output)
+        new_paths = [path for path in dict.fromkeys(file_paths) if path not in queued]
+        jobs = report_jobs(new_paths, config['output_dir'], config['options']['output_format'], reports)
+        now = time.time()
+        with self._conn:
+            self._conn.executemany('INSERT OR IGNORE INTO jobs (source, output, updated) VALUES (?, ?, ?)',
+                                   [(source, output, now) for source, output in jobs])
+        return len(jobs)
+
+    def claim(self, worker, limit=1):
+        """Lease up to limit ready jobs to worker: [{'id', 'source', 'output', 'attempts'}]
+
+        Ready means pending past its retry delay, or leased to a worker whose lease ran out.
+        Expired leases that already used every attempt are marked failed instead.
+        """
+        now = time.time()
+        lease = ("UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_owner = ?, "
+                 "lease_expires = ?, updated = ? WHERE id IN ")
+        with self._conn:
+            # Take the write lock up front, so concurrent claimers never share a job
+            self._conn.execute('BEGIN IMMEDIATE')
+            self._conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Lease expired on the last attempt', "
+                "lease_owner = NULL, lease_expires = NULL, updated = ? "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, now, self.max_attempts)
+            )
+            if SQLITE_RETURNING:
+                rows = self._conn.execute(
+                    f"{lease}({READY_JOBS}) RETURNING id, source, output, attempts",
+                    (worker, now + self.lease_seconds, now, now, now, limit)
+                ).fetchall()
+            else:
+                job_ids = [job_id for job_id, in self._conn.execute(READY_JOBS, (now, now, limit))]
+                placeholders = f"({','.join('?' * len(job_ids))})"
+                self._conn.execute(f"{lease}{placeholders}", (worker, now + self.lease_seconds, now, *job_ids))
+                rows = self._conn.execute(
+                    f"SELECT id, source, output, attempts FROM jobs WHERE id IN {placeholders}", job_ids
+                ).fetchall()
+        return [{'id': job_id, 'source': source, 'output': output, 'attempts': attempts}
+                for job_id, source, output, attempts in sorted(rows)]
+
+    def renew(self, worker, job_ids):
+        """Extend worker's leases on job_ids; returns how many it still held"""
+        if not job_ids:
+            return 0
+        with self._conn:
+            return self._conn.execute(
+                f"UPDATE jobs SET lease_expires = ? WHERE status = 'leased' AND lease_owner = ? "
+                f"AND id IN ({','.join('?' * len(job_ids))})",
+                (time.time() + self.lease_seconds, worker, *job_ids)
+            ).rowcount
+
+    def complete(self, job_id, worker, result):
+        """Mark a leased job done with its result; False if worker had lost the lease"""
+        with self._conn:
+            return self._conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL, lease_owner = NULL, "
+                "lease_expires = NULL, updated = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (json.dumps(result, ensure_ascii=False), time.time(), job_id, worker)
+            ).rowcount == 1
+
+    def fail(self, job_id, worker, error):
+        """Record a failed attempt: 'pending' if the job will be retried, 'failed' if it is out
+        of attempts, None if worker had lost the lease"""
+        now = time.time()
+        with self._conn:
+            row = self._conn.execute(
+                "SELECT attempts FROM jobs WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (job_id, worker)
+            ).fetchone()
+            if row is None:
+                return None
+            status = 'pending' if row[0] < self.max_attempts else 'failed'
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, ready_at = ?, lease_owner = NULL, "
+                "lease_expires = NULL, updated = ? WHERE id = ?",
+                (status, error, now + self.retry_delay * 2 ** (row[0] - 1), now, job_id)
+            )
+        return status
+
+    def quarantine(self, job_id, worker, result):
+        """Take a leased job out of rotation with the watchdog's quarantine_result; False if
+        worker had lost the lease"""
+        with self._conn:
+            return self._conn.execute(
+                "UPDATE jobs SET status = 'quarantined', result = ?, error = ?, lease_owner = NULL, "
+                "lease_expires = NULL, updated = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (json.dumps(result, ensure_ascii=False), result['error'], time.time(), job_id, worker)
+            ).rowcount == 1
+
+    def release(self, worker):
+        """Hand worker's unfinished jobs back without counting the attempt (clean shutdown)"""
+        with self._conn:
+            return self._conn.execute(
+                "UPDATE jobs SET status = 'pending', attempts = MAX(attempts - 1, 0), lease_owner = NULL, "
+                "lease_expires = NULL, updated = ? WHERE status = 'leased' AND lease_owner = ?",
+                (time.time(), worker)
+            ).rowcount
+
+    def retry_failed(self, status='failed'):
+        """Give every failed (or quarantined) job a fresh set of attempts; returns how many"""
+        with self._conn:
+            return self._conn.execute(
+                "UPDATE jobs SET status = 'pending', attempts = 0, ready_at = 0, result = NULL, updated = ? "
+                "WHERE status = ?", (time.time(), status)
+            ).rowcount
+
+    def unfinished(self):
+        """Jobs still pending or leased"""
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN ('pending', 'leased')"
+        ).fetchone()[0]
+
+    def failures(self, limit=None):
+        """Failed and quarantined jobs, oldest first: [{'source', 'status', 'attempts', 'error'}]"""
+        rows = self._conn.execute(
+            "SELECT source, status, attempts, error FROM jobs WHERE status IN ('failed', 'quarantined') "
+            "ORDER BY id LIMIT ?", (-1 if limit is None else limit,)
+        )
+        return [{'source': source, 'status': status, 'attempts': attempts, 'error': error}
+                for source, status, attempts, error in rows]
+
+    def results(self):
+        """(source, stored result) for every done job"""
+        for source, result in self._conn.execute("SELECT source, result FROM jobs WHERE status = 'done' ORDER BY id"):
+            yield source, json.loads(result)
+
+    def stats(self):
+        counts = dict(self._conn.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status'))
+        return {status: counts.get(status, 0) for status in JOB_STATUSES}
+
+    def close(self):
+        self._conn.close()
+
+def default_worker_id():
+    """host:pid, unique across the hosts sharing a queue"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def run_queue(queue, workers=None, local_options=None, worker_id=None, poll_interval=2.0):
+    """Work the queue across a process pool until no job is pending or leased, yielding results
+
+    Results come in completion order like run_batch. A failed attempt that will be retried
+    carries 'retrying', a resume the document watchdog stopped carries 'quarantined', and
+    one whose lease was taken over by another worker carries 'lease_lost'. While other
+    workers hold leases this keeps polling, so jobs whose worker died are picked up once
+    their lease expires. On exit, including Ctrl-C, unfinished jobs are handed back to the
+    queue.
+    """
+    from concurrent.futures import FIRST_COMPLETED, wait
+    from concurrent.futures.process import BrokenProcessPool
+    config = queue.config()
+    if config is None:
+        raise ValueError("Queue is not configured; enqueue resumes first")
+    options = {**DEFAULT_ANALYSIS_OPTIONS, **config['options'],
+               **{name: value for name, value in (local_options or {}).items() if name in LOCAL_OPTIONS}}
+    os.makedirs(config['output_dir'], exist_ok=True)
+    worker_id = worker_id or default_worker_id()
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+    executor = batch_executor(workers, options)
+    in_flight = {}
+    renewed = time.monotonic()
+
+    def finish(future, job):
+        try:
+            result = future.result()
+        except DocumentLimitExceeded as e:
+            result = quarantine_result(job['source'], e)
+        except Exception as e:
+            result = {'file': job['source'], 'error': f"Worker failed: {e}"}
+        result['attempt'] = job['attempts']
+        if 'quarantined' in result:
+            status = queue.quarantine(job['id'], worker_id, result)
+        elif 'error' in result:
+            status = queue.fail(job['id'], worker_id, result['error'])
+            if status == 'pending':
+                result['retrying'] = True
+        else:
+            status = queue.complete(job['id'], worker_id,
+                                    {key: value for key, value in result.items() if key not in UNSTORED_RESULT_KEYS})
+        if status is None or status is False:
+            result['lease_lost'] = True
+        return result
+
+    try:
+        while True:
+            if len(in_flight) < max_in_flight:
+                for job in queue.claim(worker_id, max_in_flight - len(in_flight)):
+                    in_flight[executor.submit(analyze_resume_file, job['source'], job['output'], options)] = job
+            if not in_flight:
+                if not queue.unfinished():
+                    break
+                time.sleep(poll_interval)
+                continue
+            done, _ = wait(in_flight, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            if any(isinstance(future.exception(), BrokenProcessPool) for future in done):
+                # Without the watchdog a dying worker takes the whole pool with it: every job
+                # in flight counts as an attempt, so the resume that crashed it runs out of retries
+                wait(in_flight)
+                done = set(in_flight)
+                executor.shutdown(wait=False)
+                executor = batch_executor(workers, options)
+            for future in done:
+                yield finish(future, in_flight.pop(future))
+            if in_flight and time.monotonic() - renewed > queue.lease_seconds / 3:
+                queue.renew(worker_id, [job['id'] for job in in_flight.values()])
+                renewed = time.monotonic()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        queue.release(worker_id)
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or reset a batch job queue (work it with "
+                                                 "advanced_resume_analyzer.py --queue)")
+    parser.add_argument("queue", help="SQLite job queue file")
+    parser.add_argument("--failed", action="store_true", help="List failed and quarantined jobs and their last error")
+    parser.add_argument("--retry-failed", action="store_true",
+                       help="Return failed jobs to the queue with a fresh set of attempts")
+    parser.add_argument("--retry-quarantined", action="store_true",
+                       help="Return jobs the document watchdog quarantined to the queue, e.g. after raising its limits")
+    parser.add_argument("--results", action="store_true", help="Print the stored result of every done job as JSON lines")
+    parser.add_argument("--network-fs", action="store_true",
+                       help="The queue is shared across hosts: use the rollback journal instead of WAL")
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.queue):
+        print(f"❌ Error: Queue '{args.queue}' not found.")
+        sys.exit(1)
+    queue = JobQueue(args.queue, network_fs=args.network_fs)
+    if args.results:
+        for source, result in queue.results():
+            print(json.dumps(result, ensure_ascii=False))
+        queue.close()
+        return
+    if args.retry_failed:
+        print(f"🔁 Requeued {queue.retry_failed()} failed jobs")
+    if args.retry_quarantined:
+        print(f"🔁 Requeued {queue.retry_failed('quarantined')} quarantined jobs")
+    stats = queue.stats()
+    print(f"🗂️ {args.queue}: {stats['done']} done, {stats['pending']} pending, "
+          f"{stats['leased']} leased, {stats['failed']} failed, {stats['quarantined']} quarantined")
+    if args.failed:
+        for failure in queue.failures():
+            marker = '🚧' if failure['status'] == 'quarantined' else '❌'
+            print(f"   {marker} {failure['source']} ({failure['attempts']} attempts): {failure['error']}")
+    queue.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Resume Deduplication Index
+Exact hashes plus MinHash/SimHash fingerprints of cleaned resume text in a local LSH index
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+import time
+import zlib
+
+import numpy as np
+
+from advanced_resume_analyzer import (
+    DEFAULT_PDF_EXTRACTOR, ExtractionCache, collect_resume_files, extract_resume_text
+)
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+SHINGLE_WORDS = 3
+NUM_PERM = 128
+# Universal hashing (a * x + b) mod p over 32-bit shingle hashes; fixed seed so every
+# process and every run produces comparable signatures
+MERSENNE_PRIME = (1 << 31) - 1
+_PERMUTATIONS = np.random.RandomState(20240601).randint(1, MERSENNE_PRIME, size=(2, NUM_PERM)).astype(np.int64)
+
+def text_hash(cleaned_text):
+    """Exact-duplicate key of cleaned resume text"""
+    return hashlib.sha256(cleaned_text.encode('utf-8')).hexdigest()
+
+def _tokens(cleaned_text):
+    return TOKEN_PATTERN.findall(cleaned_text.lower())
+
+def minhash_signature(cleaned_text):
+    """NUM_PERM MinHash values over word 3-gram shingles, as a uint32 array"""
+    tokens = _tokens(cleaned_text)
+    if len(tokens) >= SHINGLE_WORDS:
+        shingles = {' '.join(tokens[i:i + SHINGLE_WORDS]) for i in range(len(tokens) - SHINGLE_WORDS + 1)}
+    else:
+        shingles = set(tokens) or {''}
+    hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+                         dtype=np.int64, count=len(shingles))
+    a, b = _PERMUTATIONS
+    permuted = (a[:, None] * hashes[None, :] + b[:, None]) % MERSENNE_PRIME
+    return permuted.min(axis=1).astype(np.uint32)
+
+def simhash(cleaned_text):
+    """64-bit SimHash over word frequencies"""
+    counts = {}
+    for token in _tokens(cleaned_text):
+        counts[token] = counts.get(token, 0) + 1
+    if not counts:
+        return 0
+    digests = b''.join(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest() for token in counts)
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8).reshape(len(counts), 8), axis=1)
+    weights = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+    votes = (weights[:, None] * (bits.astype(np.int64) * 2 - 1)).sum(axis=0)
+    return int.from_bytes(np.packbits(votes > 0).tobytes(), 'big')
+
+def minhash_similarity(signature, other):
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    return float(np.count_nonzero(signature == other)) / len(signature)
+
+def simhash_distance(value, other):
+    return bin(value ^ other).count('1')
+
+def lsh_bands(threshold, num_perm=NUM_PERM):
+    """(bands, rows) whose candidate threshold (1/bands)^(1/rows) sits just below threshold"""
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        candidate_threshold = (1 / bands) ** (1 / rows)
+        # Below the requested threshold keeps recall; closest to it keeps candidates few
+        if candidate_threshold <= threshold and (best is None or candidate_threshold > best[0]):
+            best = (candidate_threshold, bands, rows)
+    return (best[1], best[2]) if best else (num_perm, 1)
+
+def _to_signed(value):
+    """SQLite integers are signed 64-bit"""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+class DedupIndex:
+    """SQLite store of resume fingerprints with a MinHash LSH index and stored analyses
+
+    Exact duplicates are found by file hash (before extraction) or cleaned-text hash,
+    and return the stored analysis. Near duplicates come from LSH buckets and are kept
+    if their estimated Jaccard similarity reaches threshold.
+    """
+
+    def __init__(self, path, threshold=0.85):
+        self.path = path
+        self.threshold = threshold
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(path, timeout=60)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        with self._conn:
+            self._conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS documents ('
+                'id INTEGER PRIMARY KEY, text_hash TEXT UNIQUE NOT NULL, source TEXT, '
+                'minhash BLOB NOT NULL, simhash INTEGER NOT NULL, created REAL NOT NULL)'
+            )
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS file_hashes (file_key TEXT PRIMARY KEY, text_hash TEXT NOT NULL)'
+            )
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS analyses ('
+                'text_hash TEXT NOT NULL, analysis_key TEXT NOT NULL, analysis TEXT NOT NULL, '
+                'PRIMARY KEY (text_hash, analysis_key))'
+            )
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS lsh_buckets (band INTEGER NOT NULL, bucket BLOB NOT NULL, '
+                'document_id INTEGER NOT NULL)'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS lsh_buckets_lookup ON lsh_buckets (band, bucket)')
+            # The banding is fixed when the index is created; later thresholds only filter candidates
+            bands, rows = lsh_bands(threshold)
+            self._conn.execute("INSERT OR IGNORE INTO meta VALUES ('bands', ?)", (str(bands),))
+            self._conn.execute("INSERT OR IGNORE INTO meta VALUES ('rows', ?)", (str(rows),))
+        meta = dict(self._conn.execute('SELECT key, value FROM meta'))
+        self.bands, self.rows = int(meta['bands']), int(meta['rows'])
+
+    def _band_buckets(self, signature):
+        data = signature.tobytes()
+        width = self.rows * signature.itemsize
+        return [(band, data[band * width:(band + 1) * width]) for band in range(self.bands)]
+
+    def text_for_file(self, file_key):
+        """Cleaned-text hash previously recorded for these exact file bytes"""
+        row = self._conn.execute('SELECT text_hash FROM file_hashes WHERE file_key = ?', (file_key,)).fetchone()
+        return row[0] if row else None
+
+    def document(self, text_hash_value):
+        """{'text_hash', 'source'} of an indexed text, or None if it is not in the index"""
+        row = self._conn.execute('SELECT source FROM documents WHERE text_hash = ?', (text_hash_value,)).fetchone()
+        return {'text_hash': text_hash_value, 'source': row[0]} if row else None
+
+    def stored_analysis(self, text_hash_value, analysis_key):
+        row = self._conn.execute(
+            'SELECT analysis FROM analyses WHERE text_hash = ? AND analysis_key = ?',
+            (text_hash_value, analysis_key)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def store_analysis(self, text_hash_value, analysis_key, analysis):
+        """Keep another result for an indexed text, e.g. its feature_store features"""
+        with self._conn:
+            self._conn.execute('INSERT OR REPLACE INTO analyses VALUES (?, ?, ?)',
+                               (text_hash_value, analysis_key, json.dumps(analysis, ensure_ascii=False)))
+
+    def near_duplicates(self, signature, simhash_value, exclude=None, limit=5):
+        """Stored documents at or above the similarity threshold, most similar first"""
+        candidates = set()
+        for band, bucket in self._band_buckets(signature):
+            candidates.update(document_id for (document_id,) in self._conn.execute(
+                'SELECT document_id FROM lsh_buckets WHERE band = ? AND bucket = ?', (band, bucket)))
+        matches = []
+        for document_id in candidates:
+            text_hash_value, source, stored_minhash, stored_simhash = self._conn.execute(
+                'SELECT text_hash, source, minhash, simhash FROM documents WHERE id = ?', (document_id,)
+            ).fetchone()
+            if text_hash_value == exclude:
+                continue
+            similarity = minhash_similarity(signature, np.frombuffer(stored_minhash, dtype=np.uint32))
+            if similarity >= self.threshold:
+                matches.append({
+                    'text_hash': text_hash_value,
+                    'source': source,
+                    'similarity': round(similarity, 3),
+                    'simhash_distance': simhash_distance(simhash_value, stored_simhash % (1 << 64))
+                })
+        matches.sort(key=lambda match: -match['similarity'])
+        return matches[:limit]
+
+    def add(self, cleaned_text, source=None, file_key=None, analysis_key=None, analysis=None,
+            fingerprints=None):
+        """Record a document's fingerprints, file hash and analysis; returns its text hash"""
+        text_hash_value = text_hash(cleaned_text)
+        signature, simhash_value = fingerprints or (minhash_signature(cleaned_text), simhash(cleaned_text))
+        with self._conn:
+            cursor = self._conn.execute(
+                'INSERT OR IGNORE INTO documents (text_hash, source, minhash, simhash, created) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (text_hash_value, source, signature.tobytes(), _to_signed(simhash_value), time.time())
+            )
+            if cursor.rowcount:
+                self._conn.executemany(
+                    'INSERT INTO lsh_buckets (band, bucket, document_id) VALUES (?, ?, ?)',
+                    [(band, bucket, cursor.lastrowid) for band, bucket in self._band_buckets(signature)]
+                )
+            if file_key:
+                self._conn.execute('INSERT OR REPLACE INTO file_hashes VALUES (?, ?)', (file_key, text_hash_value))
+            if analysis is not None:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO analyses VALUES (?, ?, ?)',
+                    (text_hash_value, analysis_key, json.dumps(analysis, ensure_ascii=False))
+                )
+        return text_hash_value
+
+    def check_file(self, file_path, analysis_key, cache=None, max_pages=None, max_bytes=None, **extract_options):
+        """Classify a resume file against the index before analyzing it
+
+        Returns a dict with 'status' ('exact', 'near' or 'new'), the cleaned 'text' (None
+        when an exact file match skipped extraction), 'analysis' for exact matches,
+        'near_duplicates', and the keys add() needs to record it afterwards.
+        extract_options go to extract_resume_text.
+        """
+        file_key = ExtractionCache.key_for(file_path, max_pages, max_bytes,
+                                           extract_options.get('extractor', DEFAULT_PDF_EXTRACTOR))
+        known_text = self.text_for_file(file_key)
+        if known_text:
+            analysis = self.stored_analysis(known_text, analysis_key)
+            if analysis is not None:
+                self.exact_hits += 1
+                return {'status': 'exact', 'text_hash': known_text, 'file_key': file_key,
+                        'text': None, 'analysis': analysis, 'near_duplicates': []}
+
+        cleaned_text = extract_resume_text(file_path, cache, max_pages, max_bytes, **extract_options)
+        if not cleaned_text:
+            return {'status': 'error', 'file_key': file_key, 'text': None}
+        return self.check_text(cleaned_text, analysis_key, file_key)
+
+    def check_text(self, cleaned_text, analysis_key, file_key=None):
+        """check_file for text that was already extracted and cleaned"""
+        text_hash_value = text_hash(cleaned_text)
+        analysis = self.stored_analysis(text_hash_value, analysis_key)
+        if analysis is not None:
+            self.exact_hits += 1
+            if file_key:
+                with self._conn:
+                    self._conn.execute('INSERT OR REPLACE INTO file_hashes VALUES (?, ?)',
+                                       (file_key, text_hash_value))
+            return {'status': 'exact', 'text_hash': text_hash_value, 'file_key': file_key,
+                    'text': cleaned_text, 'analysis': analysis, 'near_duplicates': []}
+
+        fingerprints = (minhash_signature(cleaned_text), simhash(cleaned_text))
+        near = self.near_duplicates(*fingerprints, exclude=text_hash_value)
+        if near:
+            self.near_hits += 1
+        else:
+            self.misses += 1
+        return {'status': 'near' if near else 'new', 'text_hash': text_hash_value, 'file_key': file_key,
+                'text': cleaned_text, 'fingerprints': fingerprints, 'near_duplicates': near}
+
+    def stats(self):
+        documents = self._conn.execute('SELECT COUNT(*) FROM documents').fetchone()[0]
+        checked = self.exact_hits + self.near_hits + self.misses
+        return {
+            'documents': documents,
+            'exact_hits': self.exact_hits,
+            'near_hits': self.near_hits,
+            'misses': self.misses,
+            'analyses_avoided': self.exact_hits / checked if checked else 0.0,
+            'threshold': self.threshold,
+            'bands': self.bands,
+            'rows': self.rows
+        }
+
+    def close(self):
+        self._conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Find exact and near-duplicate resumes")
+    parser.add_argument("sources", nargs='+', help="Resume files, directories or glob patterns")
+    parser.add_argument("--index", default="resume_dedup.sqlite",
+                       help="SQLite dedup index (default: resume_dedup.sqlite)")
+    parser.add_argument("--threshold", type=float, default=0.85,
+                       help="Estimated Jaccard similarity that counts as a near duplicate (default: 0.85)")
+    parser.add_argument("--no-add", action="store_true", help="Only check; do not add the files to the index")
+
+    args = parser.parse_args()
+
+    index = DedupIndex(args.index, args.threshold)
+    for file_path in collect_resume_files(args.sources):
+        text = extract_resume_text(file_path)
+        if not text:
+            print(f"❌ {file_path}: Could not extract text from the file", file=sys.stderr)
+            continue
+        text_hash_value = text_hash(text)
+        fingerprints = (minhash_signature(text), simhash(text))
+        known = index.document(text_hash_value)
+        near = index.near_duplicates(*fingerprints, exclude=text_hash_value)
+        print(json.dumps({
+            'file': file_path,
+            'exact_duplicate_of': known['source'] if known else None,
+            'near_duplicates': near
+        }, ensure_ascii=False))
+        if not args.no_add:
+            index.add(text, file_path, fingerprints=fingerprints)
+    index.close()
+
+if __name__ == "__main__":
+    main()
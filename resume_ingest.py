@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Resume Ingestion Pipeline
+Asyncio intake from a watched upload directory or a queue, analyzed on a process pool
+"""
+
+import argparse
+import asyncio
+import inspect
+import os
+import sys
+import time
+
+from advanced_resume_analyzer import (
+    DEFAULT_ANALYSIS_OPTIONS, DOCUMENT_MAX_RSS_MB, DOCUMENT_TIMEOUT, REPORT_EXTENSIONS, SUPPORTED_EXTENSIONS,
+    analyze_resume_file, batch_executor, write_analysis, write_ndjson
+)
+from document_watchdog import DocumentLimitExceeded, quarantine_result
+from instrumentation import Instrumentation, JsonLinesSink, PrometheusFileSink
+
+def _scan_directory(directory):
+    """{path: (mtime_ns, size)} of the resume files directly inside directory"""
+    current = {}
+    for entry in os.scandir(directory):
+        if entry.is_file() and entry.name.lower().endswith(SUPPORTED_EXTENSIONS):
+            stat = entry.stat()
+            current[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    return current
+
+async def watch_directory(directory, poll_interval=1.0, once=False):
+    """Yield resume paths as they appear in directory, once each
+
+    A file is only yielded after its size and mtime were the same on two polls, so an
+    upload still being written is left alone. With once=True the directory is drained and
+    the generator ends instead of polling forever. Directories are scanned in a thread,
+    since a large or network-mounted one can take long enough to stall the event loop.
+    """
+    seen = {}
+    pending = {}
+    while True:
+        current = await asyncio.to_thread(_scan_directory, directory)
+
+        for path in sorted(current):
+            signature = current[path]
+            if seen.get(path) == signature:
+                continue
+            if once or pending.get(path) == signature:
+                seen[path] = signature
+                pending.pop(path, None)
+                yield path
+            else:
+                pending[path] = signature
+
+        # Forget files that were moved away so memory tracks the directory, not its history
+        for path in list(seen):
+            if path not in current:
+                del seen[path]
+        for path in list(pending):
+            if path not in current:
+                del pending[path]
+
+        if once:
+            return
+        await asyncio.sleep(poll_interval)
+
+async def iter_queue(queue):
+    """Yield paths put on an asyncio.Queue until a None sentinel arrives"""
+    while True:
+        path = await queue.get()
+        if path is None:
+            return
+        yield path
+
+class NdjsonResultSink:
+    """Appends every result, analysis included, as one NDJSON line"""
+
+    def __init__(self, path):
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def write(self, result):
+        write_ndjson([result], self._file)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+class ReportDirectorySink:
+    """Writes one report per resume into output_dir, named after the resume file
+
+    Failed and quarantined resumes get no report; they are appended to ERRORS_FILE in
+    output_dir and logged to stderr. Reports are rendered off the event loop.
+    """
+
+    ERRORS_FILE = 'ingest_errors.ndjson'
+
+    def __init__(self, output_dir, output_format='text'):
+        self.output_dir = output_dir
+        self.output_format = output_format
+        os.makedirs(output_dir, exist_ok=True)
+        self._errors = open(os.path.join(output_dir, self.ERRORS_FILE), 'a', encoding='utf-8')
+
+    async def write(self, result):
+        if 'analysis' not in result:
+            write_ndjson([{**result, 'failed_at': time.time()}], self._errors)
+            self._errors.flush()
+            if 'quarantined' in result:
+                print(f"🚧 {result['file']}: {result['error']} [quarantined: {result['quarantined']}]", file=sys.stderr)
+            else:
+                print(f"❌ {result['file']}: {result['error']}", file=sys.stderr)
+            return
+        # The full file name, so cv.pdf and cv.txt do not overwrite each other's report
+        name = os.path.basename(result['file'])
+        extension = REPORT_EXTENSIONS[self.output_format]
+        output_file = os.path.join(self.output_dir, f"{name}_intelligence_report{extension}")
+        await asyncio.to_thread(write_analysis, result['analysis'], output_file, self.output_format)
+
+    def close(self):
+        self._errors.close()
+
+class IngestionPipeline:
+    """Feeds resume paths from an async source through a bounded queue to a process pool
+
+    At most max_in_flight resumes are being analyzed and at most queue_size more are
+    waiting; when both are full the source is not read, so a burst of thousands of
+    uploads costs a constant amount of memory.
+    """
+
+    def __init__(self, sink, workers=None, max_in_flight=None, queue_size=None, options=None,
+                 instrumentation=None):
+        self.sink = sink
+        self.workers = workers or os.cpu_count() or 1
+        # Twice the workers keeps every core busy while results are handed to the sink
+        self.max_in_flight = max_in_flight or self.workers * 2
+        self.queue_size = queue_size or self.max_in_flight * 4
+        self.options = {**DEFAULT_ANALYSIS_OPTIONS, **(options or {}),
+                        'instrument': instrumentation is not None}
+        self.instrumentation = instrumentation
+        self.queue = None
+        self.in_flight = 0
+        self.processed = 0
+        self.failed = 0
+        self.quarantined = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.started = time.monotonic()
+
+    def metrics(self):
+        """Queue depth, in-flight work, throughput and queue lag right now"""
+        queued = self.queue.qsize() if self.queue is not None else 0
+        elapsed = time.monotonic() - self.started
+        return {
+            'queue_depth': queued,
+            'in_flight': self.in_flight,
+            'processed': self.processed,
+            'failed': self.failed,
+            'quarantined': self.quarantined,
+            'lag_seconds': round(self.last_lag, 3),
+            'max_lag_seconds': round(self.max_lag, 3),
+            'resumes_per_second': round(self.processed / elapsed, 2) if elapsed else 0.0
+        }
+
+    def _publish_metrics(self):
+        if self.instrumentation is None:
+            return
+        descriptions = {
+            'queue_depth': 'Resumes waiting for a worker',
+            'in_flight': 'Resumes being analyzed',
+            'processed': 'Resumes finished, including failures',
+            'failed': 'Resumes that could not be analyzed',
+            'quarantined': 'Failed resumes stopped by the time or memory limit',
+            'lag_seconds': 'Seconds the last resume waited in the queue',
+            'max_lag_seconds': 'Longest queue wait so far',
+            'resumes_per_second': 'Average throughput since start'
+        }
+        for name, value in self.metrics().items():
+            self.instrumentation.gauge(f"ingest_{name}", value, descriptions[name])
+        self.instrumentation.flush()
+
+    async def _deliver(self, result):
+        for record in result.pop('stages', ()):
+            self.instrumentation.emit(record)
+        written = self.sink.write(result)
+        if inspect.isawaitable(written):
+            await written
+
+    async def _worker(self, loop, executor):
+        while True:
+            item = await self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                return
+            path, enqueued = item
+            self.last_lag = time.monotonic() - enqueued
+            self.max_lag = max(self.max_lag, self.last_lag)
+            self.in_flight += 1
+            try:
+                result = await loop.run_in_executor(executor, analyze_resume_file, path, None, self.options)
+            except DocumentLimitExceeded as e:
+                result = quarantine_result(path, e)
+                self.quarantined += 1
+            except Exception as e:
+                # The worker process itself failed; the pipeline carries on with the next file
+                result = {'file': path, 'error': f"Worker failed: {e}"}
+            finally:
+                self.in_flight -= 1
+            self.processed += 1
+            if 'error' in result:
+                self.failed += 1
+            await self._deliver(result)
+            self.queue.task_done()
+
+    async def _report_metrics(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            self._publish_metrics()
+
+    async def run(self, source, executor=None, metrics_interval=5.0):
+        """Consume every path from the async iterable source, then drain and return the metrics"""
+        loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.started = time.monotonic()
+        own_executor = executor is None
+        if own_executor:
+            # Under the document watchdog when options set a time or memory limit
+            executor = batch_executor(self.workers, self.options)
+        workers = [asyncio.create_task(self._worker(loop, executor)) for _ in range(self.max_in_flight)]
+        reporter = asyncio.create_task(self._report_metrics(metrics_interval))
+        try:
+            async for path in source:
+                # Blocks while the queue is full: backpressure on the source
+                await self.queue.put((path, time.monotonic()))
+            for _ in workers:
+                await self.queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            reporter.cancel()
+            for task in workers:
+                task.cancel()
+            if own_executor:
+                executor.shutdown(wait=True, cancel_futures=True)
+            self._publish_metrics()
+        return self.metrics()
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze resumes as they land in an upload directory")
+    parser.add_argument("directory", help="Upload directory to watch")
+    parser.add_argument("--once", action="store_true",
+                       help="Analyze the files already there and exit instead of watching")
+    parser.add_argument("--poll-interval", type=float, default=1.0,
+                       help="Seconds between directory scans (default: 1)")
+    parser.add_argument("--workers", type=int, default=None,
+                       help="Analysis worker processes (default: CPU count)")
+    parser.add_argument("--max-in-flight", type=int, default=None,
+                       help="Resumes analyzed at once (default: 2x workers)")
+    parser.add_argument("--queue-size", type=int, default=None,
+                       help="Discovered resumes allowed to wait for a worker (default: 4x max in flight)")
+    parser.add_argument("--output", help="Append every result to this NDJSON file")
+    parser.add_argument("--output-dir", help="Write one report per resume into this directory instead")
+    parser.add_argument("--format", choices=['text', 'json'], default="text",
+                       help="Report format for --output-dir (default: text)")
+    parser.add_argument("--cache", help="SQLite file caching extracted PDF text across runs")
+    parser.add_argument("--max-pages", type=int, default=None,
+                       help="Stop reading a PDF after this many pages")
+    parser.add_argument("--max-bytes", type=int, default=None,
+                       help="Stop reading a resume after this many bytes of cleaned text")
+    parser.add_argument("--timeout", type=float, default=DOCUMENT_TIMEOUT,
+                       help=f"Seconds before a resume's worker is killed and the file quarantined, 0 = no limit (default: {DOCUMENT_TIMEOUT:g})")
+    parser.add_argument("--max-rss-mb", type=int, default=DOCUMENT_MAX_RSS_MB,
+                       help=f"Worker resident memory that gets the resume quarantined, 0 = no limit (default: {DOCUMENT_MAX_RSS_MB})")
+    parser.add_argument("--profiles", action="append",
+                       help="JSON/YAML file or directory of job profiles, reloaded when edited (repeatable)")
+    parser.add_argument("--metrics-prom",
+                       help="Prometheus textfile with queue depth, lag and per-stage metrics")
+    parser.add_argument("--metrics-jsonl", help="Append one JSON line per stage execution to this file")
+    parser.add_argument("--metrics-interval", type=float, default=5.0,
+                       help="Seconds between metrics updates (default: 5)")
+
+    args = parser.parse_args()
+
+    if bool(args.output) == bool(args.output_dir):
+        parser.error("give exactly one of --output or --output-dir")
+    if not os.path.isdir(args.directory):
+        print(f"❌ Error: Directory '{args.directory}' not found.")
+        sys.exit(1)
+
+    sink = NdjsonResultSink(args.output) if args.output else ReportDirectorySink(args.output_dir, args.format)
+    metric_sinks = []
+    if args.metrics_prom:
+        metric_sinks.append(PrometheusFileSink(args.metrics_prom))
+    if args.metrics_jsonl:
+        metric_sinks.append(JsonLinesSink(args.metrics_jsonl))
+    instrumentation = Instrumentation(metric_sinks) if metric_sinks else None
+
+    options = {
+        'cache_path': args.cache,
+        'max_pages': args.max_pages,
+        'max_bytes': args.max_bytes,
+        'profile_paths': tuple(args.profiles or ()),
+        'timeout': args.timeout,
+        'max_rss_mb': args.max_rss_mb
+    }
+    pipeline = IngestionPipeline(sink, args.workers, args.max_in_flight, args.queue_size, options,
+                                 instrumentation)
+    source = watch_directory(args.directory, args.poll_interval, args.once)
+
+    print(f"📥 Ingesting from {args.directory} with {pipeline.workers} workers "
+          f"({pipeline.max_in_flight} in flight, queue {pipeline.queue_size})")
+    try:
+        metrics = asyncio.run(pipeline.run(source, metrics_interval=args.metrics_interval))
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down...")
+        metrics = pipeline.metrics()
+    finally:
+        sink.close()
+        if instrumentation is not None:
+            instrumentation.close()
+
+    print(f"🎯 INGESTION COMPLETE: {metrics['processed'] - metrics['failed']} analyzed, "
+          f"{metrics['failed']} failed ({metrics['quarantined']} quarantined), "
+          f"{metrics['resumes_per_second']:.1f} resumes/s, "
+          f"max queue lag {metrics['max_lag_seconds']:.1f}s")
+    if metrics['failed']:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
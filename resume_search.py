@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Resume Search Index
+Persistent keyword postings and job match scores for top-k and boolean candidate queries
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import sys
+import time
+from collections import Counter
+
+from advanced_resume_analyzer import analyze_resume, collect_resume_files, extract_resume_text
+
+QUERY_TOKEN = re.compile(r'\s*(?:(?P<paren>[()])|"(?P<phrase>[^"]+)"|(?P<word>[^\s()"]+))')
+OPERATORS = {'and', 'or', 'not'}
+
+def search_entry(analysis):
+    """The parts of an analyze_resume result the search index keeps"""
+    return {
+        'keywords': analysis['keywords'],
+        'job_scores': {profile_id: match['score'] for profile_id, match in analysis['job_matches'].items()},
+        'ats_score': analysis['summary']['ats_score'],
+        'best_job_profile': analysis['best_job_profile']
+    }
+
+def parse_query(query):
+    """Parse a boolean keyword query into ('keyword', k) / ('and', [...]) / ('or', [...]) / ('not', q)
+
+    Terms next to each other are ANDed; AND, OR and NOT are case-insensitive, NOT binds
+    tightest, then AND, then OR. Quote multi-word keywords: "github actions".
+    """
+    tokens = []
+    position = 0
+    query = query.strip()
+    while position < len(query):
+        match = QUERY_TOKEN.match(query, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Cannot parse query near: {query[position:]!r}")
+        position = match.end()
+        if match.group('paren'):
+            tokens.append(match.group('paren'))
+        elif match.group('phrase'):
+            tokens.append(('keyword', ' '.join(match.group('phrase').lower().split())))
+        elif match.group('word').lower() in OPERATORS:
+            tokens.append(match.group('word').lower())
+        else:
+            tokens.append(('keyword', match.group('word').lower()))
+
+    def parse_or(index):
+        node, index = parse_and(index)
+        children = [node]
+        while index < len(tokens) and tokens[index] == 'or':
+            node, index = parse_and(index + 1)
+            children.append(node)
+        return (children[0] if len(children) == 1 else ('or', children)), index
+
+    def parse_and(index):
+        node, index = parse_not(index)
+        children = [node]
+        while index < len(tokens) and tokens[index] not in ('or', ')'):
+            if tokens[index] == 'and':
+                index += 1
+            node, index = parse_not(index)
+            children.append(node)
+        return (children[0] if len(children) == 1 else ('and', children)), index
+
+    def parse_not(index):
+        if index >= len(tokens):
+            raise ValueError("Query ends where a keyword was expected")
+        token = tokens[index]
+        if token == 'not':
+            node, index = parse_not(index + 1)
+            return ('not', node), index
+        if token == '(':
+            node, index = parse_or(index + 1)
+            if index >= len(tokens) or tokens[index] != ')':
+                raise ValueError("Unbalanced parentheses in query")
+            return node, index + 1
+        if isinstance(token, tuple):
+            return token, index + 1
+        raise ValueError(f"Unexpected {token!r} in query")
+
+    if not tokens:
+        raise ValueError("Empty query")
+    node, index = parse_or(0)
+    if index != len(tokens):
+        raise ValueError(f"Unexpected {tokens[index]!r} in query")
+    return node
+
+class ResumeSearchIndex:
+    """SQLite inverted index of analyzed resumes
+
+    postings holds (keyword, resume) pairs and scores holds every resume's match score
+    per job profile, with an index ordered by score. A query either walks a profile's
+    scores from the top, checking each resume against the keyword filter, until k match,
+    or, when a required keyword is rare, starts from that keyword's postings instead;
+    whichever is expected to touch fewer rows.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=60)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        with self._conn:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS resumes (id INTEGER PRIMARY KEY, source TEXT UNIQUE NOT NULL, '
+                'ats_score REAL NOT NULL, best_profile TEXT, keyword_ids TEXT NOT NULL, added REAL NOT NULL)'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS resumes_by_ats ON resumes (ats_score)')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS keywords (id INTEGER PRIMARY KEY, keyword TEXT UNIQUE NOT NULL, '
+                'resumes INTEGER NOT NULL DEFAULT 0)'
+            )
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS postings (keyword_id INTEGER NOT NULL, resume_id INTEGER NOT NULL, '
+                'PRIMARY KEY (keyword_id, resume_id)) WITHOUT ROWID'
+            )
+            self._conn.execute('CREATE TABLE IF NOT EXISTS profiles (id INTEGER PRIMARY KEY, profile TEXT UNIQUE NOT NULL)')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS scores (resume_id INTEGER NOT NULL, profile_id INTEGER NOT NULL, '
+                'score REAL NOT NULL, PRIMARY KEY (resume_id, profile_id)) WITHOUT ROWID'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS scores_by_profile ON scores (profile_id, score)')
+        self._keyword_ids = dict(self._conn.execute('SELECT keyword, id FROM keywords'))
+        self._profile_ids = dict(self._conn.execute('SELECT profile, id FROM profiles'))
+
+    def _id_for(self, table, column, value, ids):
+        if value not in ids:
+            ids[value] = self._conn.execute(f'INSERT INTO {table} ({column}) VALUES (?)', (value,)).lastrowid
+        return ids[value]
+
+    def add_many(self, entries):
+        """Index (source, search_entry) pairs in one transaction, replacing earlier entries for a source"""
+        try:
+            with self._conn:
+                return self._add_many(entries)
+        except Exception:
+            # The transaction rolled back; forget ids handed out inside it
+            self._keyword_ids = dict(self._conn.execute('SELECT keyword, id FROM keywords'))
+            self._profile_ids = dict(self._conn.execute('SELECT profile, id FROM profiles'))
+            raise
+
+    def _add_many(self, entries):
+        added = 0
+        document_frequency = Counter()
+        for source, entry in entries:
+            previous = self._conn.execute('SELECT id, keyword_ids FROM resumes WHERE source = ?',
+                                          (source,)).fetchone()
+            if previous:
+                old_ids = [int(keyword_id) for keyword_id in previous[1].split()]
+                self._conn.executemany('DELETE FROM postings WHERE keyword_id = ? AND resume_id = ?',
+                                       [(keyword_id, previous[0]) for keyword_id in old_ids])
+                document_frequency.subtract(old_ids)
+                self._conn.execute('DELETE FROM scores WHERE resume_id = ?', (previous[0],))
+                self._conn.execute('DELETE FROM resumes WHERE id = ?', (previous[0],))
+
+            keyword_ids = sorted({self._id_for('keywords', 'keyword', keyword.lower(), self._keyword_ids)
+                                  for keyword in entry['keywords']})
+            resume_id = self._conn.execute(
+                'INSERT INTO resumes (source, ats_score, best_profile, keyword_ids, added) VALUES (?, ?, ?, ?, ?)',
+                (source, entry['ats_score'], entry['best_job_profile'],
+                 ' '.join(map(str, keyword_ids)), time.time())
+            ).lastrowid
+            self._conn.executemany('INSERT INTO postings VALUES (?, ?)',
+                                   [(keyword_id, resume_id) for keyword_id in keyword_ids])
+            document_frequency.update(keyword_ids)
+            self._conn.executemany(
+                'INSERT INTO scores VALUES (?, ?, ?)',
+                [(resume_id, self._id_for('profiles', 'profile', profile_id, self._profile_ids), score)
+                 for profile_id, score in entry['job_scores'].items()]
+            )
+            added += 1
+        self._conn.executemany('UPDATE keywords SET resumes = resumes + ? WHERE id = ?',
+                               [(count, keyword_id) for keyword_id, count in document_frequency.items()
+                                if count])
+        return added
+
+    def add(self, source, analysis):
+        """Index one analyze_resume result under source"""
+        return self.add_many([(source, search_entry(analysis))])
+
+    def _document_frequency(self, keyword):
+        row = self._conn.execute('SELECT id, resumes FROM keywords WHERE keyword = ?', (keyword,)).fetchone()
+        return row if row else (None, 0)
+
+    def _filter_sql(self, node, column, params):
+        """SQL condition on column (a resume id) for a parsed query"""
+        kind = node[0]
+        if kind == 'keyword':
+            keyword_id = self._document_frequency(node[1])[0]
+            if keyword_id is None:
+                return '0'
+            params.append(keyword_id)
+            return f'EXISTS (SELECT 1 FROM postings WHERE keyword_id = ? AND resume_id = {column})'
+        if kind == 'not':
+            return f'NOT ({self._filter_sql(node[1], column, params)})'
+        joiner = ' AND ' if kind == 'and' else ' OR '
+        return '(' + joiner.join(self._filter_sql(child, column, params) for child in node[1]) + ')'
+
+    def search(self, query=None, profile=None, k=50):
+        """Top k resumes by profile match score (or ATS score without a profile) matching query
+
+        Returns a list of dicts with source, score, ats_score and best_profile, best first.
+        """
+        # Only sizes the plan estimate below, so the largest id stands in for a full COUNT(*)
+        total = self._conn.execute('SELECT MAX(id) FROM resumes').fetchone()[0] or 0
+        if profile is not None and profile not in self._profile_ids:
+            raise ValueError(f"Unknown job profile '{profile}'")
+        node = parse_query(query) if query else None
+
+        # Keywords every match must contain: the query itself or the plain keywords of a top-level AND
+        required = []
+        if node and node[0] == 'keyword':
+            required = [node[1]]
+        elif node and node[0] == 'and':
+            required = [child[1] for child in node[1] if child[0] == 'keyword']
+
+        # Walking scores from the top reads about k / selectivity rows; the rarest
+        # required keyword's postings read exactly its document frequency
+        driver = None
+        if required and total:
+            frequencies = {keyword: self._document_frequency(keyword) for keyword in required}
+            rarest = min(required, key=lambda keyword: frequencies[keyword][1])
+            # Unknown, or left behind with no resumes after re-indexing: nothing can match
+            if not frequencies[rarest][1]:
+                return []
+            selectivity = 1.0
+            for keyword in required:
+                selectivity *= frequencies[keyword][1] / total
+            if frequencies[rarest][1] < k / selectivity:
+                driver = frequencies[rarest][0]
+
+        params = []
+        if profile is not None:
+            column, order = 's.resume_id', 's.score DESC, s.resume_id DESC'
+            if driver is None:
+                source_sql = 'SELECT s.resume_id, s.score FROM scores s WHERE s.profile_id = ?'
+            else:
+                # CROSS JOIN keeps the postings as the outer loop
+                source_sql = ('SELECT s.resume_id, s.score FROM postings p CROSS JOIN scores s '
+                              'ON s.resume_id = p.resume_id AND s.profile_id = ? WHERE p.keyword_id = ?')
+            params.append(self._profile_ids[profile])
+        else:
+            column, order = 'r.id', 'r.ats_score DESC, r.id DESC'
+            if driver is None:
+                source_sql = 'SELECT r.id, r.ats_score FROM resumes r WHERE 1'
+            else:
+                source_sql = ('SELECT r.id, r.ats_score FROM postings p CROSS JOIN resumes r '
+                              'ON r.id = p.resume_id WHERE p.keyword_id = ?')
+        if driver is not None:
+            params.append(driver)
+        sql = source_sql
+        if node:
+            sql += ' AND ' + self._filter_sql(node, column, params)
+        sql += f' ORDER BY {order} LIMIT ?'
+        params.append(k)
+        hits = self._conn.execute(sql, params).fetchall()
+
+        results = []
+        for resume_id, score in hits:
+            source, ats_score, best_profile = self._conn.execute(
+                'SELECT source, ats_score, best_profile FROM resumes WHERE id = ?', (resume_id,)
+            ).fetchone()
+            results.append({'source': source, 'score': score, 'ats_score': ats_score, 'best_profile': best_profile})
+        return results
+
+    def stats(self):
+        return {
+            'resumes': self._conn.execute('SELECT COUNT(*) FROM resumes').fetchone()[0],
+            'keywords': len(self._keyword_ids),
+            'profiles': sorted(self._profile_ids)
+        }
+
+    def close(self):
+        self._conn.close()
+
+def iter_entries(sources):
+    """(source, search_entry) for resume files (analyzed here) and batch results.ndjson files"""
+    for source in sources:
+        if source.lower().endswith('.ndjson'):
+            with open(source, 'r', encoding='utf-8') as f:
+                for line in f:
+                    result = json.loads(line)
+                    if 'analysis' in result:
+                        label = f"{result['file']}#{result['record']}" if 'record' in result else result['file']
+                        yield label, search_entry(result['analysis'])
+            continue
+        for file_path in collect_resume_files([source]):
+            resume_text = extract_resume_text(file_path)
+            if not resume_text:
+                print(f"❌ {file_path}: Could not extract text from the file", file=sys.stderr)
+                continue
+            yield file_path, search_entry(analyze_resume(resume_text))
+
+def main():
+    parser = argparse.ArgumentParser(description="Search analyzed resumes by job profile and keywords")
+    parser.add_argument("query", nargs='?',
+                       help='Boolean keyword query, e.g. \'kafka AND redis AND NOT "github actions"\'')
+    parser.add_argument("--index", default="resume_search.sqlite",
+                       help="SQLite search index (default: resume_search.sqlite)")
+    parser.add_argument("--add", nargs='+', metavar="SOURCE",
+                       help="Index resumes (files, directories, globs) or batch results.ndjson files first")
+    parser.add_argument("--profile", help="Rank by this job profile's match score instead of the ATS score")
+    parser.add_argument("-k", "--top", type=int, default=50, help="Results to return (default: 50)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON lines")
+
+    args = parser.parse_args()
+
+    index = ResumeSearchIndex(args.index)
+    if args.add:
+        added = 0
+        batch = []
+        for entry in iter_entries(args.add):
+            batch.append(entry)
+            if len(batch) >= 1000:
+                added += index.add_many(batch)
+                batch = []
+        added += index.add_many(batch)
+        print(f"🗂️ Indexed {added} resumes ({index.stats()['resumes']} in {args.index})")
+        if not args.query and not args.profile:
+            index.close()
+            return
+
+    started = time.perf_counter()
+    try:
+        results = index.search(args.query, args.profile, args.top)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - started
+    index.close()
+
+    if args.json:
+        for result in results:
+            print(json.dumps(result, ensure_ascii=False))
+        return
+    ranking = f"{args.profile} match" if args.profile else "ATS score"
+    print(f"🔎 Top {len(results)} by {ranking} in {elapsed * 1000:.1f} ms")
+    for rank, result in enumerate(results, 1):
+        print(f"   {rank:>3}. {result['score']:5.1f}  {result['source']}")
+
+if __name__ == "__main__":
+    main()
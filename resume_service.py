@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Resume Analysis Service
+Long-running HTTP front end for the analyzer, backed by a warm worker pool
+"""
+
+import argparse
+import io
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from advanced_resume_analyzer import (
+    DOCUMENT_MAX_RSS_MB, ResumeAnalysis, _worker_profiles, analyze_resume, clean_and_fix_text,
+    extract_resume_text, write_text_report
+)
+from document_watchdog import DocumentLimitExceeded, WatchdogExecutor
+
+def _warm_worker():
+    """Pay import and first-call costs when a worker starts, not on its first request"""
+    ResumeAnalysis(clean_and_fix_text("Warm up: Python developer, built 3 APIs")).section_details('header')
+
+def analyze_payload(kind, payload, max_pages=None, max_bytes=None, include_report=False,
+                    profile_paths=()):
+    """Worker entry point: analyze an uploaded PDF/TXT body or raw text"""
+    if kind == 'text':
+        resume_text = clean_and_fix_text(payload)
+        if max_bytes is not None:
+            resume_text = resume_text.encode('utf-8')[:max_bytes].decode('utf-8', errors='ignore')
+    else:
+        with tempfile.TemporaryDirectory(prefix='resume_service_') as workdir:
+            upload_path = os.path.join(workdir, f"upload.{kind}")
+            with open(upload_path, 'wb') as f:
+                f.write(payload)
+            resume_text = extract_resume_text(upload_path, max_pages=max_pages, max_bytes=max_bytes)
+    if not resume_text:
+        raise ValueError("Could not extract text from the upload")
+
+    # Workers re-check the profile files per request, so edits apply without a restart
+    profiles = _worker_profiles(profile_paths) if profile_paths else None
+    result = analyze_resume(resume_text, profiles)
+    if include_report:
+        report = io.StringIO()
+        write_text_report(result, report)
+        result['report'] = report.getvalue()
+    return result
+
+class AnalysisService:
+    """Warm process pool with a concurrency cap, queue timeout and per-request deadline
+
+    The pool runs under the document watchdog: a worker still busy at the deadline, or
+    past max_rss_mb, is killed and replaced, so an abandoned request stops using a core.
+    """
+
+    def __init__(self, workers=None, max_concurrent=None, queue_timeout=1.0,
+                 request_timeout=30.0, max_upload_bytes=10 * 1024 * 1024,
+                 max_pages=None, max_bytes=None, profile_paths=(), max_rss_mb=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_concurrent = max_concurrent or self.workers * 2
+        self.queue_timeout = queue_timeout
+        self.request_timeout = request_timeout
+        self.max_upload_bytes = max_upload_bytes
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.profile_paths = tuple(profile_paths)
+        self.max_rss_mb = max_rss_mb
+        # A slot is held until the worker finishes, even if the client already timed out,
+        # so abandoned jobs still count against the concurrency cap
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._executor = WatchdogExecutor(self.workers, request_timeout, max_rss_mb, initializer=_warm_worker)
+        # Wait for every worker to warm up so the first requests don't pay for it
+        for future in [self._executor.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+
+    def analyze(self, kind, payload, include_report=False):
+        """Run one analysis and return (HTTP status, JSON-serializable body)"""
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            return 503, {'error': 'Service busy, retry later'}
+
+        future = self._executor.submit(analyze_payload, kind, payload, self.max_pages, self.max_bytes,
+                                       include_report, self.profile_paths)
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return 200, future.result(timeout=self.request_timeout)
+        except FutureTimeoutError:
+            # Still queued: drop it. Already running: the watchdog stops it at its own deadline
+            future.cancel()
+            return 504, {'error': f"Analysis exceeded {self.request_timeout:.0f}s"}
+        except DocumentLimitExceeded as e:
+            if e.reason == 'timeout':
+                return 504, {'error': f"Analysis exceeded {self.request_timeout:.0f}s"}
+            if e.reason == 'rss_limit':
+                return 422, {'error': str(e)}
+            return 500, {'error': 'Worker crashed while analyzing the upload'}
+        except ValueError as e:
+            return 422, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': str(e)}
+
+    def health(self):
+        return {
+            'status': 'ok',
+            'workers': self.workers,
+            'max_concurrent': self.max_concurrent,
+            'stopped': dict(self._executor.stopped)
+        }
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+def parse_upload(content_type, body):
+    """Map a request body to (kind, payload): 'pdf'/'txt' bytes or 'text' str"""
+    media_type = content_type.split(';')[0].strip().lower()
+
+    if media_type == 'application/pdf':
+        return 'pdf', body
+    if media_type == 'text/plain':
+        return 'text', body.decode('utf-8')
+    if media_type == 'application/json':
+        data = json.loads(body.decode('utf-8'))
+        if not isinstance(data, dict) or not isinstance(data.get('text'), str):
+            raise ValueError("JSON body must be an object with a 'text' string")
+        return 'text', data['text']
+    if media_type == 'multipart/form-data':
+        # Same form field the upload page already posts to the Node backend
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode('latin-1') + body
+        )
+        for part in message.iter_parts():
+            if part.get_param('name', header='content-disposition') != 'resume':
+                continue
+            filename = (part.get_filename() or '').lower()
+            if filename.endswith('.pdf'):
+                return 'pdf', part.get_payload(decode=True)
+            if filename.endswith('.txt'):
+                return 'txt', part.get_payload(decode=True)
+            raise ValueError("Unsupported file format. Please use PDF or TXT files.")
+        raise ValueError("Multipart body has no 'resume' file field")
+    raise ValueError(f"Unsupported content type: {media_type or 'missing'}")
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """POST /analyze[?report=text] with a PDF, TXT, multipart upload or {"text": ...}; GET /health"""
+
+    server_version = 'PowerUpResume/1.0'
+
+    def _send_json(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        if status == 503:
+            self.send_header('Retry-After', '1')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, self.server.service.health())
+        else:
+            self._send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != '/analyze':
+            self._send_json(404, {'error': 'Not found'})
+            return
+
+        service = self.server.service
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0:
+            self._send_json(400, {'error': 'Empty request body'})
+            return
+        if length > service.max_upload_bytes:
+            self._send_json(413, {'error': f"Upload exceeds {service.max_upload_bytes} bytes"})
+            return
+
+        body = self.rfile.read(length)
+        try:
+            kind, payload = parse_upload(self.headers.get('Content-Type', ''), body)
+        except (ValueError, UnicodeDecodeError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+
+        include_report = parse_qs(url.query).get('report') == ['text']
+        status, result = service.analyze(kind, payload, include_report)
+        self._send_json(status, result)
+
+def make_server(service, host='127.0.0.1', port=8000):
+    """HTTP server bound to host:port (port 0 picks a free one) serving the given service"""
+    server = ThreadingHTTPServer((host, port), AnalysisRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Resume Analysis Service")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="Bind port (default: 8000)")
+    parser.add_argument("--workers", type=int, default=None,
+                       help="Warm analysis worker processes (default: CPU count)")
+    parser.add_argument("--max-concurrent", type=int, default=None,
+                       help="Analyses admitted at once, running or queued (default: 2x workers)")
+    parser.add_argument("--queue-timeout", type=float, default=1.0,
+                       help="Seconds to wait for a free slot before answering 503 (default: 1)")
+    parser.add_argument("--timeout", type=float, default=30.0,
+                       help="Per-request analysis deadline in seconds (default: 30)")
+    parser.add_argument("--max-rss-mb", type=int, default=DOCUMENT_MAX_RSS_MB,
+                       help=f"Worker resident memory at which an analysis is stopped, 0 = no limit (default: {DOCUMENT_MAX_RSS_MB})")
+    parser.add_argument("--max-upload-mb", type=int, default=10,
+                       help="Largest accepted request body in MB (default: 10)")
+    parser.add_argument("--max-pages", type=int, default=None,
+                       help="Stop reading a PDF after this many pages")
+    parser.add_argument("--max-bytes", type=int, default=None,
+                       help="Stop reading a resume after this many bytes of cleaned text")
+    parser.add_argument("--profiles", action="append",
+                       help="JSON/YAML file or directory of job profiles, reloaded when edited (repeatable)")
+
+    args = parser.parse_args()
+
+    service = AnalysisService(args.workers, args.max_concurrent, args.queue_timeout,
+                              args.timeout, args.max_upload_mb * 1024 * 1024,
+                              args.max_pages, args.max_bytes, args.profiles or (), args.max_rss_mb)
+    server = make_server(service, args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f"🚀 Resume analysis service on http://{host}:{port} ({service.workers} warm workers)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down...")
+    finally:
+        server.server_close()
+        service.close()
+
+if __name__ == "__main__":
+    main()
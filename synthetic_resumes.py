@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Synthetic Resume Generator
+Seeded, reproducible resume text for benchmarks and load tests
+"""
+
+import argparse
+import os
+import random
+
+from advanced_resume_analyzer import JOB_PROFILES, TECH_CATEGORIES
+
+FIRST_NAMES = ['Aarav', 'Priya', 'Rohan', 'Ananya', 'Vikram', 'Meera', 'Kabir', 'Isha', 'Arjun', 'Sara']
+LAST_NAMES = ['Sharma', 'Patel', 'Iyer', 'Reddy', 'Gupta', 'Khan', 'Das', 'Nair', 'Mehta', 'Singh']
+COMPANIES = ['Infosys', 'Zoho', 'Flipkart', 'Razorpay', 'Swiggy', 'Freshworks', 'Postman', 'Atlassian']
+SCHOOLS = ['IIT Delhi', 'NIT Trichy', 'BITS Pilani', 'VIT Vellore', 'IIIT Hyderabad', 'Anna University']
+DEGREES = ['B.Tech in Computer Science', 'M.Tech in Data Science', 'B.E. in Information Technology',
+           'MCA', 'B.Sc in Mathematics']
+OBJECTS = ['REST APIs', 'data pipelines', 'dashboards', 'microservices', 'recommendation models',
+           'CI pipelines', 'payment flows', 'search features', 'mobile screens', 'ETL jobs']
+OUTCOMES = ['cutting latency by {n}%', 'serving {n}k daily users', 'saving {n} hours a week',
+            'raising conversion by {n}%', 'reducing costs by {n}%', 'handling {n}M requests a day']
+# Header spellings seen in real resumes, so the section classifier sees variety
+SECTION_HEADERS = {
+    'summary': ['SUMMARY', 'Professional Summary', 'Profile', 'Career Objective', 'About Me'],
+    'education': ['EDUCATION', 'Education', 'Academic Background'],
+    'experience': ['EXPERIENCE', 'Work Experience', 'Professional Experience', 'Employment History'],
+    'projects': ['PROJECTS', 'Projects', 'Personal Projects', 'Portfolio'],
+    'skills': ['SKILLS', 'Technical Skills', 'Core Competencies', 'Tools & Technologies'],
+    'achievements': ['ACHIEVEMENTS', 'Awards', 'Certifications', 'Honors & Awards'],
+    'languages': ['LANGUAGES', 'Languages Known'],
+    'interests': ['INTERESTS', 'Hobbies', 'Activities']
+}
+
+# Multiplier on roles, projects and bullets: roughly one, two and four-plus pages
+RESUME_SIZES = {'short': 1, 'standard': 2, 'long': 5}
+
+def _bullet(rng, verbs, keywords):
+    outcome = rng.choice(OUTCOMES).format(n=rng.randint(2, 90))
+    return (f"{rng.choice(['•', '-', '*'])} {rng.choice(verbs).capitalize()} {rng.choice(OBJECTS)} "
+            f"with {rng.choice(keywords)} and {rng.choice(keywords)}, {outcome}")
+
+def generate_resume_text(rng, size='standard'):
+    """One plain-text resume drawn from rng; sections, lengths and keywords vary per call"""
+    scale = RESUME_SIZES[size]
+    profile = JOB_PROFILES[rng.choice(sorted(JOB_PROFILES))]
+    keywords = profile['required_keywords'] + profile['preferred_keywords']
+    verbs = profile['action_verbs']
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+    lines = [
+        name,
+        profile['title'],
+        f"{name.split()[0].lower()}{rng.randint(1, 999)}@example.com | +91 {rng.randint(6000000000, 9999999999)}"
+    ]
+    section_names = ['summary', 'education', 'experience', 'projects', 'skills']
+    section_names += rng.sample(['achievements', 'languages', 'interests'], rng.randint(0, 3))
+    # No blank lines between sections: TXT cleaning folds runs of whitespace, newlines included
+    for section_name in section_names:
+        lines.append(rng.choice(SECTION_HEADERS[section_name]))
+        if section_name == 'summary':
+            lines.append(f"{profile['title']} with {rng.randint(1, 12)} years of experience in "
+                         f"{', '.join(rng.sample(keywords, 3))}.")
+        elif section_name == 'education':
+            for _ in range(rng.randint(1, 2)):
+                lines.append(f"{rng.choice(DEGREES)}, {rng.choice(SCHOOLS)} "
+                             f"{rng.randint(2008, 2024)} | CGPA {rng.randint(60, 99) / 10}")
+        elif section_name in ('experience', 'projects'):
+            for _ in range(rng.randint(1, 2 * scale)):
+                if section_name == 'experience':
+                    lines.append(f"{profile['title']}, {rng.choice(COMPANIES)} "
+                                 f"{rng.randint(2015, 2024)} - Present")
+                else:
+                    lines.append(f"{rng.choice(OBJECTS).title()} Platform")
+                lines.extend(_bullet(rng, verbs, keywords) for _ in range(rng.randint(2, 2 + 2 * scale)))
+        elif section_name == 'skills':
+            for category in rng.sample(sorted(TECH_CATEGORIES), 3):
+                picks = rng.sample(TECH_CATEGORIES[category], min(4, len(TECH_CATEGORIES[category])))
+                lines.append(f"{category.replace('_', ' ').title()}: {', '.join(picks)}")
+        elif section_name == 'achievements':
+            lines.extend(f"{rng.choice(['Won', 'Ranked', 'Awarded'])} {rng.choice(['1st', '2nd', 'top 5%'])} "
+                         f"in a national hackathon of {rng.randint(100, 5000)} teams"
+                         for _ in range(rng.randint(1, 3)))
+        elif section_name == 'languages':
+            lines.append(', '.join(rng.sample(['English', 'Hindi', 'Tamil', 'Telugu', 'Marathi'], 2)))
+        else:
+            lines.append(', '.join(rng.sample(['Chess', 'Cricket', 'Open source', 'Blogging', 'Trekking'], 2)))
+    return '\n'.join(lines)
+
+def generate_corpus(count, seed=0, size='standard'):
+    """count resume texts; the same seed always yields the same corpus"""
+    rng = random.Random(seed)
+    return [generate_resume_text(rng, size) for _ in range(count)]
+
+def _pdf_string(line):
+    """A PDF literal string in WinAnsiEncoding, which has the bullet character"""
+    data = line.encode('cp1252', errors='replace')
+    return b'(' + data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+def write_pdf(text, file_path, lines_per_page=56, wrap=95):
+    """Write text as a simple multi-page PDF with a real text layer, using only the stdlib"""
+    lines = []
+    for line in text.split('\n'):
+        while len(line) > wrap:
+            cut = line.rfind(' ', 0, wrap)
+            cut = cut if cut > 0 else wrap
+            lines.append(line[:cut])
+            line = line[cut:].lstrip()
+        lines.append(line)
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    # Objects: 1 catalog, 2 page tree, 3 font, then a (page, content) pair per page
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        None,
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>'
+    ]
+    page_refs = []
+    for page_lines in pages:
+        stream = b'BT /F1 10 Tf 13 TL 50 770 Td ' + b' T* '.join(
+            _pdf_string(line) + b' Tj' for line in page_lines) + b' ET'
+        page_number = len(objects) + 1
+        page_refs.append(f"{page_number} 0 R".encode())
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_number + 1} 0 R >>".encode())
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b'\nendstream')
+    objects[1] = b'<< /Type /Pages /Kids [' + b' '.join(page_refs) + f"] /Count {len(pages)} >>".encode()
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode() + body + b'\nendobj\n'
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    output += b''.join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    with open(file_path, 'wb') as f:
+        f.write(output)
+
+def write_corpus(output_dir, count, seed=0, sizes=('standard',), formats=('txt',)):
+    """Write count resumes per size and format, named {size}_{n:05d}.{format}; returns the paths"""
+    os.makedirs(output_dir, exist_ok=True)
+    file_paths = []
+    for size in sizes:
+        # Each size gets its own stream so adding a size leaves the others unchanged
+        for number, text in enumerate(generate_corpus(count, f"{seed}:{size}", size)):
+            for file_format in formats:
+                file_path = os.path.join(output_dir, f"{size}_{number:05d}.{file_format}")
+                if file_format == 'pdf':
+                    write_pdf(text, file_path)
+                else:
+                    with open(file_path, 'w', encoding='utf-8') as f:
+                        f.write(text + '\n')
+                file_paths.append(file_path)
+    return file_paths
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a seeded synthetic resume corpus")
+    parser.add_argument("output_dir", help="Directory for the generated resumes")
+    parser.add_argument("--count", type=int, default=100, help="Resumes per size (default: 100)")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed (default: 0)")
+    parser.add_argument("--sizes", nargs='+', choices=list(RESUME_SIZES), default=['standard'],
+                       help="Resume lengths to generate (default: standard)")
+    parser.add_argument("--formats", nargs='+', choices=['txt', 'pdf'], default=['txt', 'pdf'],
+                       help="File formats to write (default: txt pdf)")
+    
+    args = parser.parse_args()
+    
+    file_paths = write_corpus(args.output_dir, args.count, args.seed, args.sizes, args.formats)
+    print(f"✅ Wrote {len(file_paths)} resumes to {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import numpy as np
+
+from advanced_resume_analyzer import ResumeAnalysis, calculate_job_profile_match
+from batch_matching import (
+    _top_k, compile_profile_matrix, resume_keyword_matrix, score_matrix, top_profiles_per_resume,
+    top_resumes_per_profile
+)
+from synthetic_resumes import generate_corpus
+
+CORPUS = generate_corpus(300, seed=9)
+
+def test_scores_equal_the_per_resume_loop():
+    profile_matrix = compile_profile_matrix()
+    found = (resume_keyword_matrix(CORPUS, profile_matrix) @ profile_matrix['counts']).toarray()
+    scores = score_matrix(resume_keyword_matrix(CORPUS, profile_matrix), profile_matrix)
+    profile_count = len(profile_matrix['profile_ids'])
+    for row, text in enumerate(CORPUS):
+        matches = calculate_job_profile_match(text, {})
+        assert list(matches) == profile_matrix['profile_ids']
+        for column, match in enumerate(matches.values()):
+            assert round(float(scores[row, column]), 1) == match['score']
+            assert found[row, column] == match['required_found']
+            assert found[row, profile_count + column] == match['preferred_found']
+            assert found[row, 2 * profile_count + column] == match['action_verbs_found']
+
+def test_analyses_score_like_their_text():
+    profile_matrix = compile_profile_matrix()
+    texts = CORPUS[:50]
+    from_texts = score_matrix(resume_keyword_matrix(texts, profile_matrix), profile_matrix)
+    analyses = [ResumeAnalysis.of(text) for text in texts]
+    from_analyses = score_matrix(resume_keyword_matrix(analyses, profile_matrix), profile_matrix)
+    assert (from_texts == from_analyses).all()
+
+def test_top_resumes_match_across_chunk_sizes():
+    profile_matrix = compile_profile_matrix()
+    whole = top_resumes_per_profile(CORPUS, profile_matrix, k=10)
+    chunked = top_resumes_per_profile(CORPUS, profile_matrix, k=10, chunk_rows=37)
+    assert whole == chunked
+    scores = score_matrix(resume_keyword_matrix(CORPUS, profile_matrix), profile_matrix)
+    for row, best in enumerate(top_profiles_per_resume(scores, profile_matrix, k=3)):
+        matches = calculate_job_profile_match(CORPUS[row], {})
+        assert [score for _, score in best] == sorted(
+            (match['score'] for match in matches.values()), reverse=True)[:3]
+
+def test_top_k_keeps_lowest_indices_among_ties():
+    values = np.array([1.0, 3.0, 2.0, 3.0, 3.0, 2.0, 3.0])
+    assert _top_k(values, 2) == [1, 3]
+    assert _top_k(values, 5) == [1, 3, 4, 6, 2]
+    assert _top_k(values, 10) == [1, 3, 4, 6, 2, 5, 0]
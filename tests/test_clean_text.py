@@ -0,0 +1,16 @@
+import json
+import os
+
+import pytest
+
+from advanced_resume_analyzer import clean_and_fix_text
+
+# Input/output pairs recorded from the original sequential re.sub implementation
+with open(os.path.join(os.path.dirname(__file__), 'fixtures', 'clean_text_golden.json'), encoding='utf-8') as f:
+    GOLDEN = json.load(f)
+
+@pytest.mark.parametrize('case', GOLDEN, ids=range(len(GOLDEN)))
+def test_clean_and_fix_text_matches_golden(case):
+    cleaned = clean_and_fix_text(case['input'])
+    assert cleaned == case['expected']
+    assert clean_and_fix_text(cleaned) == cleaned
@@ -0,0 +1,47 @@
+import pickle
+
+import pytest
+
+from document_watchdog import DocumentLimitExceeded, WatchdogExecutor
+
+def echo(value):
+    return value
+
+def test_unpicklable_job_fails_only_its_future():
+    with WatchdogExecutor(1, timeout=10) as executor:
+        bad = executor.submit(lambda: 1)
+        good = executor.submit(echo, 2)
+        # PicklingError or AttributeError depending on where the lambda lives
+        with pytest.raises((pickle.PicklingError, AttributeError)):
+            bad.result(timeout=10)
+        assert good.result(timeout=10) == 2
+
+def test_timeout_stops_the_document():
+    import time
+    with WatchdogExecutor(1, timeout=0.5) as executor:
+        slow = executor.submit(time.sleep, 30)
+        with pytest.raises(DocumentLimitExceeded) as stopped:
+            slow.result(timeout=10)
+        assert stopped.value.reason == 'timeout'
+        assert executor.submit(echo, 3).result(timeout=10) == 3
+
+def test_chunk_gets_the_time_limit_per_document():
+    import time
+    with WatchdogExecutor(1, timeout=0.5) as executor:
+        chunk = executor.submit_chunk(4, time.sleep, 1)
+        assert chunk.result(timeout=10) is None
+        with pytest.raises(DocumentLimitExceeded):
+            executor.submit(time.sleep, 1).result(timeout=10)
+
+def start_child_holding(megabytes):
+    import subprocess
+    import sys
+    child = subprocess.Popen([sys.executable, '-c',
+                              f"import time; data = b'x' * {megabytes} * 1024 * 1024; time.sleep(60)"])
+    child.wait()
+
+def test_rss_limit_counts_processes_the_worker_started():
+    with WatchdogExecutor(1, timeout=30, max_rss_mb=200) as executor:
+        with pytest.raises(DocumentLimitExceeded) as stopped:
+            executor.submit(start_child_holding, 300).result(timeout=30)
+        assert stopped.value.reason == 'rss_limit'
@@ -0,0 +1,66 @@
+import copy
+import math
+
+import pytest
+
+from advanced_resume_analyzer import (
+    ATS_WEIGHTS, ResumeAnalysis, analyze_resume, calculate_comprehensive_ats_score,
+    calculate_job_profile_match
+)
+from feature_store import FeatureStore
+from synthetic_resumes import generate_corpus
+
+CORPUS = generate_corpus(200, seed=23)
+
+@pytest.fixture(scope='module')
+def store(tmp_path_factory):
+    store = FeatureStore(str(tmp_path_factory.mktemp('features') / 'features.sqlite'))
+    for number, text in enumerate(CORPUS):
+        store.add(f'resume_{number}.txt', ResumeAnalysis.of(text))
+    yield store
+    store.close()
+
+def rows_by_source(store, scores):
+    return {source: row for row, source in enumerate(store.sources(scores['ids']))}
+
+def test_scores_equal_analyze_resume(store):
+    scores = store.score()
+    rows = rows_by_source(store, scores)
+    for number, text in enumerate(CORPUS):
+        row = rows[f'resume_{number}.txt']
+        analysis = analyze_resume(text)
+        assert scores['ats_score'][row] == analysis['summary']['ats_score']
+        for component, values in scores['score_breakdown'].items():
+            assert values[row] == analysis['score_breakdown'][component], component
+        for column, profile_id in enumerate(scores['profile_ids']):
+            assert scores['job_scores'][row, column] == analysis['job_matches'][profile_id]['score']
+        assert scores['profile_ids'][scores['best_profile'][row]] == analysis['best_job_profile']
+        for section_name, grades in scores['sections'].items():
+            details = analysis['section_analyses'].get(section_name)
+            if details is None:
+                assert math.isnan(grades['benchmark_score'][row])
+                assert grades['improvement_priority'][row] is None
+            else:
+                assert grades['benchmark_score'][row] == details['benchmark_score'], section_name
+                assert grades['improvement_priority'][row] == details['improvement_priority'], section_name
+
+def test_scores_under_changed_weights_equal_a_fresh_score(store):
+    weights = copy.deepcopy(ATS_WEIGHTS)
+    weights['technical_keywords'] = {'per_hit': 0.7, 'max': 30}
+    weights['formatting']['max'] = 5
+    scores = store.score(weights=weights)
+    rows = rows_by_source(store, scores)
+    for number, text in enumerate(CORPUS[:50]):
+        doc = ResumeAnalysis.of(text)
+        job_matches = calculate_job_profile_match(doc, doc.sections)
+        ats_score, _ = calculate_comprehensive_ats_score(doc, doc.sections, job_matches, weights)
+        assert scores['ats_score'][rows[f'resume_{number}.txt']] == ats_score
+
+def test_readding_a_source_replaces_it(tmp_path):
+    store = FeatureStore(str(tmp_path / 'features.sqlite'))
+    store.add('resume.txt', ResumeAnalysis.of(CORPUS[0]))
+    store.add('resume.txt', ResumeAnalysis.of(CORPUS[1]))
+    scores = store.score()
+    assert store.sources(scores['ids']) == ['resume.txt']
+    assert scores['ats_score'][0] == analyze_resume(CORPUS[1])['summary']['ats_score']
+    store.close()
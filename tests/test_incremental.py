@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from advanced_resume_analyzer import IncrementalAnalyzer, analyze_resume
+from synthetic_resumes import generate_corpus
+
+CERTIFICATIONS = ['Certifications', 'AWS Certified Solutions Architect 2022']
+RENAMED_HEADERS = {'Employment History': 'Work Experience', 'EXPERIENCE': 'Work Experience',
+                   'Core Competencies': 'Technical Skills', 'PROJECTS': 'Personal Projects'}
+
+def edits(text):
+    """(label, text) for a series of edits, each applied to the previous version"""
+    lines = text.split('\n')
+    bullet = next(number for number, line in enumerate(lines) if line[:1] in '•-*')
+    lines[bullet] += ' using Kubernetes and Docker'
+    yield 'edit inside a section', '\n'.join(lines)
+    lines += CERTIFICATIONS
+    yield 'section added', '\n'.join(lines)
+    lines = lines[:-len(CERTIFICATIONS)]
+    yield 'section removed', '\n'.join(lines)
+    lines = [RENAMED_HEADERS.get(line, line) for line in lines]
+    yield 'headers renamed', '\n'.join(lines)
+    lines.insert(3, 'Contact Information')
+    yield 'header added', '\n'.join(lines)
+    yield 'back to the original', text
+
+@pytest.mark.parametrize('seed', range(5))
+def test_incremental_matches_fresh_analysis(seed):
+    analyzer = IncrementalAnalyzer()
+    for text in generate_corpus(3, seed=seed):
+        assert analyzer.analyze(text) == analyze_resume(text)
+        for label, edited in edits(text):
+            assert analyzer.analyze(edited) == analyze_resume(edited), label
+            if label == 'edit inside a section':
+                assert analyzer.last_stats['lines_rescanned'] == 1
+
+def test_incremental_matches_after_random_line_edits():
+    rng = random.Random(14)
+    analyzer = IncrementalAnalyzer()
+    lines = generate_corpus(1, seed=14)[0].split('\n')
+    for _ in range(60):
+        number = rng.randrange(len(lines))
+        action = rng.choice(['delete', 'duplicate', 'edit', 'swap'])
+        if action == 'delete' and len(lines) > 5:
+            del lines[number]
+        elif action == 'duplicate':
+            lines.insert(number, lines[number])
+        elif action == 'edit':
+            lines[number] += rng.choice([' with Python', ' (2021)', ', cutting costs by 12%', ''])
+        else:
+            other = rng.randrange(len(lines))
+            lines[number], lines[other] = lines[other], lines[number]
+        text = '\n'.join(lines)
+        assert analyzer.analyze(text) == analyze_resume(text)
@@ -0,0 +1,72 @@
+import sys
+import threading
+import time
+
+from instrumentation import Instrumentation, MemorySink, PrometheusFileSink
+
+def test_memory_sink_totals_records_from_many_threads():
+    sink = MemorySink()
+    record = {'stage': 'score', 'wall_s': 0.5, 'cpu_s': 0.25, 'counters': {'hits': 1}}
+
+    def record_many():
+        for _ in range(5000):
+            sink.record(record)
+
+    # Switch threads as often as possible so unguarded updates would interleave
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=record_many) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    totals = sink.summary()['score']
+    assert (totals['calls'], totals['counters']) == (40000, {'hits': 40000})
+    assert (totals['wall_s'], totals['cpu_s']) == (20000.0, 10000.0)
+
+def test_stage_cpu_time_excludes_other_threads():
+    sink = MemorySink()
+    instrumentation = Instrumentation([sink])
+    stop = threading.Event()
+
+    def spin():
+        while not stop.is_set():
+            pass
+
+    spinner = threading.Thread(target=spin)
+    spinner.start()
+    try:
+        with instrumentation.stage('extract'):
+            time.sleep(0.3)
+    finally:
+        stop.set()
+        spinner.join()
+    totals = sink.summary()['extract']
+    assert totals['wall_s'] >= 0.3
+    assert totals['cpu_s'] < 0.1
+
+def test_nested_stages_report_self_time():
+    sink = MemorySink()
+    instrumentation = Instrumentation([sink])
+    with instrumentation.stage('extract'):
+        with instrumentation.stage('clean') as stage:
+            time.sleep(0.05)
+            stage.add(bytes=10)
+    summary = sink.summary()
+    assert summary['clean']['wall_s'] >= 0.05
+    assert summary['extract']['wall_s'] < 0.05
+    assert summary['clean']['counters'] == {'bytes': 10}
+
+def test_prometheus_sink_renders_totals_and_gauges(tmp_path):
+    sink = PrometheusFileSink(str(tmp_path / 'metrics.prom'), prefix='test')
+    sink.record({'stage': 'score', 'wall_s': 1.5, 'cpu_s': 1.0, 'counters': {'hits': 3}})
+    sink.gauge('queue_depth', 7, 'Jobs waiting')
+    sink.close()
+    text = (tmp_path / 'metrics.prom').read_text()
+    assert 'test_stage_calls_total{stage="score"} 1' in text
+    assert 'test_stage_wall_seconds_total{stage="score"} 1.5' in text
+    assert 'test_stage_hits_total{stage="score"} 3' in text
+    assert 'test_queue_depth 7' in text
@@ -0,0 +1,50 @@
+from job_descriptions import extract_jd_profile, rank_resumes
+
+JD = """Data Engineer
+Requirements:
+- 3+ years with Apache Spark and Apache Flink
+- Apache web server administration
+Skills: Snowflake, dbt
+"""
+
+def test_prefixed_skills_and_standalone_vendor():
+    profile = extract_jd_profile(JD)
+    assert 'spark' in profile['required_keywords']
+    assert 'flink' in profile['required_keywords']
+    # "Apache web server" is still a mention of Apache itself
+    assert 'apache' in profile['required_keywords']
+
+def test_lowercase_items_of_a_skill_list():
+    profile = extract_jd_profile(JD)
+    assert 'dbt' in profile['required_keywords']
+    assert 'snowflake' in profile['required_keywords']
+
+def test_apache_before_a_skill_only():
+    profile = extract_jd_profile("Data Engineer\nRequirements:\n- Apache Spark, Apache Kafka\n")
+    assert 'apache' not in profile['required_keywords']
+
+def test_headings_split_required_and_preferred():
+    profile = extract_jd_profile("Backend Engineer\nRequirements:\n- Python and PostgreSQL\n"
+                                 "Nice to have:\n- Kubernetes\n- Redis\n")
+    assert set(profile['required_keywords']) == {'python', 'postgresql'}
+    assert set(profile['preferred_keywords']) == {'kubernetes', 'redis'}
+
+def test_preferred_cue_softens_its_own_line():
+    profile = extract_jd_profile("Backend Engineer\nRequirements:\n- Python\n"
+                                 "- Experience with Kafka is a plus\n- Docker\n")
+    assert 'kafka' in profile['preferred_keywords']
+    assert {'python', 'docker'} <= set(profile['required_keywords'])
+
+def test_ambiguous_keywords_need_proper_case():
+    profile = extract_jd_profile("Backend Engineer\nRequirements:\n- Python services\n"
+                                 "- You go beyond the ticket and handle the rest\n")
+    assert 'go' not in profile['required_keywords']
+    assert 'rest' not in profile['required_keywords']
+    profile = extract_jd_profile("Backend Engineer\nRequirements:\n- Python, Go and REST APIs\n")
+    assert {'go', 'rest'} <= set(profile['required_keywords'])
+
+def test_rank_resumes_keeps_input_order_on_ties():
+    resume = "SKILLS\nPython, PostgreSQL, Docker"
+    resumes = [('first', resume), ('second', resume), ('weak', 'SKILLS\nExcel'), ('third', resume)]
+    ranking = rank_resumes("Backend Engineer\nRequirements:\n- Python, PostgreSQL, Docker\n", resumes, k=3)
+    assert [resume_id for resume_id, _ in ranking] == ['first', 'second', 'third']
@@ -0,0 +1,115 @@
+import types
+
+import pytest
+
+import job_queue
+from advanced_resume_analyzer import DEFAULT_ANALYSIS_OPTIONS
+from job_queue import JobQueue, run_queue
+from synthetic_resumes import generate_corpus
+
+@pytest.fixture(params=[True, False], ids=['returning', 'select-then-update'])
+def clock(request, monkeypatch):
+    """Fake job_queue time, with claim() using UPDATE ... RETURNING or its fallback"""
+    monkeypatch.setattr(job_queue, 'SQLITE_RETURNING', request.param)
+    now = [1000.0]
+    monkeypatch.setattr(job_queue, 'time', types.SimpleNamespace(time=lambda: now[0]))
+    return now
+
+def make_queue(tmp_path, count=1, **kwargs):
+    queue = JobQueue(str(tmp_path / 'queue.sqlite'), **kwargs)
+    queue.configure(str(tmp_path / 'out'), DEFAULT_ANALYSIS_OPTIONS)
+    queue.enqueue([f'resume_{number}.txt' for number in range(count)])
+    return queue
+
+def test_claim_leases_each_job_once(tmp_path, clock):
+    queue = make_queue(tmp_path, count=3)
+    first = queue.claim('a', limit=2)
+    assert [job['source'] for job in first] == ['resume_0.txt', 'resume_1.txt']
+    assert [job['attempts'] for job in first] == [1, 1]
+    assert [job['source'] for job in queue.claim('b', limit=5)] == ['resume_2.txt']
+    assert queue.claim('c') == []
+    assert queue.stats()['leased'] == 3
+
+def test_expired_lease_is_claimed_again(tmp_path, clock):
+    queue = make_queue(tmp_path, lease_seconds=60)
+    [job] = queue.claim('a')
+    clock[0] += 59
+    assert queue.claim('b') == []
+    assert queue.renew('a', [job['id']]) == 1
+    clock[0] += 59
+    assert queue.claim('b') == []
+    clock[0] += 2
+    [again] = queue.claim('b')
+    assert (again['id'], again['attempts']) == (job['id'], 2)
+
+    # The first worker lost its lease: nothing it reports is applied
+    assert queue.renew('a', [job['id']]) == 0
+    assert queue.complete(job['id'], 'a', {'file': job['source']}) is False
+    assert queue.fail(job['id'], 'a', 'late') is None
+    assert queue.quarantine(job['id'], 'a', {'error': 'late'}) is False
+    assert queue.complete(job['id'], 'b', {'file': job['source']}) is True
+    assert queue.stats()['done'] == 1
+
+def test_expired_leases_fail_after_max_attempts(tmp_path, clock):
+    queue = make_queue(tmp_path, lease_seconds=60, max_attempts=2)
+    for worker in ('a', 'b'):
+        assert len(queue.claim(worker)) == 1
+        clock[0] += 61
+    assert queue.claim('c') == []
+    assert queue.stats()['failed'] == 1
+    assert queue.failures() == [{'source': 'resume_0.txt', 'status': 'failed', 'attempts': 2,
+                                 'error': 'Lease expired on the last attempt'}]
+
+def test_failed_attempts_back_off_then_fail(tmp_path, clock):
+    queue = make_queue(tmp_path, max_attempts=3, retry_delay=10)
+    for attempt, delay in ((1, 10), (2, 20)):
+        [job] = queue.claim('a')
+        assert job['attempts'] == attempt
+        assert queue.fail(job['id'], 'a', 'boom') == 'pending'
+        clock[0] += delay - 1
+        assert queue.claim('a') == []
+        clock[0] += 1
+    [job] = queue.claim('a')
+    assert queue.fail(job['id'], 'a', 'boom') == 'failed'
+    clock[0] += 1000
+    assert queue.claim('a') == []
+    assert queue.retry_failed() == 1
+    assert queue.claim('a')[0]['attempts'] == 1
+
+def test_release_hands_jobs_back_without_an_attempt(tmp_path, clock):
+    queue = make_queue(tmp_path, count=2)
+    queue.claim('a', limit=2)
+    assert queue.release('a') == 2
+    assert [job['attempts'] for job in queue.claim('b', limit=2)] == [1, 1]
+
+def test_run_queue_flags_results_whose_lease_was_lost(tmp_path, monkeypatch):
+    sources = []
+    for number, text in enumerate(generate_corpus(2, seed=24)):
+        path = tmp_path / f'resume_{number}.txt'
+        path.write_text(text)
+        sources.append(str(path))
+    queue = JobQueue(str(tmp_path / 'queue.sqlite'))
+    queue.configure(str(tmp_path / 'out'), DEFAULT_ANALYSIS_OPTIONS)
+    queue.enqueue(sources)
+    thief = JobQueue(queue.path)
+    claim = queue.claim
+
+    def claim_then_lose_first(worker, limit=1):
+        # Once the lease on the first job has run out, another worker takes it over and
+        # finishes it while this worker is still analyzing it
+        jobs = claim(worker, limit)
+        if jobs and jobs[0]['source'] == sources[0]:
+            later = job_queue.time.time() + queue.lease_seconds + 1
+            with monkeypatch.context() as patch:
+                patch.setattr(job_queue, 'time', types.SimpleNamespace(time=lambda: later))
+                [taken] = thief.claim('thief')
+            thief.complete(taken['id'], 'thief', {'file': taken['source']})
+        return jobs
+
+    queue.claim = claim_then_lose_first
+    results = list(run_queue(queue, workers=1, poll_interval=0.05))
+    assert [result['file'] for result in results if result.get('lease_lost')] == [sources[0]]
+    assert sorted(result['file'] for result in results) == sources
+    assert queue.stats() == {'pending': 0, 'leased': 0, 'done': 2, 'failed': 0, 'quarantined': 0}
+    queue.close()
+    thief.close()
@@ -0,0 +1,22 @@
+from advanced_resume_analyzer import analyze_resume, builtin_profiles, match_keywords
+
+def keywords_in(text):
+    return {keyword for _, keyword, _ in match_keywords(text.lower(), builtin_profiles()['keyword_index'])}
+
+def test_plural_and_suffixed_forms_match():
+    found = keywords_in('Built RESTful APIs with Node.js and Docker')
+    assert {'api', 'rest', 'docker', 'node.js', 'built'} <= found
+
+def test_short_keywords_stay_whole_words():
+    assert 'r' not in keywords_in('React developer')
+    assert 'r' in keywords_in('Statistics in R and Python')
+    assert 'go' not in keywords_in('goes beyond the brief')
+    assert 'java' not in keywords_in('JavaScript')
+
+def test_longest_keyword_shadows_its_prefix():
+    found = keywords_in('CI with GitHub Actions')
+    assert {'github actions', 'github'} <= found
+
+def test_analyze_resume_counts_suffixed_keywords():
+    analysis = analyze_resume('Built RESTful APIs with Node.js and Docker')
+    assert {'api', 'rest'} <= set(analysis['keywords'])
@@ -0,0 +1,52 @@
+import advanced_resume_analyzer
+from advanced_resume_analyzer import iter_resume_pages
+
+GOOD_PAGE = ' '.join(['Experienced backend engineer building services'] * 10)
+
+class FakeExtractor:
+    """Serves pages of made-up text and records which ones were read"""
+
+    def __init__(self, pages, fail_at=None):
+        self.pages = pages
+        self.fail_at = fail_at
+        self.read = []
+
+    def page_count(self, file_path):
+        return len(self.pages)
+
+    def iter_pages(self, file_path, start=0, stop=None):
+        for page_number in range(start, len(self.pages) if stop is None else stop):
+            if page_number == self.fail_at:
+                raise RuntimeError('bad page')
+            self.read.append(page_number)
+            yield self.pages[page_number]
+
+def install(monkeypatch, text, layout):
+    monkeypatch.setitem(advanced_resume_analyzer.PDF_EXTRACTORS, 'text', text)
+    monkeypatch.setitem(advanced_resume_analyzer.PDF_EXTRACTORS, 'layout', layout)
+
+def test_auto_streams_after_the_sample(monkeypatch):
+    text = FakeExtractor([GOOD_PAGE] * 50)
+    install(monkeypatch, text, FakeExtractor([GOOD_PAGE] * 50))
+    stats = {}
+    pages = list(iter_resume_pages('resume.pdf', max_bytes=len(GOOD_PAGE) * 4, stats=stats))
+    assert stats['extractor'] == 'text' and stats['truncated']
+    assert len(pages) == 5
+    # Stopped by the byte budget, not after reading every page
+    assert text.read == [0, 1, 2, 3, 4]
+
+def test_auto_falls_back_on_a_broken_sample(monkeypatch):
+    text = FakeExtractor(['x'] * 10)
+    layout = FakeExtractor([GOOD_PAGE] * 10)
+    install(monkeypatch, text, layout)
+    stats = {}
+    pages = list(iter_resume_pages('resume.pdf', stats=stats))
+    assert stats['extractor'] == 'layout' and stats['fallback'] == 'empty'
+    assert len(pages) == 10 and layout.read == list(range(10))
+
+def test_auto_finishes_with_layout_after_an_unreadable_page(monkeypatch):
+    install(monkeypatch, FakeExtractor([GOOD_PAGE] * 8, fail_at=5), FakeExtractor([GOOD_PAGE] * 8))
+    stats = {}
+    pages = list(iter_resume_pages('resume.pdf', stats=stats))
+    assert len(pages) == 8
+    assert stats['fallback'].startswith('unreadable')
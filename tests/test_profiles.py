@@ -0,0 +1,35 @@
+import json
+
+from advanced_resume_analyzer import ProfileRegistry, analyze_resume
+from batch_matching import compile_profile_matrix, resume_keyword_matrix, score_matrix
+
+RESUME = """John Doe
+john@example.com
+
+EXPERIENCE
+Data Engineer, Acme
+- Built streaming pipelines with Kafka and Spark, scheduled in Airflow
+
+SKILLS
+Kafka, Spark, Airflow, Python
+"""
+
+def test_mixed_case_profile_keywords_match(tmp_path):
+    profile_file = tmp_path / 'profiles.json'
+    profile_file.write_text(json.dumps({'job_profiles': {'streaming': {
+        'title': 'Streaming Engineer',
+        'required_keywords': ['Kafka', 'Spark'],
+        'preferred_keywords': ['Airflow'],
+        'action_verbs': ['Built']
+    }}}))
+    profiles = ProfileRegistry([str(profile_file)], include_builtin=False).current
+
+    match = analyze_resume(RESUME, profiles)['job_matches']['streaming']
+    assert match['required_found'] == 2
+    assert match['preferred_found'] == 1
+    assert match['action_verbs_found'] == 1
+    assert match['score'] == 100.0
+
+    matrix = compile_profile_matrix(profiles['job_profiles'])
+    scores = score_matrix(resume_keyword_matrix([RESUME], matrix), matrix)
+    assert round(float(scores[0][matrix['profile_ids'].index('streaming')]), 1) == match['score']
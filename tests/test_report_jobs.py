@@ -0,0 +1,22 @@
+import os
+
+from advanced_resume_analyzer import DEFAULT_ANALYSIS_OPTIONS, report_jobs
+from job_queue import JobQueue
+
+def test_suffixed_names_never_collide():
+    jobs = report_jobs(['x/a.txt', 'y/a.txt', 'a_2.txt', 'z/a.pdf'], 'out')
+    reports = [os.path.basename(report) for _, report in jobs]
+    assert reports == ['a_intelligence_report.txt', 'a_2_intelligence_report.txt',
+                       'a_2_2_intelligence_report.txt', 'a_3_intelligence_report.txt']
+
+def test_ndjson_has_no_report_paths():
+    assert report_jobs(['x/a.txt', 'y/a.txt'], 'out', 'ndjson') == [('x/a.txt', None), ('y/a.txt', None)]
+
+def test_queue_skips_reports_it_already_assigned(tmp_path):
+    queue = JobQueue(str(tmp_path / 'queue.sqlite'))
+    queue.configure(str(tmp_path / 'out'), DEFAULT_ANALYSIS_OPTIONS)
+    queue.enqueue(['x/a.txt', 'a_2.txt'])
+    queue.enqueue(['y/a.txt'])
+    outputs = [job['output'] for job in queue.claim('test', limit=10)]
+    assert len(set(outputs)) == 3
+    queue.close()
@@ -0,0 +1,67 @@
+import json
+import sys
+
+from resume_dedup import DedupIndex, lsh_bands, main
+from synthetic_resumes import generate_corpus
+
+ORIGINAL, OTHER = generate_corpus(2, seed=17)
+# The original without its last three lines: estimated similarity 0.96
+NEAR = '\n'.join(ORIGINAL.split('\n')[:-3])
+
+def test_exact_near_and_new(tmp_path):
+    index = DedupIndex(str(tmp_path / 'dedup.sqlite'))
+    assert index.check_text(ORIGINAL, 'v1')['status'] == 'new'
+    index.add(ORIGINAL, 'original.txt', analysis_key='v1', analysis={'score': 80})
+
+    exact = index.check_text(ORIGINAL, 'v1')
+    assert (exact['status'], exact['analysis']) == ('exact', {'score': 80})
+    # An analysis stored under another key is not reused
+    assert index.check_text(ORIGINAL, 'v2')['status'] == 'new'
+
+    near = index.check_text(NEAR, 'v1')
+    assert near['status'] == 'near'
+    assert [match['source'] for match in near['near_duplicates']] == ['original.txt']
+    assert near['near_duplicates'][0]['similarity'] >= 0.85
+
+    assert index.check_text(OTHER, 'v1')['status'] == 'new'
+    assert index.document(near['text_hash']) is None
+    assert index.document(exact['text_hash']) == {'text_hash': exact['text_hash'], 'source': 'original.txt'}
+    assert (index.exact_hits, index.near_hits, index.misses) == (1, 1, 3)
+    index.close()
+
+def test_exact_file_match_skips_extraction(tmp_path):
+    resume = tmp_path / 'resume.txt'
+    resume.write_text(ORIGINAL)
+    index = DedupIndex(str(tmp_path / 'dedup.sqlite'))
+    first = index.check_file(str(resume), 'v1')
+    assert first['status'] == 'new'
+    index.add(first['text'], str(resume), first['file_key'], 'v1', {'score': 80}, first['fingerprints'])
+    again = index.check_file(str(resume), 'v1')
+    assert (again['status'], again['text'], again['analysis']) == ('exact', None, {'score': 80})
+    index.close()
+
+def test_reopening_keeps_the_banding_and_filters_by_the_new_threshold(tmp_path):
+    path = str(tmp_path / 'dedup.sqlite')
+    index = DedupIndex(path, threshold=0.85)
+    index.add(ORIGINAL, 'original.txt')
+    index.close()
+
+    assert lsh_bands(0.97) != lsh_bands(0.85)
+    strict = DedupIndex(path, threshold=0.97)
+    assert (strict.bands, strict.rows) == lsh_bands(0.85)
+    assert strict.check_text(NEAR, 'v1')['status'] == 'new'
+    strict.close()
+
+    index = DedupIndex(path, threshold=0.85)
+    assert index.check_text(NEAR, 'v1')['status'] == 'near'
+    index.close()
+
+def test_main_reports_duplicates(tmp_path, monkeypatch, capsys):
+    for name, text in (('a.txt', ORIGINAL), ('b.txt', ORIGINAL), ('c.txt', NEAR)):
+        (tmp_path / name).write_text(text)
+    monkeypatch.setattr(sys, 'argv', ['resume_dedup.py', str(tmp_path / '*.txt'),
+                                      '--index', str(tmp_path / 'dedup.sqlite')])
+    main()
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line['exact_duplicate_of'] for line in lines] == [None, str(tmp_path / 'a.txt'), None]
+    assert [match['source'] for match in lines[2]['near_duplicates']] == [str(tmp_path / 'a.txt')]
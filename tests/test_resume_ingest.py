@@ -0,0 +1,67 @@
+import asyncio
+import os
+import time
+
+import resume_ingest
+from resume_ingest import watch_directory
+
+async def collect(source, limit=None):
+    paths = []
+    async for path in source:
+        paths.append(os.path.basename(path))
+        if len(paths) == limit:
+            break
+    return paths
+
+def test_once_drains_resume_files(tmp_path):
+    for name in ('b.pdf', 'a.txt', 'notes.md'):
+        (tmp_path / name).write_text('x')
+    (tmp_path / 'sub.pdf').mkdir()
+    assert asyncio.run(collect(watch_directory(str(tmp_path), once=True))) == ['a.txt', 'b.pdf']
+
+def test_files_are_yielded_once_they_stop_changing(tmp_path):
+    resume = tmp_path / 'a.txt'
+    resume.write_text('partial')
+
+    async def scenario():
+        watcher = watch_directory(str(tmp_path), poll_interval=0.4)
+        first = asyncio.ensure_future(watcher.__anext__())
+        await asyncio.sleep(0.2)
+        # Seen once, so possibly still uploading; the next poll sees it grown
+        waited_for_second_poll = not first.done()
+        resume.write_text('partial upload, now complete')
+        await asyncio.sleep(0.4)
+        waited_for_stable_size = not first.done()
+        path = await asyncio.wait_for(first, 2)
+        await watcher.aclose()
+        return waited_for_second_poll, waited_for_stable_size, os.path.basename(path)
+
+    assert asyncio.run(scenario()) == (True, True, 'a.txt')
+
+def test_slow_scans_do_not_block_the_event_loop(tmp_path, monkeypatch):
+    (tmp_path / 'a.txt').write_text('x')
+    scan = resume_ingest._scan_directory
+
+    def slow_scan(directory):
+        time.sleep(0.3)
+        return scan(directory)
+
+    monkeypatch.setattr(resume_ingest, '_scan_directory', slow_scan)
+
+    async def scenario():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.02)
+                ticks += 1
+
+        ticker = asyncio.ensure_future(tick())
+        paths = await collect(watch_directory(str(tmp_path), once=True))
+        ticker.cancel()
+        return paths, ticks
+
+    paths, ticks = asyncio.run(scenario())
+    assert paths == ['a.txt']
+    assert ticks >= 5
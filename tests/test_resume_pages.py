@@ -0,0 +1,21 @@
+from advanced_resume_analyzer import clean_and_fix_text, iter_resume_pages
+
+def read_txt(path, max_bytes):
+    stats = {}
+    return ''.join(iter_resume_pages(str(path), max_bytes=max_bytes, stats=stats)), stats
+
+def test_txt_budget_applies_to_cleaned_text(tmp_path):
+    path = tmp_path / 'resume.txt'
+    # The first max_bytes + 1 characters clean down to "word", well under the budget
+    path.write_text('word' + ' ' * 40 + 'more words follow here', encoding='utf-8')
+    text, stats = read_txt(path, 10)
+    assert text == 'word more '
+    assert stats['truncated']
+
+def test_txt_within_budget_is_not_truncated(tmp_path):
+    path = tmp_path / 'resume.txt'
+    raw = 'Python3 developer,  SQL' + ' ' * 50
+    path.write_text(raw, encoding='utf-8')
+    text, stats = read_txt(path, len(clean_and_fix_text(raw)))
+    assert text == clean_and_fix_text(raw)
+    assert not stats['truncated']
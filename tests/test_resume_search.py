@@ -0,0 +1,55 @@
+import pytest
+
+from resume_search import ResumeSearchIndex, parse_query
+
+def entry(keywords, ats_score, scores=None):
+    return {'keywords': keywords, 'ats_score': ats_score, 'best_job_profile': 'backend_developer',
+            'job_scores': scores or {'backend_developer': ats_score}}
+
+def test_parse_query_precedence():
+    assert parse_query('a b OR c') == ('or', [('and', [('keyword', 'a'), ('keyword', 'b')]), ('keyword', 'c')])
+    assert parse_query('NOT a AND b') == ('and', [('not', ('keyword', 'a')), ('keyword', 'b')])
+    assert parse_query('a AND (b OR c)') == ('and', [('keyword', 'a'), ('or', [('keyword', 'b'), ('keyword', 'c')])])
+    assert parse_query('"GitHub  Actions"') == ('keyword', 'github actions')
+
+@pytest.mark.parametrize('query', ['', 'a AND', '(a OR b', 'a )', 'OR a'])
+def test_parse_query_rejects_malformed(query):
+    with pytest.raises(ValueError):
+        parse_query(query)
+
+def test_reindexing_drops_old_keywords(tmp_path):
+    index = ResumeSearchIndex(str(tmp_path / 'search.sqlite'))
+    index.add_many([('a', entry(['kafka', 'redis'], 70))])
+    index.add_many([('a', entry(['redis'], 75))])
+    assert index.search('kafka') == []
+    assert index.search('kafka AND redis') == []
+    assert [hit['source'] for hit in index.search('redis')] == ['a']
+    assert index.search('redis')[0]['ats_score'] == 75
+    index.close()
+
+def test_both_query_plans_return_the_same_top_k(tmp_path):
+    index = ResumeSearchIndex(str(tmp_path / 'search.sqlite'))
+    entries = []
+    for number in range(200):
+        keywords = ['python'] + (['kafka'] if number % 50 == 0 else []) + (['redis'] if number % 2 else [])
+        entries.append((f"r{number}", entry(keywords, number % 97)))
+    index.add_many(entries)
+    plans = []
+    index._conn.set_trace_callback(lambda sql: plans.append('postings' if 'CROSS JOIN' in sql else 'scores')
+                                   if 'ORDER BY' in sql else None)
+
+    def expected(predicate, k):
+        # Ties on score go to the later resume, as in the index's ORDER BY
+        matching = [(e['ats_score'], number) for number, (_, e) in enumerate(entries)
+                    if predicate(set(e['keywords']))]
+        return [f"r{number}" for _, number in sorted(matching, reverse=True)[:k]]
+
+    for profile in (None, 'backend_developer'):
+        # Rare required keyword: driven by its postings
+        hits = index.search('kafka AND python', profile, k=3)
+        assert [hit['source'] for hit in hits] == expected(lambda kw: {'kafka', 'python'} <= kw, 3)
+        # Common required keyword: walk the scores from the top
+        hits = index.search('python AND NOT redis', profile, k=5)
+        assert [hit['source'] for hit in hits] == expected(lambda kw: 'python' in kw and 'redis' not in kw, 5)
+    assert plans == ['postings', 'scores', 'postings', 'scores']
+    index.close()
@@ -0,0 +1,94 @@
+import http.client
+import json
+import os
+import threading
+
+import pytest
+
+from resume_service import AnalysisService, make_server, parse_upload
+
+SAMPLE_PDF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Aryan_CV.pdf')
+RESUME_TEXT = "Asha Rao\nBackend Engineer\nSKILLS\nPython, Django, PostgreSQL, Docker, REST APIs"
+
+@pytest.fixture(scope='module')
+def server():
+    service = AnalysisService(workers=1, max_concurrent=1, queue_timeout=0.2, request_timeout=30,
+                              max_upload_bytes=1024 * 1024)
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+def post(server, body, content_type, length=None):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=30)
+    connection.putrequest('POST', '/analyze')
+    connection.putheader('Content-Type', content_type)
+    connection.putheader('Content-Length', str(len(body) if length is None else length))
+    connection.endheaders()
+    if length is None:
+        connection.send(body)
+    response = connection.getresponse()
+    result = response.status, json.loads(response.read()), response.getheader('Retry-After')
+    connection.close()
+    return result
+
+def test_pdf_upload_is_analyzed(server):
+    with open(SAMPLE_PDF, 'rb') as f:
+        status, body, _ = post(server, f.read(), 'application/pdf')
+    assert status == 200
+    assert body['summary']['ats_score'] > 0
+
+def test_text_upload_is_analyzed(server):
+    status, body, _ = post(server, json.dumps({'text': RESUME_TEXT}).encode(), 'application/json')
+    assert status == 200
+    assert 'python' in body['keywords']
+
+def test_bad_content_type_is_rejected(server):
+    status, body, _ = post(server, b'\x89PNG', 'image/png')
+    assert status == 400
+    assert 'image/png' in body['error']
+
+def test_oversized_upload_is_rejected_unread(server):
+    status, _, _ = post(server, b'', 'application/pdf', length=server.service.max_upload_bytes + 1)
+    assert status == 413
+
+def test_upload_without_text_is_unprocessable(server):
+    status, body, _ = post(server, b'   \n  ', 'text/plain')
+    assert status == 422
+    assert 'extract' in body['error']
+
+def test_busy_service_answers_503(server):
+    # Hold the only slot, as a long-running analysis would
+    slots = server.service._slots
+    assert slots.acquire(timeout=5)
+    try:
+        status, _, retry_after = post(server, RESUME_TEXT.encode(), 'text/plain')
+    finally:
+        slots.release()
+    assert status == 503
+    assert retry_after == '1'
+
+def multipart(field, filename, content, boundary='XyZ'):
+    body = (f'--{boundary}\r\nContent-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f'Content-Type: application/octet-stream\r\n\r\n').encode() + content + f'\r\n--{boundary}--\r\n'.encode()
+    return f'multipart/form-data; boundary={boundary}', body
+
+def test_parse_upload_multipart_files():
+    assert parse_upload(*multipart('resume', 'CV.PDF', b'%PDF-1.4 data')) == ('pdf', b'%PDF-1.4 data')
+    assert parse_upload(*multipart('resume', 'cv.txt', b'plain resume')) == ('txt', b'plain resume')
+
+@pytest.mark.parametrize('field, filename, message', [
+    ('resume', 'cv.docx', 'Unsupported file format'),
+    ('photo', 'cv.pdf', "no 'resume' file field"),
+])
+def test_parse_upload_multipart_errors(field, filename, message):
+    with pytest.raises(ValueError, match=message):
+        parse_upload(*multipart(field, filename, b'data'))
+
+def test_parse_upload_json_needs_text():
+    assert parse_upload('application/json; charset=utf-8', b'{"text": "hi"}') == ('text', 'hi')
+    with pytest.raises(ValueError):
+        parse_upload('application/json', b'["hi"]')
@@ -0,0 +1,35 @@
+import pytest
+
+from advanced_resume_analyzer import iter_text_records, read_text_record, run_record_batch
+
+RECORDS = [
+    'Asha Rao\nBackend Engineer\nSKILLS\nPython, Django, PostgreSQL, Docker',
+    'word' + ' ' * 40 + 'more words follow here',
+    'Ravi Kumar\nData Scientist\nSKILLS\nPython, pandas, scikit-learn, SQL'
+]
+
+@pytest.fixture
+def export(tmp_path):
+    path = tmp_path / 'export.txt'
+    path.write_bytes('\n---\n'.join(RECORDS).encode('utf-8'))
+    return str(path)
+
+def test_record_budget_applies_to_cleaned_text(export):
+    _, start, end = list(iter_text_records(export, '\n---\n'))[1]
+    assert read_text_record(export, start, end, 10) == 'word more '
+    assert read_text_record(export, start, end) == 'word more words follow here'
+
+def test_bad_byte_fails_with_and_without_budget(tmp_path):
+    path = tmp_path / 'export.txt'
+    path.write_bytes(b'caf\xe9 owner\n---\nok')
+    _, start, end = next(iter_text_records(str(path), '\n---\n'))
+    for max_bytes in (None, 1000):
+        with pytest.raises(UnicodeDecodeError):
+            read_text_record(str(path), start, end, max_bytes)
+
+def test_record_batch_runs_under_the_watchdog(export, tmp_path):
+    def scores(options):
+        results = run_record_batch([export], '\n---\n', str(tmp_path / 'out'), workers=1, chunksize=2,
+                                   options={'output_format': 'ndjson', **options})
+        return {result['record']: result['analysis']['summary']['ats_score'] for result in results}
+    assert scores({'timeout': 60, 'max_rss_mb': 2048}) == scores({})